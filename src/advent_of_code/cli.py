@@ -1,43 +1,153 @@
 import argparse
-import importlib
+import json
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Set
 
+from .utils.registry import get_registry, load_solution
+
+if TYPE_CHECKING:
+    from .utils.pipeline import DayResult
+    from .utils.runner import JobResult
+
+
+def get_available_years() -> List[int]:
+    """Get the sorted years having at least a solution."""
+    return get_registry().years()
+
+
+def get_available_days(year: int) -> List[int]:
+    """Get the sorted days having a solution for a given year."""
+    return get_registry().days(year)
+
+
+def parse_day_spec(spec: str) -> List[int]:
+    """
+    Parse a day selection such as "1-25" or "1,3,5-7".
+
+    Args:
+        spec (str): Comma separated list of days or ranges of days
+
+    Returns:
+        List[int]: The sorted selected days
+
+    Raises:
+        argparse.ArgumentTypeError: If the selection is invalid
+    """
+    days: Set[int] = set()
+    for item in spec.split(","):
+        bounds = item.strip().split("-")
+        try:
+            first, last = int(bounds[0]), int(bounds[-1])
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid day selection: {spec}")
+        if len(bounds) > 2 or not 1 <= first <= last <= 25:
+            raise argparse.ArgumentTypeError(f"Invalid day selection: {spec}")
+        days.update(range(first, last + 1))
+    return sorted(days)
+
+
+def parse_count(spec: str, minimum: int) -> int:
+    """
+    Parse a count given on the command line, such as a number of workers.
+
+    Raises:
+        argparse.ArgumentTypeError: If it isn't an integer of at least minimum
+    """
+    try:
+        count = int(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid integer: {spec}")
+    if count < minimum:
+        raise argparse.ArgumentTypeError(f"Must be at least {minimum}: {spec}")
+    return count
+
+
+def parse_positive_int(spec: str) -> int:
+    """Parse a count of at least 1, the argparse type of -j and --repeat."""
+    return parse_count(spec, 1)
 
-def get_available_years() -> list:
-    """Get list of available years from the directory structure."""
-    base_path = Path(__file__).parent
-    return [
-        int(d.name[4:])
-        for d in base_path.iterdir()
-        if d.is_dir() and d.name.startswith("year")
-    ]
 
+def parse_non_negative_int(spec: str) -> int:
+    """Parse a count of at least 0, the argparse type of --warmup."""
+    return parse_count(spec, 0)
 
-def get_available_days(year: int) -> list:
-    """Get list of available days for a given year."""
-    base_path = Path(__file__).parent / f"year{year}"
-    return [f.stem for f in base_path.glob("day*_solution.py")]
 
+def parse_duration(spec: str) -> float:
+    """
+    Parse a number of seconds given on the command line.
 
-def run_solution(year: int, day: int, test_only: bool = False) -> None:
-    """Run the solution for a specific day."""
+    Raises:
+        argparse.ArgumentTypeError: If it isn't a positive number
+    """
     try:
-        module_name = f"advent_of_code.year{year}.day{day:02d}_solution"
-        solution_module = importlib.import_module(module_name)
-        solution = solution_module.Solution()
+        seconds = float(spec)
+    except ValueError:
+        seconds = 0.0
+    # Also rejects nan, for which every comparison is false
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(f"Invalid duration: {spec}")
+    return seconds
 
+
+def parse_memory_size(spec: str) -> int:
+    """Parse a memory size such as "256M" given on the command line."""
+    from .utils.memory import parse_size
+
+    try:
+        return parse_size(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def add_memory_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Measure the peak memory of the parsing and of each part",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=parse_memory_size,
+        help="Fail if the parsing or a part allocates more memory (e.g., 256M)",
+    )
+
+
+def run_solution(
+    year: int,
+    day: int,
+    test_only: bool = False,
+    use_cache: bool = False,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> None:
+    """Run the solution for a specific day, reusing cached answers if asked to."""
+    if measure_memory or memory_budget is not None:
+        if test_only:
+            run_tests_tracking_memory(year, day, memory_budget)
+        else:
+            run_solution_tracking_memory(year, day, memory_budget)
+        return
+
+    try:
         if test_only:
+            solution = load_solution(year, day)
             part1_passed, part2_passed = solution.run_tests()
             if part1_passed and part2_passed:
                 print("\nAll tests passed! 🎉")
             else:
                 print("\nSome tests failed. 😢")
         else:
-            part1, part2 = solution.solve()
+            from .utils.answer_cache import AnswerCache, solve_cached
+
+            cache = AnswerCache() if use_cache else None
+            answers = solve_cached(year, day, (1, 2), cache)
+            (part1, cached1), (part2, cached2) = answers[1], answers[2]
             print(f"\nYear {year}, Day {day} Solutions:")
-            print(f"Part 1: {part1}")
-            print(f"Part 2: {part2}")
+            print(f"Part 1: {part1}{' (cached)' if cached1 else ''}")
+            print(f"Part 2: {part2}{' (cached)' if cached2 else ''}")
 
     except ImportError:
         print(f"Solution for {year} day {day} not found")
@@ -45,16 +155,525 @@ def run_solution(year: int, day: int, test_only: bool = False) -> None:
         print(f"Error running solution: {str(e)}")
 
 
-def main() -> None:
+def run_solution_tracking_memory(
+    year: int, day: int, memory_budget: Optional[int] = None
+) -> None:
+    """Run the solution for a specific day, measuring the memory of each step."""
+    from .utils.memory import (
+        MemoryBudgetExceeded,
+        format_memory,
+        solve_tracking_memory,
+    )
+
+    try:
+        solution = load_solution(year, day)
+        answers, memory = solve_tracking_memory(
+            solution, solution.read_input(), (1, 2), memory_budget
+        )
+    except ImportError:
+        print(f"Solution for {year} day {day} not found")
+        return
+    except MemoryBudgetExceeded as e:
+        print(f"Memory budget exceeded: {e}")
+        sys.exit(1)
+
+    print(f"\nYear {year}, Day {day} Solutions:")
+    print(f"Part 1: {answers[1]}")
+    print(f"Part 2: {answers[2]}")
+    print(f"Peak memory: {format_memory(memory)}")
+
+
+def run_tests_tracking_memory(
+    year: int, day: int, memory_budget: Optional[int] = None
+) -> None:
+    """Run the tests of a specific day, measuring the memory of each step."""
+    from .utils.testing import collect_test_jobs, format_case_result, run_test_jobs
+
+    jobs = collect_test_jobs(year, [day])
+    if not jobs:
+        print(f"No test cases found for {year} day {day}")
+        return
+    results = list(run_test_jobs(jobs, 1, None, True, memory_budget))
+    for result in results:
+        print(f"\n{format_case_result(result)}")
+    if all(result.passed for result in results):
+        print("\nAll tests passed! 🎉")
+    else:
+        print("\nSome tests failed. 😢")
+        sys.exit(1)
+
+
+def print_job_result(result: "JobResult") -> None:
+    """Print the answer of a part run by run_many, or its error."""
+    from .utils.memory import format_memory
+
+    job = result.job
+    if job.part == 1:
+        print(f"\nYear {job.year}, Day {job.day} Solutions:")
+    if result.cached:
+        print(f"Part {job.part}: {result.answer} (cached)")
+    elif result.error is None:
+        print(f"Part {job.part}: {result.answer} ({result.elapsed * 1e3:.1f} ms)")
+    else:
+        print(f"Part {job.part}: error running solution: {result.error}")
+    if result.memory is not None:
+        print(f"  Peak memory: {format_memory(result.memory)}")
+
+
+def print_day_result(result: "DayResult") -> None:
+    """Print the answers of a day run by the pipeline, or why its input is missing."""
+    if result.fetch.error is not None:
+        print(f"\nYear {result.year}, Day {result.day}: {result.fetch.error}")
+        return
+    for part_result in result.parts:
+        print_job_result(part_result)
+
+
+def run_many(
+    years: List[int],
+    days: Optional[List[int]],
+    workers: int,
+    use_cache: bool = False,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> None:
+    """
+    Run several days in parallel and print their answers in order.
+
+    When inputs are missing, they are downloaded while the days whose input is
+    already available are being solved.
+    """
+    from .utils.aoc_login import get_inputs_dir
+    from .utils.runner import Job, run_jobs
+
+    days_by_year = {
+        year: [day for day in get_available_days(year) if days is None or day in days]
+        for year in years
+    }
+    if not any(days_by_year.values()):
+        print("No solution found for the selected days")
+        return
+
+    missing = any(
+        not (get_inputs_dir(year) / f"day{day:02d}_input.txt").exists()
+        for year, year_days in days_by_year.items()
+        for day in year_days
+    )
+    if missing and not (measure_memory or memory_budget is not None):
+        from .utils.pipeline import run_pipeline
+
+        succeeded = True
+        for year, year_days in days_by_year.items():
+            if year_days:
+                day_results = run_pipeline(
+                    year,
+                    year_days,
+                    workers=workers,
+                    use_cache=use_cache,
+                    on_result=print_day_result,
+                )
+                succeeded &= all(result.ok for result in day_results)
+        if not succeeded:
+            sys.exit(1)
+        return
+
+    jobs = [
+        Job(year, day, part)
+        for year, year_days in days_by_year.items()
+        for day in year_days
+        for part in (1, 2)
+    ]
+    failed = False
+    results = run_jobs(jobs, workers, None, use_cache, measure_memory, memory_budget)
+    for result in results:
+        print_job_result(result)
+        failed |= result.error is not None
+    if failed:
+        sys.exit(1)
+
+
+def startup_profile(year: Optional[int], day: Optional[int]) -> None:
+    """Print the imports slowing down the start of the command, and its duration."""
+    from .utils.startup import (
+        STARTUP_BUDGET,
+        format_import_profile,
+        measure_startup,
+        profile_imports,
+    )
+
+    modules = ["advent_of_code.cli"]
+    if year and day:
+        modules.append(f"advent_of_code.year{year}.day{day:02d}_solution")
+    print(format_import_profile(profile_imports(modules)))
+
+    argv = ["--year", str(year)] if year else []
+    elapsed = measure_startup(argv)
+    status = "within" if elapsed <= STARTUP_BUDGET else "over"
+    print(
+        f"\nCold start of 'aoc {' '.join(argv)}': {elapsed * 1e3:.1f} ms "
+        f"({status} the {STARTUP_BUDGET * 1e3:.0f} ms budget)"
+    )
+
+
+def bench(argv: List[str]) -> None:
+    """Benchmark the solution of a specific day."""
+    parser = argparse.ArgumentParser(
+        prog="aoc bench", description="Benchmark an Advent of Code solution"
+    )
+    parser.add_argument("--year", type=int, required=True, help="Year to run")
+    parser.add_argument("--day", type=int, required=True, help="Day to run (1-25)")
+    parser.add_argument("--part", type=int, choices=(1, 2), help="Only time a part")
+    parser.add_argument(
+        "--repeat", type=parse_positive_int, default=10, help="Measured rounds"
+    )
+    parser.add_argument(
+        "--warmup", type=parse_non_negative_int, default=1, help="Warmup rounds"
+    )
+    parser.add_argument("--json", help="Write the results as JSON ('-' for stdout)")
+    add_memory_arguments(parser)
+    args = parser.parse_args(argv)
+
+    from .utils.bench import benchmark, format_bench_result
+    from .utils.memory import MemoryBudgetExceeded
+
+    try:
+        solution = load_solution(args.year, args.day)
+    except ImportError:
+        print(f"Solution for {args.year} day {args.day} not found")
+        return
+
+    parts = (args.part,) if args.part else (1, 2)
+    try:
+        result = benchmark(
+            solution,
+            parts,
+            args.repeat,
+            args.warmup,
+            measure_memory=args.memory,
+            memory_budget=args.memory_budget,
+        )
+    except MemoryBudgetExceeded as e:
+        print(f"Memory budget exceeded: {e}")
+        sys.exit(1)
+
+    if args.json == "-":
+        print(json.dumps(result.to_dict(), indent=2))
+        return
+    print(format_bench_result(result))
+    if args.json:
+        Path(args.json).write_text(json.dumps(result.to_dict(), indent=2))
+
+
+def profile(argv: List[str]) -> None:
+    """Profile the solution of a specific day."""
+    parser = argparse.ArgumentParser(
+        prog="aoc profile", description="Profile an Advent of Code solution"
+    )
+    parser.add_argument("--year", type=int, required=True, help="Year to run")
+    parser.add_argument("--day", type=int, required=True, help="Day to run (1-25)")
+    parser.add_argument("--part", type=int, choices=(1, 2), help="Only profile a part")
+    parser.add_argument(
+        "--mode", choices=("cpu", "mem"), default="cpu", help="What to profile"
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of functions or lines shown"
+    )
+    parser.add_argument(
+        "--sort", default="cumulative", help="Sort key of the CPU profile stats"
+    )
+    parser.add_argument("--stats", help="Save the CPU profile stats (pstats format)")
+    parser.add_argument(
+        "--collapsed", help="Save the sampled CPU call stacks for flame graph tools"
+    )
+    args = parser.parse_args(argv)
+
+    from .utils.profiling import profile_cpu, profile_memory
+
+    try:
+        solution = load_solution(args.year, args.day)
+    except ImportError:
+        print(f"Solution for {args.year} day {args.day} not found")
+        return
+
+    try:
+        input_data = solution.read_input()
+    except (OSError, ValueError) as e:
+        # Missing input that can't be downloaded, e.g. without a session cookie
+        print(f"Error reading the input: {e}")
+        sys.exit(1)
+    for part in (args.part,) if args.part else (1, 2):
+        # A new instance for each part, so that each profile includes the parsing
+        solution = load_solution(args.year, args.day)
+        print(f"\nYear {args.year}, Day {args.day}, Part {part}:")
+        if args.mode == "mem":
+            memory_profile = profile_memory(
+                solution.run_part, part, input_data, top=args.top
+            )
+            print(f"Answer: {memory_profile.answer}")
+            print(memory_profile.format_report())
+            continue
+
+        cpu_profile = profile_cpu(solution.run_part, part, input_data)
+        print(f"Answer: {cpu_profile.answer}")
+        print(cpu_profile.format_stats(args.top, args.sort))
+        # Both parts are saved to the same files, with the part in their name
+        suffix = f".part{part}" if not args.part else ""
+        if args.stats:
+            stats_path = Path(args.stats)
+            cpu_profile.stats.dump_stats(
+                stats_path.with_name(stats_path.stem + suffix + stats_path.suffix)
+            )
+        if args.collapsed:
+            collapsed_path = Path(args.collapsed)
+            collapsed_path.with_name(
+                collapsed_path.stem + suffix + collapsed_path.suffix
+            ).write_text(cpu_profile.stacks.to_collapsed())
+
+
+def scale(argv: List[str]) -> None:
+    """Time a solution on generated inputs of increasing sizes."""
+    parser = argparse.ArgumentParser(
+        prog="aoc scale",
+        description="Fit the empirical complexity of a solution on generated inputs",
+    )
+    parser.add_argument("--year", type=int, help="Year to run, defaults to the last")
+    parser.add_argument("--day", type=int, required=True, help="Day to run (1-25)")
+    parser.add_argument("--part", type=int, choices=(1, 2), help="Only time a part")
+    parser.add_argument(
+        "--sizes", default="1e3,1e4,1e5", help="Input sizes (e.g., 1e3,1e4,1e5)"
+    )
+    parser.add_argument(
+        "--repeat", type=parse_positive_int, default=3, help="Runs at each size"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the inputs")
+    parser.add_argument("--json", help="Write the report as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    from .utils.scaling import format_scaling_report, measure_scaling, parse_sizes
+
+    try:
+        sizes = parse_sizes(args.sizes)
+    except ValueError as e:
+        parser.error(str(e))
+    year = args.year or max(get_available_years())
+    registry = get_registry()
+    try:
+        info = registry.get(year, args.day)
+    except ImportError:
+        print(f"Solution for {year} day {args.day} not found")
+        return
+    if not info.has_generator:
+        print(f"Solution for {year} day {args.day} has no input generator")
+        return
+
+    module = registry.load_module(year, args.day)
+    parts = (args.part,) if args.part else info.parts
+    report = measure_scaling(
+        module.Solution, module.generate_input, sizes, parts, args.repeat, args.seed
+    )
+
+    if args.json == "-":
+        print(json.dumps(report.to_dict(), indent=2))
+        return
+    print(format_scaling_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report.to_dict(), indent=2))
+
+
+def fetch(argv: List[str]) -> None:
+    """Download the inputs of several days."""
+    parser = argparse.ArgumentParser(
+        prog="aoc fetch", description="Download Advent of Code inputs"
+    )
+    parser.add_argument("--year", type=int, required=True, help="Year to fetch")
+    parser.add_argument(
+        "--days",
+        type=parse_day_spec,
+        help="Days to fetch (e.g., 1-25), defaults to the days having a solution",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=parse_positive_int,
+        default=4,
+        help="Maximum concurrent requests",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=1.0,
+        help="Minimum number of seconds between two requests",
+    )
+    parser.add_argument("--force", action="store_true", help="Download cached inputs")
+    parser.add_argument("--base-url", help="Server to download the inputs from")
+    args = parser.parse_args(argv)
+
+    from .utils.fetch import InputFetcher
+
+    days = args.days or get_available_days(args.year)
+    # A missing session cookie is reported as an error of each day to download
+    fetcher = InputFetcher(
+        base_url=args.base_url, workers=args.jobs, min_interval=args.min_interval
+    )
+    try:
+        results = fetcher.fetch_all(args.year, days, args.force)
+    finally:
+        fetcher.close()
+
+    for result in results:
+        status = result.status if result.error is None else f"error: {result.error}"
+        print(f"Year {result.year}, Day {result.day}: {status}")
+    if any(result.error is not None for result in results):
+        sys.exit(1)
+
+
+def test(argv: List[str]) -> None:
+    """Run the test cases of several days in parallel."""
+    parser = argparse.ArgumentParser(
+        prog="aoc test", description="Run Advent of Code test cases in parallel"
+    )
+    parser.add_argument("--year", type=int, help="Year to test")
+    parser.add_argument("--all", action="store_true", help="Test every available day")
+    parser.add_argument("--days", type=parse_day_spec, help="Days to test (e.g., 1-5)")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=parse_positive_int,
+        default=os.cpu_count(),
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=parse_duration,
+        help="Maximum number of seconds per test case",
+    )
+    parser.add_argument("--junit", help="Write a JUnit XML report")
+    parser.add_argument("--json", help="Write a JSON report")
+    add_memory_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.year and not args.all:
+        parser.error("one of --year or --all is required")
+
+    from .utils.testing import (
+        collect_test_jobs,
+        format_case_result,
+        run_test_jobs,
+        write_json_report,
+        write_junit_report,
+    )
+
+    years = [args.year] if args.year else sorted(get_available_years())
+    jobs = [
+        job
+        for year in years
+        for job in collect_test_jobs(
+            year,
+            [
+                day
+                for day in get_available_days(year)
+                if not args.days or day in args.days
+            ],
+        )
+    ]
+    if not jobs:
+        print("No test cases found for the selected days")
+        return
+
+    start_time = time.perf_counter()
+    results = []
+    for result in run_test_jobs(
+        jobs, args.jobs, args.timeout, args.memory, args.memory_budget
+    ):
+        print(f"\n{format_case_result(result)}")
+        results.append(result)
+    elapsed = time.perf_counter() - start_time
+
+    failed = sum(not result.passed for result in results)
+    print(f"\n{len(results) - failed} passed, {failed} failed in {elapsed:.2f}s")
+    if args.junit:
+        write_junit_report(results, Path(args.junit))
+    if args.json:
+        write_json_report(results, Path(args.json))
+    if failed:
+        sys.exit(1)
+
+
+COMMANDS = {
+    "bench": bench,
+    "fetch": fetch,
+    "profile": profile,
+    "scale": scale,
+    "test": test,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+    # "aoc run ..." is an alias of "aoc ..."
+    if argv and argv[0] == "run":
+        argv = argv[1:]
+
     parser = argparse.ArgumentParser(description="Run Advent of Code solutions")
     parser.add_argument("--year", type=int, help="Year to run (e.g., 2024)")
     parser.add_argument("--day", type=int, help="Day to run (1-25)")
     parser.add_argument("--test", action="store_true", help="Run tests only")
+    parser.add_argument(
+        "--all", action="store_true", help="Run every available day in parallel"
+    )
+    parser.add_argument(
+        "--days", type=parse_day_spec, help="Days to run in parallel (e.g., 1-25)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=parse_positive_int,
+        default=os.cpu_count(),
+        help="Number of worker processes for parallel runs",
+    )
+    parser.add_argument(
+        "--spans", action="store_true", help="Print where time is spent in the day"
+    )
+    parser.add_argument("--spans-json", help="Export the timed spans as JSON")
+    parser.add_argument(
+        "--spans-openmetrics", help="Export the timed spans as OpenMetrics text"
+    )
+
+    add_memory_arguments(parser)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Solve again instead of reusing the answers of unchanged days",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Show the imports slowing down the start of the command",
+    )
+
+    args = parser.parse_args(argv)
+    if args.days and not (args.year or args.all):
+        parser.error("--days requires --year or --all")
 
-    args = parser.parse_args()
+    if args.startup_profile:
+        startup_profile(args.year, args.day)
+        return
 
     available_years = get_available_years()
 
+    if args.all and not args.year:
+        run_many(
+            sorted(available_years),
+            args.days,
+            args.jobs,
+            not args.no_cache,
+            args.memory,
+            args.memory_budget,
+        )
+        return
+
     if not args.year:
         print("Available years:")
         for year in available_years:
@@ -67,6 +686,17 @@ def main() -> None:
         )
         return
 
+    if args.all or args.days:
+        run_many(
+            [args.year],
+            args.days,
+            args.jobs,
+            not args.no_cache,
+            args.memory,
+            args.memory_budget,
+        )
+        return
+
     available_days = get_available_days(args.year)
 
     if not args.day:
@@ -79,7 +709,31 @@ def main() -> None:
         print("Day must be between 1 and 25")
         return
 
-    run_solution(args.year, args.day, args.test)
+    if not (args.spans or args.spans_json or args.spans_openmetrics):
+        run_solution(
+            args.year,
+            args.day,
+            args.test,
+            not args.no_cache,
+            args.memory,
+            args.memory_budget,
+        )
+        return
+
+    from .utils import instrumentation
+
+    collector = instrumentation.enable()
+    with instrumentation.span(f"{args.year}-day{args.day:02d}"):
+        run_solution(args.year, args.day, args.test)
+    instrumentation.disable()
+
+    if args.spans:
+        print("\nTimed spans:")
+        print(collector.format_summary())
+    if args.spans_json:
+        collector.export_json(Path(args.spans_json))
+    if args.spans_openmetrics:
+        collector.export_openmetrics(Path(args.spans_openmetrics))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+"""
+Aho-Corasick automaton, searching many patterns in a single pass over a text.
+
+The automaton is a trie of the patterns whose states are linked to the state of
+their longest proper suffix also in the trie, so a text is scanned once whatever
+the number of patterns, in O(len(text) + number of matches).
+"""
+
+import functools
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Automaton matching a set of patterns.
+
+    Args:
+        patterns (Iterable[str]): The patterns to search, duplicates being ignored
+
+    Raises:
+        ValueError: If a pattern is empty
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(patterns))
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("Patterns can't be empty")
+
+        # Transitions of the trie, suffix links and pattern ending at each state
+        self.__goto: List[Dict[str, int]] = [{}]
+        self.__terminals: List[int] = []
+        for pattern in self.patterns:
+            state = 0
+            for letter in pattern:
+                next_state = self.__goto[state].get(letter)
+                if next_state is None:
+                    next_state = len(self.__goto)
+                    self.__goto[state][letter] = next_state
+                    self.__goto.append({})
+                state = next_state
+            self.__terminals.append(state)
+        self.__build_links()
+
+    def __build_links(self) -> None:
+        state_count = len(self.__goto)
+        self.__fail = [0] * state_count
+        # States in breadth first order, so suffix states come before their states
+        self.__order: List[int] = []
+        own_patterns: List[List[int]] = [[] for _ in range(state_count)]
+        for idx, state in enumerate(self.__terminals):
+            own_patterns[state].append(idx)
+
+        queue = deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.__order.append(state)
+            for letter, next_state in self.__goto[state].items():
+                fail = self.__fail[state]
+                while fail and letter not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                self.__fail[next_state] = self.__goto[fail].get(letter, 0)
+                queue.append(next_state)
+
+        # Patterns matched when reaching a state, its own and those of its suffixes
+        self.__outputs: List[Tuple[int, ...]] = [()] * state_count
+        for state in self.__order:
+            self.__outputs[state] = (
+                tuple(own_patterns[state]) + self.__outputs[self.__fail[state]]
+            )
+
+    def __states(self, text: str) -> Iterator[int]:
+        """Iterate over the state reached after each letter of a text."""
+        goto = self.__goto
+        fail = self.__fail
+        state = 0
+        for letter in text:
+            while state and letter not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(letter, 0)
+            yield state
+
+    def find(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Find the occurrences of the patterns in a text, overlapping ones included.
+
+        Args:
+            text (str): The text to search
+
+        Yields:
+            Tuple[int, int]: The start index of each occurrence and the index of
+            its pattern in patterns
+        """
+        outputs = self.__outputs
+        for end, state in enumerate(self.__states(text)):
+            for idx in outputs[state]:
+                yield end - len(self.patterns[idx]) + 1, idx
+
+    def count(self, texts: Iterable[str]) -> List[int]:
+        """
+        Count the occurrences of each pattern in several texts.
+
+        The visits of each state are counted first, then added to the states of
+        their suffixes, so counting costs nothing per occurrence.
+
+        Args:
+            texts (Iterable[str]): The texts to search
+
+        Returns:
+            List[int]: The number of occurrences of each pattern, in the order of
+            patterns
+        """
+        visits = [0] * len(self.__goto)
+        for text in texts:
+            for state in self.__states(text):
+                visits[state] += 1
+        for state in reversed(self.__order):
+            visits[self.__fail[state]] += visits[state]
+        return [visits[state] for state in self.__terminals]
+
+
+@functools.lru_cache(maxsize=32)
+def get_automaton(patterns: FrozenSet[str]) -> AhoCorasick:
+    """Get the automaton of a set of patterns, built once per set."""
+    return AhoCorasick(sorted(patterns))
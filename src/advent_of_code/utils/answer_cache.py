@@ -0,0 +1,249 @@
+"""
+On-disk cache of the answers of the solutions.
+
+An answer is stored under a key hashing the source of the solution module, the
+source of the advent_of_code modules it imports (directly or not), the puzzle
+input and the part. Changing any of them changes the key, so cached answers
+never need to be invalidated, only evicted when the cache grows too large.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from .aoc_login import get_input_path
+from .common import atomic_write_text, get_cache_dir
+from .registry import get_registry, load_solution
+
+PACKAGE_NAME = "advent_of_code"
+PACKAGE_DIR = Path(__file__).parent.parent
+
+# Answers kept before the least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 1024
+
+_CHUNK_SIZE = 1 << 20
+
+# Fingerprints of the modules, by path and modification time
+_fingerprints: Dict[Tuple[str, int], str] = {}
+
+
+def _module_path(module: str) -> Optional[Path]:
+    """Get the source file of a module of the package, without importing it."""
+    relative = Path(*module.split(".")[1:])
+    for path in (
+        PACKAGE_DIR / relative.with_suffix(".py"),
+        PACKAGE_DIR / relative / "__init__.py",
+    ):
+        if path.is_file():
+            return path
+    return None
+
+
+def _imported_modules(path: Path, module: str) -> Set[str]:
+    """Get the package modules imported by a source file."""
+    is_package = path.name == "__init__.py"
+    parent_parts = module.split(".") if is_package else module.split(".")[:-1]
+
+    imported: Set[str] = set()
+    for node in ast.walk(ast.parse(path.read_bytes(), str(path))):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = parent_parts[: len(parent_parts) - node.level + 1]
+                base = ".".join(base_parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            # "from package import module" imports a module, not an attribute
+            names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        imported.update(
+            name
+            for name in names
+            if name.split(".")[0] == PACKAGE_NAME and _module_path(name) is not None
+        )
+    return imported
+
+
+def source_fingerprint(module: str) -> str:
+    """
+    Hash the source of a package module and of the package modules it imports.
+
+    Args:
+        module (str): Name of the module, e.g. advent_of_code.year2024.day01_solution
+
+    Returns:
+        str: Hex digest changing whenever one of these source files changes
+
+    Raises:
+        ValueError: If the module isn't a module of the package
+    """
+    if _module_path(module) is None:
+        raise ValueError(f"{module} is not a module of {PACKAGE_NAME}")
+    digest = hashlib.sha256()
+    to_visit = [module]
+    visited = set()
+    while to_visit:
+        name = to_visit.pop()
+        path = _module_path(name)
+        if name in visited or path is None:
+            continue
+        visited.add(name)
+        to_visit.extend(_imported_modules(path, name))
+
+    for name in sorted(visited):
+        path = _module_path(name)
+        assert path is not None
+        cache_key = (str(path), path.stat().st_mtime_ns)
+        if cache_key not in _fingerprints:
+            _fingerprints[cache_key] = hashlib.sha256(path.read_bytes()).hexdigest()
+        digest.update(f"{name}:{_fingerprints[cache_key]}\n".encode())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path) -> str:
+    """Hash the content of a file, reading it by chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Answers of the solutions, one small JSON file per answer.
+
+    Each answer is written atomically to its own file, so processes running
+    solutions in parallel can share the cache.
+
+    Args:
+        path (Optional[Path]): Directory of the cache, defaults to the answers
+            directory of the cache directory
+        max_entries (int): Number of answers kept, the least recently used ones
+            being evicted first
+    """
+
+    def __init__(
+        self, path: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.path = path or get_cache_dir() / "answers"
+        self.max_entries = max_entries
+
+    def get_key(self, module: str, input_path: Path, part: int) -> str:
+        """
+        Build the key of an answer.
+
+        Args:
+            module (str): Name of the solution module
+            input_path (Path): The puzzle input file
+            part (int): The part of the puzzle
+
+        Returns:
+            str: Hex digest identifying the answer
+        """
+        return hashlib.sha256(
+            "\n".join(
+                [source_fingerprint(module), file_fingerprint(input_path), str(part)]
+            ).encode()
+        ).hexdigest()
+
+    def __entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached answer, or None if it isn't cached."""
+        entry_path = self.__entry_path(key)
+        try:
+            answer = json.loads(entry_path.read_text())["answer"]
+            # Mark the answer as recently used
+            os.utime(entry_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return answer
+
+    def put(self, key: str, answer: Any) -> None:
+        """Cache an answer, unless it can't be stored as JSON."""
+        try:
+            text = json.dumps({"answer": answer})
+        except TypeError:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.__entry_path(key), text)
+        self.__evict()
+
+    def __evict(self) -> None:
+        entries = list(self.path.glob("*.json"))
+        if len(entries) <= self.max_entries:
+            return
+        mtimes = {}
+        for entry in entries:
+            try:
+                mtimes[entry] = entry.stat().st_mtime_ns
+            except OSError:
+                # Evicted by another process
+                pass
+        oldest = sorted(mtimes, key=mtimes.__getitem__)
+        for entry in oldest[: len(oldest) - self.max_entries]:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for entry in self.path.glob("*.json"):
+            entry.unlink()
+
+
+def solve_cached(
+    year: int,
+    day: int,
+    parts: Sequence[int] = (1, 2),
+    cache: Optional[AnswerCache] = None,
+) -> Dict[int, Tuple[Any, bool]]:
+    """
+    Solve parts of a puzzle, reusing their cached answers if possible.
+
+    The solution is only imported when an answer isn't cached, so unchanged days
+    are answered without loading their solution nor parsing their input.
+
+    Args:
+        year (int): The year of the puzzle
+        day (int): The day of the puzzle
+        parts (Sequence[int]): The parts to solve
+        cache (Optional[AnswerCache]): The cache to use, None to always solve
+
+    Returns:
+        Dict[int, Tuple[Any, bool]]: The answer of each part, and whether it came
+        from the cache
+
+    Raises:
+        SolutionNotFoundError: If there is no solution for this day
+    """
+    answers: Dict[int, Tuple[Any, bool]] = {}
+    keys: Dict[int, str] = {}
+    if cache is not None:
+        module = get_registry().get(year, day).module
+        input_path = get_input_path(year, day)
+        for part in parts:
+            keys[part] = cache.get_key(module, input_path, part)
+            answer = cache.get(keys[part])
+            if answer is not None:
+                answers[part] = (answer, True)
+
+    missing = [part for part in parts if part not in answers]
+    if missing:
+        with load_solution(year, day) as solution:
+            input_data = solution.read_input()
+            for part in missing:
+                answer = solution.run_part(part, input_data)
+                if cache is not None:
+                    cache.put(keys[part], answer)
+                answers[part] = (answer, False)
+    return answers
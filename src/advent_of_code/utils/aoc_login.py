@@ -2,8 +2,22 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 
-import requests
-from dotenv import load_dotenv
+from .common import atomic_write_text
+
+DEFAULT_BASE_URL = "https://adventofcode.com"
+
+
+def get_base_url() -> str:
+    """Get the Advent of Code server URL, which AOC_BASE_URL can override."""
+    return os.getenv("AOC_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
+def get_inputs_dir(year: int) -> Path:
+    """Get the directory of the inputs of a year, which AOC_INPUTS_DIR can override."""
+    inputs_dir = os.getenv("AOC_INPUTS_DIR")
+    if inputs_dir:
+        return Path(inputs_dir) / f"year{year}"
+    return Path(__file__).parent.parent / "inputs" / f"year{year}"
 
 
 def get_session_cookie() -> str:
@@ -16,6 +30,9 @@ def get_session_cookie() -> str:
     Raises:
         ValueError: If no session cookie is found
     """
+    # Imported here to keep it out of the startup of runs that never download
+    from dotenv import load_dotenv
+
     # Try to load from .env file first
     load_dotenv()
 
@@ -37,7 +54,6 @@ def download_input(year: int, day: int) -> str:
     Args:
         year (int): The year of the puzzle
         day (int): The day of the puzzle
-        session (str): The session cookie value
 
     Returns:
         str: The puzzle input as a string
@@ -45,7 +61,9 @@ def download_input(year: int, day: int) -> str:
     Raises:
         requests.RequestException: If the request fails
     """
-    url = f"https://adventofcode.com/{year}/day/{day}/input"
+    import requests
+
+    url = f"{get_base_url()}/{year}/day/{day}/input"
     cookies = {"session": get_session_cookie()}
 
     response = requests.get(url, cookies=cookies)
@@ -66,12 +84,32 @@ def save_input_to_file(year: int, day: int, input_data: str) -> Path:
         Path: The path to the saved input file
     """
     # Create inputs directory if it doesn't exist
-    inputs_dir = Path(__file__).parent.parent / "inputs" / f"year{year}"
+    inputs_dir = get_inputs_dir(year)
     inputs_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save input to file
+    # Save input to file, never leaving a partially written file behind
     input_file = inputs_dir / f"day{day:02d}_input.txt"
-    input_file.write_text(input_data)
+    atomic_write_text(input_file, input_data)
+
+    return input_file
+
+
+def get_input_path(year: int, day: int, force_download: bool = False) -> Path:
+    """
+    Get the path of the input file for a specific year and day, downloading it if needed.
+
+    Args:
+        year (int): The year of the puzzle
+        day (int): The day of the puzzle
+        force_download (bool): Whether to force download even if cached
+
+    Returns:
+        Path: The path to the input file
+    """
+    input_file = get_inputs_dir(year) / f"day{day:02d}_input.txt"
+
+    if force_download or not input_file.exists():
+        input_file = save_input_to_file(year, day, download_input(year, day))
 
     return input_file
 
@@ -88,22 +126,7 @@ def get_input(year: int, day: int, force_download: bool = False) -> str:
     Returns:
         str: The puzzle input as a string
     """
-    # Check if input is already cached
-    input_file = (
-        Path(__file__).parent.parent
-        / "inputs"
-        / f"year{year}"
-        / f"day{day:02d}_input.txt"
-    )
-
-    if not force_download and input_file.exists():
-        return input_file.read_text().strip()
-
-    # Download and cache the input
-    input_data = download_input(year, day)
-    save_input_to_file(year, day, input_data)
-
-    return input_data
+    return get_input_path(year, day, force_download).read_text().strip()
 
 
 # def convert_to_int_matrix(data: str) -> List[List[int]]:
@@ -0,0 +1,172 @@
+import math
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from .memory import MemoryUsage, format_memory, solve_tracking_memory
+from .template import AOCSolution
+
+
+@dataclass
+class TimingStats:
+    """Statistics over a list of timing samples, in nanoseconds."""
+
+    samples: List[int] = field(default_factory=list)
+
+    @property
+    def min(self) -> int:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> int:
+        # Nearest-rank percentile
+        ordered = sorted(self.samples)
+        return ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+
+    @property
+    def stddev(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        return statistics.stdev(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "min_ns": self.min,
+            "median_ns": self.median,
+            "p95_ns": self.p95,
+            "stddev_ns": self.stddev,
+            "samples_ns": self.samples,
+        }
+
+
+@dataclass
+class BenchResult:
+    """Timings of the parsing and of each part of a puzzle."""
+
+    year: int
+    day: int
+    repeat: int
+    warmup: int
+    parse: TimingStats
+    parts: Dict[int, TimingStats]
+    answers: Dict[int, Any]
+    # Peak memory of the parsing and of each part, when measured
+    memory: Optional[Dict[str, MemoryUsage]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year,
+            "day": self.day,
+            "repeat": self.repeat,
+            "warmup": self.warmup,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "parse": self.parse.to_dict(),
+            "parts": {
+                str(part): {"answer": self.answers[part], **stats.to_dict()}
+                for part, stats in self.parts.items()
+            },
+            "memory": self.memory
+            and {step: usage.to_dict() for step, usage in self.memory.items()},
+        }
+
+
+def benchmark(
+    solution: AOCSolution,
+    parts: Sequence[int] = (1, 2),
+    repeat: int = 10,
+    warmup: int = 1,
+    input_data: Optional[Any] = None,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> BenchResult:
+    """
+    Time the parsing and the requested parts of a solution.
+
+    Each round parses the input from scratch, so the parsing time is measured
+    separately from the time spent solving each part. Memory is measured in an
+    extra round, as tracing allocations would slow down the timed rounds.
+
+    Args:
+        solution (AOCSolution): The solution to benchmark
+        parts (Sequence[int]): Parts to time
+        repeat (int): Number of measured rounds
+        warmup (int): Number of rounds run before measuring
+        input_data (Optional[Any]): Input to use instead of the puzzle input
+        measure_memory (bool): Measure the peak memory of each step
+        memory_budget (Optional[int]): Maximum bytes allocated by each step, which
+            implies measuring memory
+
+    Returns:
+        BenchResult: The collected timings
+
+    Raises:
+        MemoryBudgetExceeded: If a step exceeds the memory budget
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    if input_data is None:
+        input_data = solution.read_input()
+
+    parse_stats = TimingStats()
+    part_stats = {part: TimingStats() for part in parts}
+    answers: Dict[int, Any] = {}
+
+    for round_idx in range(warmup + repeat):
+        start = time.perf_counter_ns()
+        parsed = solution.parse(input_data)
+        parse_time = time.perf_counter_ns() - start
+        if round_idx >= warmup:
+            parse_stats.samples.append(parse_time)
+
+        for part in parts:
+            solve_part = getattr(solution, f"part{part}")
+            start = time.perf_counter_ns()
+            answers[part] = solve_part(parsed)
+            solve_time = time.perf_counter_ns() - start
+            if round_idx >= warmup:
+                part_stats[part].samples.append(solve_time)
+
+    memory = None
+    if measure_memory or memory_budget is not None:
+        _, memory = solve_tracking_memory(solution, input_data, parts, memory_budget)
+
+    return BenchResult(
+        year=solution.year,
+        day=solution.day,
+        repeat=repeat,
+        warmup=warmup,
+        parse=parse_stats,
+        parts=part_stats,
+        answers=answers,
+        memory=memory,
+    )
+
+
+def format_bench_result(result: BenchResult) -> str:
+    """Format benchmark results as a human readable table, in milliseconds."""
+    lines = [
+        f"Year {result.year}, Day {result.day} "
+        f"({result.repeat} rounds, {result.warmup} warmup)",
+        f"{'step':<8}{'min':>12}{'median':>12}{'p95':>12}{'stddev':>12}",
+    ]
+    steps = [("parse", result.parse)]
+    steps += [(f"part{part}", stats) for part, stats in result.parts.items()]
+    for name, stats in steps:
+        lines.append(
+            f"{name:<8}"
+            + "".join(
+                f"{value / 1e6:>10.3f}ms"
+                for value in (stats.min, stats.median, stats.p95, stats.stddev)
+            )
+        )
+    if result.memory is not None:
+        lines.append(f"memory: {format_memory(result.memory)}")
+    return "\n".join(lines)
@@ -1,6 +1,68 @@
+import atexit
+import functools
+import os
 import re
+import tempfile
+import types
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Callable, List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .instrumentation import instrumented
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used to store cached data (timings, results, ...).
+
+    The location can be overridden with the AOC_CACHE_DIR environment variable,
+    and defaults to advent_of_code in the user cache directory ($XDG_CACHE_HOME,
+    or ~/.cache), so that installed packages are never written to.
+
+    Returns:
+        Path: The cache directory, created if it doesn't exist
+    """
+    cache_dir_env = os.getenv("AOC_CACHE_DIR")
+    if cache_dir_env:
+        cache_dir = Path(cache_dir_env)
+    else:
+        user_cache_dir = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(user_cache_dir) / "advent_of_code"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write a file atomically.
+
+    The data is written to a temporary file in the same directory, which then
+    replaces the target file, so readers never see a partially written file.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write a UTF-8 text file atomically, see atomic_write_bytes."""
+    atomic_write_bytes(path, text.encode())
 
 
 def convert_to_int_matrix(data: str) -> List[List[int]]:
@@ -11,7 +73,7 @@ def convert_to_int_matrix(data: str) -> List[List[int]]:
 def read_input_file(file_path: str) -> List[str]:
     """Read input from a file."""
     with open(file_path, "r") as f:
-        return [line.strip() for line in f.readlines()]
+        return [line.strip() for line in f]
 
 
 def extract_numbers(text: str) -> List[int]:
@@ -20,26 +82,200 @@ def extract_numbers(text: str) -> List[int]:
 
 
 def timed_execution(func: Callable) -> Callable:
-    """Decorator to measure execution time of a function."""
-    import time
+    """
+    Decorator to measure execution time of a function.
+
+    Each call is recorded as a span named after the function, see
+    advent_of_code.utils.instrumentation.
+    """
+    return instrumented(func.__name__)(func)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a memoized function."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class _KwargsMark:
+    """
+    Separator of the positional and keyword arguments in cache keys.
+
+    The class itself is the marker: classes are pickled by reference, so keys
+    reloaded from a persisted cache still hold the same marker.
+    """
+
+
+def _make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    if not kwargs:
+        return args
+    return args + (_KwargsMark,) + tuple(sorted(kwargs.items()))
+
+
+def _hash_const(const: Any, digest: Any) -> None:
+    if isinstance(const, types.CodeType):
+        _hash_code(const, digest)
+    elif isinstance(const, (tuple, frozenset)):
+        # The order of frozensets depends on the hash seed of the process
+        items = const if isinstance(const, tuple) else sorted(const, key=repr)
+        digest.update(f"{type(const).__name__}{len(items)}(".encode())
+        for item in items:
+            _hash_const(item, digest)
+        digest.update(b")")
+    else:
+        digest.update(repr(const).encode())
+
+
+def _hash_code(code: types.CodeType, digest: Any) -> None:
+    """Hash a code object and its nested code objects, without memory addresses."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    _hash_const(code.co_consts, digest)
+
+
+def _code_fingerprint(func: Callable) -> str:
+    """Hash the code of a function, to discard caches persisted by older versions."""
+    import hashlib
+
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return ""
+    digest = hashlib.sha256()
+    _hash_code(code, digest)
+    return digest.hexdigest()
+
+
+# Functions saving the persisted caches, called by a single exit hook
+_persisted_cache_savers: List[Callable[[], None]] = []
+
+
+def _save_persisted_caches() -> None:
+    for cache_save in _persisted_cache_savers:
+        try:
+            cache_save()
+        except OSError:
+            pass
+
+
+def memoize(
+    func: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    persist: Union[bool, str, Path] = False,
+) -> Callable:
+    """
+    Decorator to cache function results.
+
+    Can be used bare (@memoize) for an unbounded cache, or with options
+    (@memoize(maxsize=100_000)). The decorated function exposes cache_info(),
+    cache_clear() and cache_save().
+
+    Args:
+        func (Optional[Callable]): The function to decorate
+        maxsize (Optional[int]): Maximum number of cached results, the least
+            recently used ones being evicted first. None means unbounded.
+        key (Optional[Callable[..., Hashable]]): Build the cache key from the
+            call arguments, defaults to the positional and keyword arguments
+        persist (Union[bool, str, Path]): File to save the cache to between runs,
+            or True to save it in the cache directory. The cache is saved at exit
+            and is discarded when the code of the function changes.
+
+    Returns:
+        Callable: The memoized function
+    """
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be a positive integer or None")
+
+    def decorator(func: Callable) -> Callable:
+        cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        make_key = key or (lambda *args, **kwargs: _make_key(args, kwargs))
+
+        persist_path: Optional[Path] = None
+        if persist is True:
+            persist_path = (
+                get_cache_dir()
+                / "memoize"
+                / f"{func.__module__}.{func.__qualname__}.pickle"
+            )
+        elif persist:
+            persist_path = Path(persist)
+        fingerprint = _code_fingerprint(func) if persist_path is not None else ""
+
+        if persist_path is not None and persist_path.exists():
+            # Only needed by persisted caches, kept out of the startup otherwise
+            import pickle
+
+            try:
+                with open(persist_path, "rb") as f:
+                    saved_fingerprint, saved_cache = pickle.load(f)
+                if saved_fingerprint == fingerprint:
+                    cache.update(saved_cache)
+            except (
+                OSError,
+                pickle.UnpicklingError,
+                EOFError,
+                ValueError,
+                AttributeError,
+                ImportError,
+            ):
+                # Corrupted, or pickled objects whose class no longer exists
+                cache.clear()
+            # The cache may have been saved with a larger maxsize
+            while maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = make_key(*args, **kwargs)
+            try:
+                result = cache[cache_key]
+            except KeyError:
+                pass
+            else:
+                stats["hits"] += 1
+                if maxsize is not None:
+                    cache.move_to_end(cache_key)
+                return result
+
+            stats["misses"] += 1
+            result = func(*args, **kwargs)
+            cache[cache_key] = result
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+                stats["evictions"] += 1
+            return result
 
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        print(f"Execution time: {(end_time - start_time)*1e+3:.4f} ms")
-        return result
+        def cache_info() -> CacheInfo:
+            return CacheInfo(maxsize=maxsize, currsize=len(cache), **stats)
 
-    return wrapper
+        def cache_clear() -> None:
+            cache.clear()
+            stats.update(hits=0, misses=0, evictions=0)
 
+        def cache_save() -> None:
+            if persist_path is None:
+                return
+            import pickle
 
-def memoize(func: Callable) -> Callable:
-    """Decorator to cache function results."""
-    cache = {}
+            persist_path.parent.mkdir(parents=True, exist_ok=True)
+            # Exiting while saving must not leave a truncated cache behind
+            atomic_write_bytes(persist_path, pickle.dumps((fingerprint, dict(cache))))
 
-    def wrapper(*args: Any) -> Any:
-        if args not in cache:
-            cache[args] = func(*args)
-        return cache[args]
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_save = cache_save  # type: ignore[attr-defined]
+        if persist_path is not None:
+            if not _persisted_cache_savers:
+                atexit.register(_save_persisted_caches)
+            _persisted_cache_savers.append(cache_save)
+        return wrapper
 
-    return wrapper
+    if func is not None:
+        return decorator(func)
+    return decorator
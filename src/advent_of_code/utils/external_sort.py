@@ -0,0 +1,74 @@
+import heapq
+import itertools
+import tempfile
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+
+def _write_run(values: List[int], run_dir: Path, run_idx: int) -> Path:
+    run_file = run_dir / f"run{run_idx:06d}.bin"
+    with open(run_file, "wb") as f:
+        array("q", sorted(values)).tofile(f)
+    return run_file
+
+
+def _read_run(run: BinaryIO, block_size: int) -> Iterator[int]:
+    while True:
+        block = array("q")
+        try:
+            block.fromfile(run, block_size)
+        except EOFError:
+            # fromfile still loads the last incomplete block
+            yield from block
+            return
+        yield from block
+
+
+def external_sorted(
+    values: Iterable[int],
+    chunk_size: int = 1_000_000,
+    tmp_dir: Optional[str] = None,
+) -> Iterator[int]:
+    """
+    Sort integers that don't fit in memory.
+
+    Values are sorted by chunks written to temporary files (sorted runs), which
+    are then lazily merged. At most chunk_size values are held in memory while
+    building the runs, and a small buffer per run while merging.
+
+    Args:
+        values (Iterable[int]): 64-bit signed integers to sort
+        chunk_size (int): Number of values sorted in memory at once
+        tmp_dir (Optional[str]): Directory where the runs are written
+
+    Yields:
+        int: The values in ascending order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    iterator = iter(values)
+    first_chunk = list(itertools.islice(iterator, chunk_size))
+    if len(first_chunk) < chunk_size:
+        # Everything fits in a single chunk, no need to go through the disk
+        yield from sorted(first_chunk)
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        runs = [_write_run(first_chunk, Path(run_dir), 0)]
+        del first_chunk
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+            runs.append(_write_run(chunk, Path(run_dir), len(runs)))
+        del chunk
+
+        block_size = max(chunk_size // len(runs), 1024)
+        run_files = [open(run, "rb") for run in runs]
+        try:
+            yield from heapq.merge(*(_read_run(f, block_size) for f in run_files))
+        finally:
+            for f in run_files:
+                f.close()
@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .aoc_login import get_base_url, get_inputs_dir, get_session_cookie
+from .common import atomic_write_text
+
+USER_AGENT = "github.com/adelmhi/advent-of-code"
+
+
+class RateLimiter:
+    """Space out calls by a minimum interval, across all threads."""
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = min_interval
+        self.__next_time = 0.0
+        self.__lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self.__lock:
+            now = time.monotonic()
+            call_time = max(now, self.__next_time)
+            self.__next_time = call_time + self.min_interval
+        if call_time > now:
+            time.sleep(call_time - now)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching the input of a day."""
+
+    year: int
+    day: int
+    path: Path
+    # "downloaded", "not-modified", "cached" or "error"
+    status: str
+    error: Optional[str] = None
+
+
+class InputFetcher:
+    """
+    Download puzzle inputs with a pooled session.
+
+    Requests go through a small bounded thread pool and a rate limiter, and
+    failed requests are retried with exponential backoff. The ETag and
+    Last-Modified headers of each input are saved next to it, so an input
+    downloaded before is only revalidated with a conditional request.
+
+    Args:
+        session_cookie (Optional[str]): Session cookie, read from the environment
+            by the first request by default
+        base_url (Optional[str]): Server URL, defaults to AOC_BASE_URL or
+            https://adventofcode.com
+        inputs_dir (Optional[Path]): Root directory of the inputs, defaults to the
+            package inputs directory
+        workers (int): Maximum number of concurrent requests
+        min_interval (float): Minimum number of seconds between two requests
+        retries (int): Number of retries of a failed request
+        backoff (float): Backoff factor between retries, in seconds
+        timeout (float): Timeout of a request, in seconds
+    """
+
+    def __init__(
+        self,
+        session_cookie: Optional[str] = None,
+        base_url: Optional[str] = None,
+        inputs_dir: Optional[Path] = None,
+        workers: int = 4,
+        min_interval: float = 1.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+    ) -> None:
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.inputs_dir = inputs_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(min_interval)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=workers, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+        # Read from the environment by the first request, so that failing to
+        # find it is reported as a failed download
+        self.__session_cookie = session_cookie
+
+    def get_input_path(self, year: int, day: int) -> Path:
+        if self.inputs_dir is None:
+            inputs_dir = get_inputs_dir(year)
+        else:
+            inputs_dir = Path(self.inputs_dir) / f"year{year}"
+        return inputs_dir / f"day{day:02d}_input.txt"
+
+    @staticmethod
+    def __get_metadata_path(input_file: Path) -> Path:
+        return input_file.with_name(f".{input_file.name}.json")
+
+    @staticmethod
+    def __read_metadata(metadata_file: Path) -> Optional[Dict[str, Any]]:
+        """Read the validators of a downloaded input, None if missing or unreadable."""
+        try:
+            metadata = json.loads(metadata_file.read_text())
+        except (OSError, ValueError):
+            return None
+        return metadata if isinstance(metadata, dict) else None
+
+    def fetch(self, year: int, day: int, force: bool = False) -> FetchResult:
+        """
+        Fetch the input of a day, unless it is known to be up to date.
+
+        Args:
+            year (int): The year of the puzzle
+            day (int): The day of the puzzle
+            force (bool): Download the input even if it is already cached
+
+        Returns:
+            FetchResult: How the input was obtained
+
+        Raises:
+            requests.RequestException: If the request fails
+            ValueError: If no session cookie is configured
+        """
+        input_file = self.get_input_path(year, day)
+        metadata_file = self.__get_metadata_path(input_file)
+
+        headers: Dict[str, str] = {}
+        if input_file.exists() and not force:
+            metadata = self.__read_metadata(metadata_file)
+            if metadata is None:
+                # Not downloaded by the fetcher, nothing to revalidate it with
+                return FetchResult(year, day, input_file, "cached")
+            if metadata.get("etag"):
+                headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["If-Modified-Since"] = metadata["last_modified"]
+
+        if "session" not in self.session.cookies:
+            self.session.cookies.set(
+                "session", self.__session_cookie or get_session_cookie()
+            )
+        self.rate_limiter.wait()
+        response = self.session.get(
+            f"{self.base_url}/{year}/day/{day}/input",
+            headers=headers,
+            timeout=self.timeout,
+        )
+        if response.status_code == 304:
+            return FetchResult(year, day, input_file, "not-modified")
+        response.raise_for_status()
+
+        input_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(input_file, response.text.strip())
+        atomic_write_text(
+            metadata_file,
+            json.dumps(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+            ),
+        )
+        return FetchResult(year, day, input_file, "downloaded")
+
+    def fetch_all(
+        self, year: int, days: Iterable[int], force: bool = False
+    ) -> List[FetchResult]:
+        """Fetch the inputs of several days concurrently, in the order of the days."""
+
+        def fetch_day(day: int) -> FetchResult:
+            try:
+                return self.fetch(year, day, force)
+            except Exception as e:
+                return FetchResult(
+                    year, day, self.get_input_path(year, day), "error", str(e)
+                )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(fetch_day, days))
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,200 @@
+"""
+Span based instrumentation of the solutions.
+
+Spans are named, nested timers. They cost a single global lookup while no
+collector is enabled, so hot functions can stay decorated permanently:
+
+    with span("parse"):
+        data = parse_input(input_data)
+
+    @instrumented()
+    def get_correct_update(...): ...
+
+Each span is recorded under its path in the span tree (e.g. "part2/get_correct_update")
+by the enabled SpanCollector, which can export them as JSON or OpenMetrics text.
+"""
+
+import functools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class SpanStats:
+    """Aggregated durations of all the occurrences of a span, in nanoseconds."""
+
+    count: int = 0
+    total_ns: int = 0
+    min_ns: int = 0
+    max_ns: int = 0
+
+    def add(self, duration_ns: int) -> None:
+        if self.count == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.count += 1
+        self.total_ns += duration_ns
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+        }
+
+
+def _openmetrics_labels(path: str) -> str:
+    escaped = path.replace("\\", "\\\\").replace('"', '\\"')
+    return f'{{span="{escaped}"}}'
+
+
+class SpanCollector:
+    """Collect the spans recorded while it is enabled."""
+
+    def __init__(self) -> None:
+        self.spans: Dict[str, SpanStats] = {}
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    @property
+    def stack(self) -> List[str]:
+        """Names of the spans currently open in this thread."""
+        stack: Optional[List[str]] = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        return stack
+
+    def open(self, path: str) -> None:
+        """Register a span when it starts, so spans are listed in start order."""
+        if path not in self.spans:
+            with self.__lock:
+                self.spans.setdefault(path, SpanStats())
+
+    def record(self, path: str, duration_ns: int) -> None:
+        with self.__lock:
+            self.spans.setdefault(path, SpanStats()).add(duration_ns)
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        return {path: stats.to_dict() for path, stats in self.spans.items()}
+
+    def export_json(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    def to_openmetrics(self) -> str:
+        """Format the spans using the OpenMetrics text exposition format."""
+        lines = [
+            "# TYPE aoc_span_seconds summary",
+            "# UNIT aoc_span_seconds seconds",
+            "# HELP aoc_span_seconds Time spent in each span.",
+        ]
+        for path, stats in self.spans.items():
+            labels = _openmetrics_labels(path)
+            lines.append(f"aoc_span_seconds_count{labels} {stats.count}")
+            lines.append(f"aoc_span_seconds_sum{labels} {stats.total_ns / 1e9}")
+        for bound in ("min", "max"):
+            lines.append(f"# TYPE aoc_span_{bound}_seconds gauge")
+            lines.append(f"# UNIT aoc_span_{bound}_seconds seconds")
+            for path, stats in self.spans.items():
+                labels = _openmetrics_labels(path)
+                value = getattr(stats, f"{bound}_ns") / 1e9
+                lines.append(f"aoc_span_{bound}_seconds{labels} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def export_openmetrics(self, path: Path) -> None:
+        Path(path).write_text(self.to_openmetrics())
+
+    def format_summary(self) -> str:
+        """Format the spans as an indented tree, in milliseconds."""
+        lines = []
+        for path, stats in self.spans.items():
+            depth = path.count("/")
+            name = path.rsplit("/", 1)[-1]
+            lines.append(
+                f"{'  ' * depth}{name}: {stats.total_ns / 1e6:.3f} ms"
+                f" ({stats.count} call{'s' if stats.count > 1 else ''})"
+            )
+        return "\n".join(lines)
+
+
+class _Span:
+    def __init__(self, collector: SpanCollector, name: str) -> None:
+        self.collector = collector
+        self.name = name
+        self.path = name
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        stack = self.collector.stack
+        stack.append(self.name)
+        self.path = "/".join(stack)
+        self.collector.open(self.path)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        self.collector.stack.pop()
+        self.collector.record(self.path, duration_ns)
+
+
+class _NoopSpan:
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_collector: Optional[SpanCollector] = None
+
+
+def enable(collector: Optional[SpanCollector] = None) -> SpanCollector:
+    """Start recording spans, in a new collector unless one is given."""
+    global _collector
+    _collector = collector or SpanCollector()
+    return _collector
+
+
+def disable() -> Optional[SpanCollector]:
+    """Stop recording spans and return the collector used until now."""
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+
+def get_collector() -> Optional[SpanCollector]:
+    return _collector
+
+
+def span(name: str) -> ContextManager[Any]:
+    """Time a block of code as a span nested in the currently open spans."""
+    if _collector is None:
+        return _NOOP_SPAN
+    return _Span(_collector, name)
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator recording every call of a function as a span."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _collector is None:
+                return func(*args, **kwargs)
+            with _Span(_collector, span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,154 @@
+"""
+Data-parallel map-reduce over the lines of large inputs.
+
+The input is copied once to shared memory and split into byte ranges ending on
+line breaks. Worker processes read their range straight from the shared memory,
+so only the range bounds and the map results are pickled, and the results are
+combined in input order by an associative reduce function. Data needed by every
+chunk, such as parsed rules, is sent once per worker through an initializer
+instead of with each chunk.
+"""
+
+import functools
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+TupleT = TypeVar("TupleT", bound=Tuple[Any, ...])
+
+# Inputs smaller than this are mapped in the calling process
+PARALLEL_MIN_BYTES = 8 << 20
+
+# Number of chunks per worker, so that uneven chunks don't leave workers idle
+CHUNKS_PER_WORKER = 4
+
+
+def get_worker_count() -> int:
+    """Get the number of CPUs the process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def use_parallel(data: Union[str, bytes], min_bytes: int = PARALLEL_MIN_BYTES) -> bool:
+    """Check if an input is large enough to be mapped by several processes."""
+    return len(data) >= min_bytes and get_worker_count() > 1
+
+
+def split_line_chunks(data: bytes, chunk_count: int) -> List[Tuple[int, int]]:
+    """
+    Split data into about chunk_count byte ranges made of whole lines.
+
+    Args:
+        data (bytes): Lines separated by line breaks
+        chunk_count (int): Number of ranges wanted, less are returned when there
+            are not enough lines
+
+    Returns:
+        List[Tuple[int, int]]: The start and end of each range, the line break
+        ending a range being included in it
+    """
+    if chunk_count < 1:
+        raise ValueError("chunk_count must be at least 1")
+    size = len(data)
+    chunks = []
+    start = 0
+    for idx in range(1, chunk_count + 1):
+        if start >= size:
+            break
+        target = max(size * idx // chunk_count, start)
+        newline = data.find(b"\n", target) if idx < chunk_count else -1
+        end = size if newline == -1 else newline + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def _decode_chunk(chunk: bytes) -> str:
+    """Decode a range of lines, without the line break of its last line."""
+    text = chunk.decode()
+    return text[:-1] if text.endswith("\n") else text
+
+
+def _map_shared_chunk(
+    name: str, start: int, end: int, map_func: Callable[[str], T]
+) -> T:
+    """Apply a map function to a range of lines of a shared memory block."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        chunk = bytes(shm.buf[start:end])  # type: ignore[index]
+    finally:
+        shm.close()
+    return map_func(_decode_chunk(chunk))
+
+
+def map_reduce(
+    data: Union[str, bytes],
+    map_func: Callable[[str], T],
+    reduce_func: Callable[[T, T], T],
+    workers: Optional[int] = None,
+    chunk_count: Optional[int] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Sequence[Any] = (),
+) -> T:
+    """
+    Map a function over chunks of lines in a process pool, then reduce the results.
+
+    Args:
+        data (Union[str, bytes]): Lines separated by line breaks
+        map_func (Callable[[str], T]): Picklable function (a module level function
+            or a partial of one) mapping a chunk of whole lines, without its
+            final line break, to a result
+        reduce_func (Callable[[T, T], T]): Associative function combining two
+            results, called in input order
+        workers (Optional[int]): Number of worker processes, defaults to the
+            number of CPUs. A single worker maps the data in the calling process.
+        chunk_count (Optional[int]): Number of chunks, defaults to
+            CHUNKS_PER_WORKER chunks per worker
+        initializer (Optional[Callable[..., None]]): Picklable function called
+            with initargs once in each worker before mapping, or in the calling
+            process when it maps the data itself. Used to send large shared
+            data, such as parsed rules, once per worker instead of with each
+            chunk.
+        initargs (Sequence[Any]): Arguments of the initializer
+
+    Returns:
+        T: The reduced result
+    """
+    data_bytes = data.encode() if isinstance(data, str) else bytes(data)
+    workers = workers or get_worker_count()
+    chunks = split_line_chunks(data_bytes, chunk_count or workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(chunks) <= 1:
+        # The reduce function being associative, mapping everything at once is
+        # the same as reducing the chunks
+        if initializer is not None:
+            initializer(*initargs)
+        return map_func(_decode_chunk(data_bytes))
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data_bytes))
+    try:
+        shm.buf[: len(data_bytes)] = data_bytes  # type: ignore[index]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=initializer, initargs=tuple(initargs)
+        ) as executor:
+            futures = [
+                executor.submit(_map_shared_chunk, shm.name, start, end, map_func)
+                for start, end in chunks
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    return functools.reduce(reduce_func, results)
+
+
+def add_tuples(first: TupleT, second: TupleT) -> TupleT:
+    """Add two tuples element-wise, the usual reduce function of counts."""
+    values = map(operator.add, first, second)
+    # Named tuples are rebuilt with their own type
+    if hasattr(first, "_make"):
+        return first._make(values)  # type: ignore[no-any-return]
+    return tuple(values)  # type: ignore[return-value]
@@ -0,0 +1,179 @@
+"""
+Peak memory accounting of the parsing and of each part of the solutions.
+
+Two peaks are measured for each step:
+
+- the traced peak: the largest amount of memory allocated by Python (NumPy
+  arrays included) during the step on top of what was allocated before it,
+  measured with tracemalloc, which budgets are checked against
+- the peak RSS of the process during the step, on Linux only, where the peak
+  can be reset through /proc/self/clear_refs
+
+Tracing allocations slows the code down, so timings measured at the same time
+are not representative.
+"""
+
+import contextlib
+import re
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from .template import AOCSolution
+
+_SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KMG]?)i?B?", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+@dataclass
+class MemoryUsage:
+    """Peak memory used by a step, in bytes."""
+
+    traced_peak: int = 0
+    # None where the peak RSS can't be measured
+    rss_peak: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Optional[int]]:
+        return asdict(self)
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a step allocates more memory than its budget."""
+
+    def __init__(self, step: str, usage: MemoryUsage, budget: int) -> None:
+        super().__init__(
+            f"{step} allocated {format_size(usage.traced_peak)}, "
+            f"over the {format_size(budget)} budget"
+        )
+        self.step = step
+        self.usage = usage
+        self.budget = budget
+
+
+def parse_size(spec: str) -> int:
+    """
+    Parse a memory size such as "512K", "256M", "1.5GiB" or "1048576".
+
+    Raises:
+        ValueError: If the size is invalid
+    """
+    match = _SIZE_PATTERN.fullmatch(spec.strip())
+    if not match:
+        raise ValueError(f"Invalid memory size: {spec}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: Optional[int]) -> str:
+    """Format a number of bytes in binary units."""
+    if size is None:
+        return "n/a"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024 or unit == "GiB":
+            break
+        value /= 1024
+    return f"{size} B" if unit == "B" else f"{value:.1f} {unit}"
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak RSS of the process, where supported (Linux 4.0+)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _read_peak_rss() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+@contextlib.contextmanager
+def track_memory() -> Iterator[MemoryUsage]:
+    """
+    Measure the peak memory used by a block.
+
+    Yields:
+        MemoryUsage: Filled with the peaks of the block when it exits
+    """
+    usage = MemoryUsage()
+    rss_reset = _reset_peak_rss()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        # Python 3.9+
+        tracemalloc.reset_peak()
+    start_size, _ = tracemalloc.get_traced_memory()
+    try:
+        yield usage
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        usage.traced_peak = peak - start_size
+        if rss_reset:
+            usage.rss_peak = _read_peak_rss()
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def check_budget(step: str, usage: MemoryUsage, budget: Optional[int]) -> None:
+    """
+    Check the memory used by a step against its budget.
+
+    Raises:
+        MemoryBudgetExceeded: If the traced peak of the step is over the budget
+    """
+    if budget is not None and usage.traced_peak > budget:
+        raise MemoryBudgetExceeded(step, usage, budget)
+
+
+def solve_tracking_memory(
+    solution: AOCSolution,
+    input_data: Any,
+    parts: Sequence[int] = (1, 2),
+    budget: Optional[int] = None,
+) -> Tuple[Dict[int, Any], Dict[str, MemoryUsage]]:
+    """
+    Solve parts of a puzzle, measuring the memory of the parsing and of each part.
+
+    Args:
+        solution (AOCSolution): The solution to run
+        input_data (Any): The raw input
+        parts (Sequence[int]): The parts to solve
+        budget (Optional[int]): Maximum traced peak of each step, in bytes
+
+    Returns:
+        Tuple[Dict[int, Any], Dict[str, MemoryUsage]]: The answer of each part, and
+        the memory used by each step ("parse", "part1", "part2")
+
+    Raises:
+        MemoryBudgetExceeded: As soon as a step exceeds the budget
+    """
+    usages: Dict[str, MemoryUsage] = {}
+    answers: Dict[int, Any] = {}
+    with track_memory() as usages["parse"]:
+        solution.get_parsed(input_data)
+    check_budget("parse", usages["parse"], budget)
+
+    for part in parts:
+        step = f"part{part}"
+        with track_memory() as usages[step]:
+            # The parsed input is reused, so only the part itself is measured
+            answers[part] = solution.run_part(part, input_data)
+        check_budget(step, usages[step], budget)
+    return answers, usages
+
+
+def format_memory(usages: Dict[str, MemoryUsage]) -> str:
+    """Format the traced peak of each step on a single line."""
+    return ", ".join(
+        f"{step} {format_size(usage.traced_peak)}" for step, usage in usages.items()
+    )
@@ -0,0 +1,207 @@
+"""
+Pipeline overlapping the download of the inputs with the run of the solutions.
+
+Missing inputs are downloaded concurrently from an asyncio event loop, with a
+bounded number of requests in flight and the rate limit of the InputFetcher.
+Each day is handed to a process pool as soon as its input is available, so a
+cold run of a whole year takes about as long as the slowest of the downloads
+and the computations, instead of their sum. Results are still streamed in day
+order.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Sequence
+
+from .fetch import FetchResult, InputFetcher
+from .runner import Job, JobResult, execute_job
+
+
+@dataclass
+class DayResult:
+    """Outcome of a day: how its input was obtained and the result of each part."""
+
+    year: int
+    day: int
+    fetch: FetchResult
+    parts: List[JobResult] = field(default_factory=list)
+    # time.monotonic() when the input was available, and when the parts were done
+    fetched_at: float = 0.0
+    solved_at: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.fetch.error is None and all(
+            result.error is None for result in self.parts
+        )
+
+
+def _use_inputs_dir(inputs_dir: Optional[str]) -> None:
+    """Make a worker process read the inputs from the directory of the fetcher."""
+    if inputs_dir is not None:
+        os.environ["AOC_INPUTS_DIR"] = inputs_dir
+
+
+def _get_mp_context() -> Optional[multiprocessing.context.BaseContext]:
+    """
+    Get a way of starting workers that is safe while downloads are running.
+
+    Forking a process while other threads hold locks can deadlock the worker,
+    so workers are forked from a single-threaded server process where possible.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+class InputPipeline:
+    """
+    Download missing inputs while solving the days whose input is available.
+
+    Args:
+        fetcher (InputFetcher): Downloads the inputs, and rate limits the requests
+        workers (Optional[int]): Number of worker processes, defaults to cpu count
+        max_downloads (int): Maximum number of requests in flight
+        use_cache (bool): Reuse the answers of unchanged solutions and inputs
+        force (bool): Download the inputs even if they are already saved
+    """
+
+    def __init__(
+        self,
+        fetcher: InputFetcher,
+        workers: Optional[int] = None,
+        max_downloads: int = 4,
+        use_cache: bool = False,
+        force: bool = False,
+    ) -> None:
+        if max_downloads < 1:
+            raise ValueError("max_downloads must be at least 1")
+        self.fetcher = fetcher
+        self.workers = workers
+        self.max_downloads = max_downloads
+        self.use_cache = use_cache
+        self.force = force
+
+    def __fetch(self, year: int, day: int) -> FetchResult:
+        try:
+            return self.fetcher.fetch(year, day, self.force)
+        except Exception as e:
+            return FetchResult(
+                year,
+                day,
+                self.fetcher.get_input_path(year, day),
+                "error",
+                f"{type(e).__name__}: {e}",
+            )
+
+    async def stream(
+        self, year: int, days: Iterable[int], parts: Sequence[int] = (1, 2)
+    ) -> AsyncIterator[DayResult]:
+        """
+        Fetch and solve days, yielding their results in day order.
+
+        Args:
+            year (int): The year of the puzzles
+            days (Iterable[int]): The days to run
+            parts (Sequence[int]): The parts to solve
+
+        Yields:
+            DayResult: The result of each day, as soon as it and the days before
+            it are done
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_downloads)
+        inputs_dir = self.fetcher.inputs_dir
+        io_pool = ThreadPoolExecutor(max_workers=self.max_downloads)
+        cpu_pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_get_mp_context(),
+            initializer=_use_inputs_dir,
+            initargs=(None if inputs_dir is None else str(inputs_dir),),
+        )
+
+        async def fetch_day(day: int) -> FetchResult:
+            path = self.fetcher.get_input_path(year, day)
+            if path.exists() and not self.force:
+                # Saved inputs are used as is, without revalidating them
+                return FetchResult(year, day, path, "cached")
+            async with semaphore:
+                return await loop.run_in_executor(io_pool, self.__fetch, year, day)
+
+        async def run_day(day: int) -> DayResult:
+            fetched = await fetch_day(day)
+            fetched_at = time.monotonic()
+            if fetched.error is not None:
+                return DayResult(year, day, fetched, [], fetched_at, fetched_at)
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        cpu_pool, execute_job, Job(year, day, part), self.use_cache
+                    )
+                    for part in parts
+                )
+            )
+            return DayResult(
+                year, day, fetched, list(results), fetched_at, time.monotonic()
+            )
+
+        tasks = [asyncio.ensure_future(run_day(day)) for day in sorted(set(days))]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            io_pool.shutdown()
+            cpu_pool.shutdown()
+
+
+def run_pipeline(
+    year: int,
+    days: Iterable[int],
+    fetcher: Optional[InputFetcher] = None,
+    workers: Optional[int] = None,
+    max_downloads: int = 4,
+    use_cache: bool = False,
+    on_result: Optional[Callable[[DayResult], None]] = None,
+) -> List[DayResult]:
+    """
+    Fetch and solve days, overlapping the downloads with the computations.
+
+    Args:
+        year (int): The year of the puzzles
+        days (Iterable[int]): The days to run
+        fetcher (Optional[InputFetcher]): Downloads the inputs, a default one is
+            created (and closed) if not given
+        workers (Optional[int]): Number of worker processes, defaults to cpu count
+        max_downloads (int): Maximum number of requests in flight
+        use_cache (bool): Reuse the answers of unchanged solutions and inputs
+        on_result (Optional[Callable[[DayResult], None]]): Called with the result
+            of each day as soon as it is streamed, in day order
+
+    Returns:
+        List[DayResult]: The result of each day, in day order
+    """
+    own_fetcher = fetcher is None
+    if fetcher is None:
+        fetcher = InputFetcher(workers=max_downloads)
+    pipeline = InputPipeline(fetcher, workers, max_downloads, use_cache)
+
+    async def collect() -> List[DayResult]:
+        results = []
+        async for result in pipeline.stream(year, days):
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+        return results
+
+    try:
+        return asyncio.run(collect())
+    finally:
+        if own_fetcher:
+            fetcher.close()
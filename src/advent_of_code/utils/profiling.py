@@ -0,0 +1,171 @@
+"""
+CPU and memory profiling of the solutions.
+
+CPU profiles are collected with cProfile, while a sampling thread records the
+call stacks of the profiled code in the collapsed format read by flame graph
+tools ("frame;frame;frame count" lines). Memory profiles are collected with
+tracemalloc.
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+
+class StackSampler:
+    """
+    Sample the call stack of the thread running a function at regular intervals.
+
+    Args:
+        interval (float): Number of seconds between two samples
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.stacks: "Counter[str]" = Counter()
+        self.__stop = threading.Event()
+        self.__thread_id: Optional[int] = None
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Call a function while sampling its stack, and return its result."""
+        self.__thread_id = threading.get_ident()
+        self.__stop.clear()
+        sampler = threading.Thread(target=self.__sample, daemon=True)
+        sampler.start()
+        try:
+            return func(*args)
+        finally:
+            self.__stop.set()
+            sampler.join()
+
+    def __sample(self) -> None:
+        root_code = StackSampler.run.__code__
+        while not self.__stop.wait(self.interval):
+            frame = sys._current_frames().get(self.__thread_id)  # type: ignore[arg-type]
+            stack = []
+            while frame is not None and frame.f_code is not root_code:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            if frame is not None and stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def to_collapsed(self) -> str:
+        """Format the sampled stacks as collapsed stacks, one stack per line."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.stacks.items())
+        )
+
+
+@dataclass
+class CpuProfile:
+    """Deterministic profile of a run, and its sampled call stacks."""
+
+    answer: Any
+    stats: pstats.Stats
+    stacks: StackSampler
+
+    def format_stats(self, top: int = 20, sort: str = "cumulative") -> str:
+        stream = io.StringIO()
+        self.stats.stream = stream  # type: ignore[attr-defined]
+        self.stats.sort_stats(sort).print_stats(top)
+        return stream.getvalue()
+
+
+@dataclass
+class AllocationSite:
+    """Memory still allocated by a line of code at the end of a run."""
+
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryProfile:
+    """Peak traced memory of a run and its largest allocation sites."""
+
+    answer: Any
+    peak: int
+    sites: List[AllocationSite] = field(default_factory=list)
+
+    def format_report(self) -> str:
+        lines = [f"Peak traced memory: {self.peak / 1024:.1f} KiB"]
+        if self.sites:
+            lines.append(f"{'size':>12}{'blocks':>10}  allocation site")
+        for site in self.sites:
+            lines.append(
+                f"{site.size / 1024:>9.1f}KiB{site.count:>10}  {site.location}"
+            )
+        return "\n".join(lines)
+
+
+def profile_cpu(
+    func: Callable[..., Any], *args: Any, interval: float = 0.001
+) -> CpuProfile:
+    """
+    Run a function under cProfile while sampling its call stacks.
+
+    Args:
+        func (Callable[..., Any]): The function to profile
+        *args (Any): Its arguments
+        interval (float): Number of seconds between two stack samples
+
+    Returns:
+        CpuProfile: The profile and the result of the function
+    """
+    profiler = cProfile.Profile()
+    sampler = StackSampler(interval)
+    profiler.enable()
+    try:
+        answer = sampler.run(func, *args)
+    finally:
+        profiler.disable()
+    return CpuProfile(answer, pstats.Stats(profiler), sampler)
+
+
+def profile_memory(
+    func: Callable[..., Any], *args: Any, top: int = 10
+) -> MemoryProfile:
+    """
+    Run a function while tracing memory allocations.
+
+    Allocation sites are the lines holding the most memory when the function
+    returns, which includes the parsed input kept by the solution.
+
+    Args:
+        func (Callable[..., Any]): The function to profile
+        *args (Any): Its arguments
+        top (int): Number of allocation sites to report
+
+    Returns:
+        MemoryProfile: The peak memory usage and the result of the function
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        # Python 3.9+
+        tracemalloc.reset_peak()
+    try:
+        answer = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    sites = [
+        AllocationSite(str(stat.traceback), stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+    return MemoryProfile(answer, peak, sites)
@@ -0,0 +1,280 @@
+"""
+Index of the available solutions.
+
+Solution files are scanned once without being imported, and their metadata is
+saved to a manifest in the cache directory. The manifest is reused as long as
+the package and year directories are unchanged, which catches added and removed
+solutions with a stat call per year. The metadata of a solution is checked
+against the mtime of its own file when it is requested, and a single solution
+module is imported when it is actually run.
+"""
+
+import ast
+import importlib
+import json
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from .common import atomic_write_text, get_cache_dir
+
+if TYPE_CHECKING:
+    from .template import AOCSolution
+
+PACKAGE_DIR = Path(__file__).parent.parent
+MANIFEST_VERSION = 3
+
+_YEAR_PATTERN = re.compile(r"year(\d{4})")
+_SOLUTION_PATTERN = re.compile(r"day(\d{2})_solution\.py")
+
+
+class SolutionNotFoundError(ImportError):
+    """Raised when no solution is registered for a year and a day."""
+
+
+@dataclass(frozen=True)
+class SolutionInfo:
+    """Metadata of a solution, read from its source without importing it."""
+
+    year: int
+    day: int
+    module: str
+    path: str
+    parts: Tuple[int, ...]
+    # Whether the solution overrides AOCSolution.parse
+    has_parser: bool
+    # Documented time complexity, from the complexity attribute of the solution
+    complexity: Optional[str] = None
+    # Whether the module defines generate_input(size, seed) for scaling tests
+    has_generator: bool = False
+
+
+def scan_solution(path: Path, year: int, day: int) -> SolutionInfo:
+    """
+    Read the metadata of a solution from the Solution class of its source file.
+
+    Args:
+        path (Path): The solution file
+        year (int): The year of the puzzle
+        day (int): The day of the puzzle
+
+    Returns:
+        SolutionInfo: The metadata of the solution
+    """
+    methods = set()
+    complexity = None
+    has_generator = False
+    tree = ast.parse(path.read_text(), str(path))
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "generate_input":
+            has_generator = True
+        if not (isinstance(node, ast.ClassDef) and node.name == "Solution"):
+            continue
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef):
+                methods.add(item.name)
+            elif (
+                isinstance(item, (ast.Assign, ast.AnnAssign))
+                and "complexity" in _assigned_names(item)
+                and isinstance(item.value, ast.Constant)
+                and isinstance(item.value.value, str)
+            ):
+                complexity = item.value.value
+
+    return SolutionInfo(
+        year=year,
+        day=day,
+        module=f"advent_of_code.year{year}.day{day:02d}_solution",
+        path=str(path),
+        parts=tuple(part for part in (1, 2) if f"part{part}" in methods),
+        has_parser="parse" in methods,
+        complexity=complexity,
+        has_generator=has_generator,
+    )
+
+
+def _assigned_names(node: Union[ast.Assign, ast.AnnAssign]) -> List[str]:
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+    return [target.id for target in targets if isinstance(target, ast.Name)]
+
+
+class SolutionRegistry:
+    """
+    Solutions available in the package, by year and day.
+
+    Args:
+        root (Path): Directory holding the yearYYYY packages
+        manifest_path (Optional[Path]): Where the scanned metadata is saved,
+            defaults to the cache directory
+    """
+
+    def __init__(self, root: Path = PACKAGE_DIR, manifest_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.manifest_path = manifest_path or get_cache_dir() / "registry.json"
+        # Solutions by year, then by day
+        self.__solutions: Dict[int, Dict[int, SolutionInfo]] = {}
+        # mtimes of the package and year directories, and of the solution files
+        self.__dir_mtimes: Dict[str, int] = {}
+        self.__file_mtimes: Dict[str, int] = {}
+        self.__load()
+
+    def __load(self) -> None:
+        manifest = self.__read_manifest()
+        if manifest is None:
+            self.__scan()
+            self.__save()
+            return
+
+        self.__dir_mtimes = manifest["dir_mtimes"]
+        self.__file_mtimes = manifest["file_mtimes"]
+        for entry in manifest["solutions"]:
+            info = SolutionInfo(**{**entry, "parts": tuple(entry["parts"])})
+            self.__solutions.setdefault(info.year, {})[info.day] = info
+
+    def __read_manifest(self) -> Optional[dict]:
+        """Load the saved manifest, or None if it is missing or out of date."""
+        try:
+            manifest: dict = json.loads(self.manifest_path.read_text())
+            if manifest.get("version") != MANIFEST_VERSION:
+                return None
+            if manifest.get("root") != str(self.root):
+                return None
+            # Adding or removing a file changes the mtime of its directory,
+            # edited files are checked one at a time by __refresh
+            for path, mtime in manifest["dir_mtimes"].items():
+                if Path(path).stat().st_mtime_ns != mtime:
+                    return None
+            if not isinstance(manifest["file_mtimes"], dict):
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        return manifest
+
+    def __save(self) -> None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.root),
+            "dir_mtimes": self.__dir_mtimes,
+            "file_mtimes": self.__file_mtimes,
+            "solutions": [
+                asdict(self.__solutions[year][day])
+                for year in self.years()
+                for day in self.days(year)
+            ],
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.manifest_path, json.dumps(manifest, indent=2))
+        except OSError:
+            # Read-only installs just scan the solutions on every run
+            pass
+
+    def __scan(self) -> None:
+        self.__dir_mtimes = {str(self.root): self.root.stat().st_mtime_ns}
+        for year_dir in sorted(self.root.iterdir()):
+            year_match = _YEAR_PATTERN.fullmatch(year_dir.name)
+            if not (year_match and year_dir.is_dir()):
+                continue
+            self.__dir_mtimes[str(year_dir)] = year_dir.stat().st_mtime_ns
+            for path in sorted(year_dir.iterdir()):
+                day_match = _SOLUTION_PATTERN.fullmatch(path.name)
+                if not day_match:
+                    continue
+                self.__file_mtimes[str(path)] = path.stat().st_mtime_ns
+                info = scan_solution(
+                    path, int(year_match.group(1)), int(day_match.group(1))
+                )
+                self.__solutions.setdefault(info.year, {})[info.day] = info
+
+    def __refresh(self, info: SolutionInfo) -> SolutionInfo:
+        """Rescan a solution if its file changed since the manifest was saved."""
+        try:
+            mtime = Path(info.path).stat().st_mtime_ns
+        except OSError:
+            return info
+        if mtime == self.__file_mtimes.get(info.path):
+            return info
+        info = scan_solution(Path(info.path), info.year, info.day)
+        self.__solutions[info.year][info.day] = info
+        self.__file_mtimes[info.path] = mtime
+        self.__save()
+        return info
+
+    def years(self) -> List[int]:
+        """Get the sorted years having at least a solution."""
+        return sorted(self.__solutions)
+
+    def days(self, year: int) -> List[int]:
+        """Get the sorted days having a solution in a year."""
+        return sorted(self.__solutions.get(year, {}))
+
+    def solutions(self, year: Optional[int] = None) -> List[SolutionInfo]:
+        """Get the metadata of all the solutions, or of the solutions of a year."""
+        years = self.years() if year is None else [year]
+        return [
+            self.__refresh(self.__solutions[year][day])
+            for year in years
+            for day in self.days(year)
+        ]
+
+    def get(self, year: int, day: int) -> SolutionInfo:
+        """
+        Get the metadata of a solution.
+
+        Raises:
+            SolutionNotFoundError: If there is no solution for this day
+        """
+        try:
+            info = self.__solutions[year][day]
+        except KeyError:
+            raise SolutionNotFoundError(f"Solution for {year} day {day} not found")
+        return self.__refresh(info)
+
+    def load_module(self, year: int, day: int) -> ModuleType:
+        """
+        Import the module of a solution.
+
+        Raises:
+            SolutionNotFoundError: If there is no solution for this day
+        """
+        return importlib.import_module(self.get(year, day).module)
+
+    def load(self, year: int, day: int) -> "AOCSolution":
+        """
+        Import a solution and instantiate it.
+
+        Raises:
+            SolutionNotFoundError: If there is no solution for this day
+        """
+        solution: "AOCSolution" = self.load_module(year, day).Solution()
+        return solution
+
+
+_registry: Optional[SolutionRegistry] = None
+
+
+def get_registry() -> SolutionRegistry:
+    """Get the registry of the package solutions, loaded once per process."""
+    global _registry
+    if _registry is None:
+        _registry = SolutionRegistry()
+    return _registry
+
+
+def load_solution(year: int, day: int) -> "AOCSolution":
+    """
+    Instantiate the solution of a day.
+
+    Args:
+        year (int): The year of the puzzle
+        day (int): The day of the puzzle
+
+    Returns:
+        AOCSolution: The solution
+
+    Raises:
+        SolutionNotFoundError: If there is no solution for this day
+    """
+    return get_registry().load(year, day)
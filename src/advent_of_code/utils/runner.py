@@ -0,0 +1,162 @@
+import json
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .answer_cache import AnswerCache, solve_cached
+from .common import get_cache_dir
+from .memory import MemoryUsage, solve_tracking_memory
+from .registry import load_solution
+
+
+@dataclass(frozen=True, order=True)
+class Job:
+    """A single part of a puzzle to run."""
+
+    year: int
+    day: int
+    part: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.year}-{self.day:02d}-{self.part}"
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job: its answer or the error it raised."""
+
+    job: Job
+    answer: Optional[object] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    # Whether the answer was found in the answer cache
+    cached: bool = False
+    # Peak memory of the parsing and of the part, when measured
+    memory: Optional[Dict[str, MemoryUsage]] = None
+
+
+class TimingHistory:
+    """Keep track of the last known duration of each job between runs."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or get_cache_dir() / "timings.json"
+        self.__timings: Dict[str, float] = {}
+        if self.path.exists():
+            try:
+                self.__timings = json.loads(self.path.read_text())
+            except ValueError:
+                self.__timings = {}
+
+    def estimate(self, job: Job) -> float:
+        """
+        Get the expected duration of a job.
+
+        Jobs never run before are considered the slowest ones, so they are
+        scheduled first.
+        """
+        return self.__timings.get(job.key, float("inf"))
+
+    def record(self, result: JobResult) -> None:
+        # Timings slowed down by memory tracing are not representative
+        if result.error is None and not result.cached and result.memory is None:
+            self.__timings[result.job.key] = result.elapsed
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.__timings, indent=2, sort_keys=True))
+
+
+def execute_job(
+    job: Job,
+    use_cache: bool = False,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> JobResult:
+    """
+    Import the solution of a job and run the requested part.
+
+    When measuring memory (always the case with a memory budget), the answer is
+    computed even if it is cached, and the job fails if a step exceeds the budget.
+    """
+    try:
+        if measure_memory or memory_budget is not None:
+            with load_solution(job.year, job.day) as solution:
+                input_data = solution.read_input()
+                start_time = time.perf_counter()
+                answers, memory = solve_tracking_memory(
+                    solution, input_data, [job.part], memory_budget
+                )
+                elapsed = time.perf_counter() - start_time
+            return JobResult(job, answers[job.part], elapsed, memory=memory)
+
+        cache = AnswerCache() if use_cache else None
+        start_time = time.perf_counter()
+        answer, cached = solve_cached(job.year, job.day, [job.part], cache)[job.part]
+        return JobResult(job, answer, time.perf_counter() - start_time, cached=cached)
+    except Exception as e:
+        return JobResult(job, error=f"{type(e).__name__}: {e}")
+
+
+def schedule(jobs: Iterable[Job], history: TimingHistory) -> List[Job]:
+    """Order jobs longest first, so the slowest ones never start last."""
+    return sorted(jobs, key=lambda job: (-history.estimate(job), job))
+
+
+def run_jobs(
+    jobs: Iterable[Job],
+    workers: Optional[int] = None,
+    history: Optional[TimingHistory] = None,
+    use_cache: bool = False,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> Iterator[JobResult]:
+    """
+    Run jobs across a process pool.
+
+    Jobs are submitted longest first according to the timing history, while
+    results are yielded in (year, day, part) order as soon as they are available.
+
+    Args:
+        jobs (Iterable[Job]): Jobs to run
+        workers (Optional[int]): Number of worker processes, defaults to cpu count
+        history (Optional[TimingHistory]): Durations of previous runs
+        use_cache (bool): Reuse the answers of unchanged solutions and inputs
+        measure_memory (bool): Measure the peak memory of the jobs
+        memory_budget (Optional[int]): Fail the jobs whose parsing or part
+            allocates more bytes than this
+
+    Yields:
+        JobResult: The result of each job, in deterministic order
+    """
+    history = history or TimingHistory()
+    ordered_jobs = sorted(set(jobs))
+
+    if workers == 1 or len(ordered_jobs) <= 1:
+        for job in ordered_jobs:
+            result = execute_job(job, use_cache, measure_memory, memory_budget)
+            history.record(result)
+            yield result
+        history.save()
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: Dict[Job, "Future[JobResult]"] = {
+            job: executor.submit(
+                execute_job, job, use_cache, measure_memory, memory_budget
+            )
+            for job in schedule(ordered_jobs, history)
+        }
+        for job in ordered_jobs:
+            try:
+                result = futures[job].result()
+            except BrokenProcessPool as e:
+                # A worker died (killed, out of memory...), which fails the
+                # jobs that were not done yet
+                result = JobResult(job, error=f"BrokenProcessPool: {e}")
+            history.record(result)
+            yield result
+    history.save()
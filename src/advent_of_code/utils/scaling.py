@@ -0,0 +1,159 @@
+"""
+Empirical complexity of the solutions on generated inputs.
+
+Solution modules can define generate_input(size, seed) returning a valid puzzle
+input of the given size. The parsing and each part are timed on inputs of
+increasing sizes, and the exponent k of time ~ size^k is fitted by least
+squares on the log-log curve.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .template import AOCSolution
+
+# Fitted exponents above this one are reported as superlinear
+SUPERLINEAR_THRESHOLD = 1.2
+
+
+def parse_sizes(spec: str) -> List[int]:
+    """
+    Parse a list of input sizes such as "1e3,1e4,100000".
+
+    Raises:
+        ValueError: If a size isn't a positive integer
+    """
+    sizes = []
+    for item in spec.split(","):
+        size = float(item)
+        if size < 1 or size != int(size):
+            raise ValueError(f"Invalid input size: {item}")
+        sizes.append(int(size))
+    return sorted(set(sizes))
+
+
+def fit_exponent(sizes: Sequence[float], times: Sequence[float]) -> float:
+    """
+    Fit the exponent k of times ~ sizes^k by least squares in log-log scale.
+
+    Raises:
+        ValueError: If there are less than two distinct sizes
+    """
+    if len(set(sizes)) < 2:
+        raise ValueError("At least two distinct sizes are needed")
+    xs = [math.log(size) for size in sizes]
+    # Clamp to the timer resolution, as the log of zero isn't defined
+    ys = [math.log(max(seconds, 1e-9)) for seconds in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+@dataclass
+class ScalingReport:
+    """Timings of the parsing and of each part at each input size, in seconds."""
+
+    year: int
+    day: int
+    sizes: List[int]
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+    complexity: Optional[str] = None
+
+    @property
+    def exponents(self) -> Dict[str, float]:
+        return {
+            step: fit_exponent(self.sizes, times)
+            for step, times in self.timings.items()
+        }
+
+    def superlinear_steps(self, threshold: float = SUPERLINEAR_THRESHOLD) -> List[str]:
+        return [step for step, k in self.exponents.items() if k > threshold]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year,
+            "day": self.day,
+            "sizes": self.sizes,
+            "complexity": self.complexity,
+            "timings": self.timings,
+            "exponents": self.exponents,
+        }
+
+
+def measure_scaling(
+    solution_factory: Callable[[], AOCSolution],
+    generate_input: Callable[[int, int], str],
+    sizes: Sequence[int],
+    parts: Sequence[int] = (1, 2),
+    repeat: int = 1,
+    seed: int = 0,
+) -> ScalingReport:
+    """
+    Time the parsing and the parts of a solution on generated inputs.
+
+    Each measure is the best of repeat runs, each run using a new solution so
+    that nothing is cached between them.
+
+    Args:
+        solution_factory (Callable[[], AOCSolution]): Build the solution to time
+        generate_input (Callable[[int, int], str]): Build an input from its size
+            and a seed
+        sizes (Sequence[int]): Input sizes to time, at least two
+        parts (Sequence[int]): Parts to time
+        repeat (int): Number of runs at each size
+        seed (int): Seed of the generated inputs
+
+    Returns:
+        ScalingReport: The timings at each size
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    solution = solution_factory()
+    report = ScalingReport(solution.year, solution.day, sorted(sizes))
+    report.complexity = solution.complexity
+    steps = ["parse"] + [f"part{part}" for part in parts]
+    report.timings = {step: [] for step in steps}
+
+    for size in report.sizes:
+        input_data = generate_input(size, seed)
+        best = {step: math.inf for step in steps}
+        for _ in range(repeat):
+            solution = solution_factory()
+            start = time.perf_counter()
+            parsed = solution.parse(input_data)
+            best["parse"] = min(best["parse"], time.perf_counter() - start)
+            for part in parts:
+                start = time.perf_counter()
+                getattr(solution, f"part{part}")(parsed)
+                elapsed = time.perf_counter() - start
+                best[f"part{part}"] = min(best[f"part{part}"], elapsed)
+        for step in steps:
+            report.timings[step].append(best[step])
+    return report
+
+
+def format_scaling_report(
+    report: ScalingReport, threshold: float = SUPERLINEAR_THRESHOLD
+) -> str:
+    """Format the timings in milliseconds with the fitted exponent of each step."""
+    lines = [f"Year {report.year}, Day {report.day}"]
+    if report.complexity:
+        lines[0] += f" (documented as {report.complexity})"
+    lines.append(
+        f"{'step':<8}"
+        + "".join(f"{size:>12g}" for size in report.sizes)
+        + "   exponent"
+    )
+    for step, times in report.timings.items():
+        exponent = report.exponents[step]
+        flag = "  superlinear" if exponent > threshold else ""
+        lines.append(
+            f"{step:<8}"
+            + "".join(f"{seconds * 1e3:>10.2f}ms" for seconds in times)
+            + f"{exponent:>11.2f}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""
+Measure the cold start of the aoc command.
+
+Imports are timed in a fresh interpreter with python -X importtime, so modules
+already imported by the current process don't hide their cost.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+# Maximum median wall time of a cold "aoc" invocation, in seconds
+STARTUP_BUDGET = 0.25
+
+
+@dataclass
+class ImportTiming:
+    """Time spent importing a module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse the report printed on stderr by python -X importtime.
+
+    Args:
+        output (str): Lines like "import time:  self [us] | cumulative | module"
+
+    Returns:
+        List[ImportTiming]: The timing of each imported module, in import order
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Header line
+            continue
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(module) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def profile_imports(modules: Sequence[str]) -> List[ImportTiming]:
+    """Import modules in a fresh interpreter and time each import."""
+    code = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(process.stderr)
+
+
+def measure_startup(argv: Sequence[str], repeat: int = 5) -> float:
+    """
+    Time cold invocations of the aoc command.
+
+    Args:
+        argv (Sequence[str]): Arguments given to the command
+        repeat (int): Number of invocations
+
+    Returns:
+        float: The median wall time of an invocation, in seconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "advent_of_code.cli", *argv],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append(time.perf_counter() - start_time)
+    return statistics.median(samples)
+
+
+def format_import_profile(timings: List[ImportTiming], top: int = 20) -> str:
+    """Format the slowest imports by cumulative time, indented by import depth."""
+    total = sum(timing.self_us for timing in timings)
+    slowest = sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)
+    lines = [
+        f"Imported {len(timings)} modules in {total / 1e3:.1f} ms",
+        f"{'cumulative':>12}{'self':>10}  module",
+    ]
+    for timing in slowest[:top]:
+        lines.append(
+            f"{timing.cumulative_us / 1e3:>10.1f}ms{timing.self_us / 1e3:>8.1f}ms  "
+            + "  " * timing.depth
+            + timing.module
+        )
+    return "\n".join(lines)
@@ -1,12 +1,23 @@
 import json
+import mmap
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional, Tuple
+from types import TracebackType
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Type
 
-import requests
-
-from .aoc_login import get_input
+from .aoc_login import get_input, get_input_path
 from .common import timed_execution
+from .instrumentation import span
+
+
+def get_test_file(year: int, day: int) -> Path:
+    """Get the path of the JSON file holding the test cases of a day."""
+    return (
+        Path(__file__).parent.parent
+        / "tests"
+        / f"year{year}"
+        / f"day{day:02d}_tests.json"
+    )
 
 
 @dataclass
@@ -20,34 +31,152 @@ class TestCase:
 
 
 class AOCSolution:
+    # Maximum number of parsed inputs kept by get_parsed
+    parse_cache_size = 8
+    # Time complexity in the size of the input, as documentation: it is listed by
+    # the registry and shown by the scaling report, but not checked against it
+    complexity: Optional[str] = None
+
     def __init__(self, year: int, day: int):
         self.year = year
         self.day = day
+        self.__parse_cache: Dict[Hashable, Tuple[Any, Any]] = {}
+        self.__input_map: Optional[mmap.mmap] = None
+        # Views of the mapped input returned by input_bytes, released by close
+        self.__input_views: List[memoryview] = []
+
+    def __enter__(self) -> "AOCSolution":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the parsed inputs and unmap the input file mapped by input_bytes().
+
+        The views returned by input_bytes() can't be used afterwards.
+
+        Raises:
+            BufferError: If slices of the views returned by input_bytes() are
+                still referenced, so the file can't be unmapped
+        """
+        self.__parse_cache.clear()
+        for view in self.__input_views:
+            view.release()
+        self.__input_views.clear()
+        if self.__input_map is not None:
+            self.__input_map.close()
+            self.__input_map = None
+
+    def input_path(self) -> Path:
+        """Get the path of the puzzle input file, downloading it if needed."""
+        return get_input_path(self.year, self.day)
+
+    def input_text(self) -> str:
+        """Get the whole puzzle input as a string, without surrounding whitespace."""
+        return get_input(self.year, self.day)
+
+    def input_bytes(self) -> memoryview:
+        """
+        Get the puzzle input as a zero-copy view of the memory-mapped input file.
+
+        Pages of the file are only loaded when accessed, so large inputs can be
+        scanned with constant memory. The file stays mapped until close().
+        """
+        if self.__input_map is None:
+            with open(self.input_path(), "rb") as f:
+                if f.seek(0, 2) == 0:
+                    # Empty files can't be mapped
+                    return memoryview(b"")
+                self.__input_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.__input_map)
+        self.__input_views.append(view)
+        return view
+
+    def iter_lines(self) -> Iterator[str]:
+        """Lazily iterate over the lines of the puzzle input, without line breaks."""
+        with open(self.input_path(), "r") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
+
+    def read_input(self) -> Any:
+        """
+        Read the puzzle input given to parse.
+
+        Defaults to input_text(). Solutions working on large inputs can override it
+        to return input_bytes() instead of a single string.
+        """
+        return self.input_text()
+
+    def parse(self, input_data: str) -> Any:
+        """
+        Parse the puzzle input once for both parts.
+
+        Override this method to share an expensive parsing between part1 and
+        part2, which then receive the parsed object instead of the raw input.
+        The parsed object is shared and must not be mutated by the parts.
+        """
+        return input_data
+
+    @staticmethod
+    def __cache_entry(input_data: Any) -> Tuple[Hashable, Any]:
+        """Get the key of an input in the parse cache, and the object it stands for."""
+        if (
+            isinstance(input_data, memoryview)
+            and isinstance(input_data.obj, mmap.mmap)
+            and input_data.nbytes == len(input_data.obj)
+        ):
+            # Hashing or comparing a view reads all its bytes, so views of a whole
+            # mapped file, such as the input of input_bytes(), are identified by it
+            return ("mmap", id(input_data.obj)), input_data.obj
+        return hash(input_data), input_data
+
+    def get_parsed(self, input_data: Any) -> Any:
+        """Parse the input, reusing the result of a previous call on the same input."""
+        key, reference = self.__cache_entry(input_data)
+        cached = self.__parse_cache.get(key)
+        if cached is not None and (cached[0] is reference or cached[0] == reference):
+            return cached[1]
+
+        with span("parse"):
+            parsed = self.parse(input_data)
+        if len(self.__parse_cache) >= self.parse_cache_size:
+            self.__parse_cache.pop(next(iter(self.__parse_cache)))
+        self.__parse_cache[key] = (reference, parsed)
+        return parsed
 
     @timed_execution
-    def part1(self, input_data: str) -> int:
+    def part1(self, input_data: Any) -> int:
         """Solve part 1 of the puzzle."""
         raise NotImplementedError("Part 1 not implemented")
 
     @timed_execution
-    def part2(self, input_data: str) -> int:
+    def part2(self, input_data: Any) -> int:
         """Solve part 2 of the puzzle."""
         raise NotImplementedError("Part 2 not implemented")
 
+    def run_part(self, part: int, input_data: Any) -> Any:
+        """Solve one part of the puzzle from the raw input."""
+        if part not in (1, 2):
+            raise ValueError(f"Invalid part: {part}")
+        parsed = self.get_parsed(input_data)
+        with span(f"part{part}"):
+            return getattr(self, f"part{part}")(parsed)
+
     def solve(self) -> Tuple[int, int]:
         """Solve both parts of the puzzle."""
-        input_data = get_input(self.year, self.day)
-        return self.part1(input_data), self.part2(input_data)
+        input_data = self.read_input()
+        return self.run_part(1, input_data), self.run_part(2, input_data)
 
     def _load_test_cases(self) -> List[TestCase]:
         """Load test cases from JSON file."""
-        test_file = (
-            Path(__file__).parent.parent
-            / "tests"
-            / f"year{self.year}"
-            / f"day{self.day:02d}_tests.json"
-        )
-
+        test_file = get_test_file(self.year, self.day)
         if not test_file.exists():
             return []
 
@@ -81,39 +210,42 @@ class AOCSolution:
 
         for i, test_case in enumerate(test_cases, 1):
             print(f"\nTest Case {i}: {test_case.description or 'No description'}")
+            with span(f"test{i}"):
+                case_passed = self.__run_test_case(test_case)
+            part1_passed = part1_passed and case_passed[0]
+            part2_passed = part2_passed and case_passed[1]
 
-            # Test Part 1
-            if test_case.expected_part1 is not None:
-                try:
-                    result = self.part1(test_case.input_data)
-                    if result == test_case.expected_part1:
-                        print(
-                            f"✓ Part 1: {result} (expected: {test_case.expected_part1})"
-                        )
-                    else:
-                        print(
-                            f"✗ Part 1: {result} (expected: {test_case.expected_part1})"
-                        )
-                        part1_passed = False
-                except Exception as e:
-                    print(f"✗ Part 1 failed with error: {str(e)}")
-                    part1_passed = False
+        return part1_passed, part2_passed
+
+    def __run_test_case(self, test_case: TestCase) -> Tuple[bool, bool]:
+        """Run both parts on a test case and print their results."""
+        part1_passed = True
+        part2_passed = True
 
-            # Test Part 2
-            if test_case.expected_part2 is not None:
-                try:
-                    result = self.part2(test_case.input_data)
-                    if result == test_case.expected_part2:
-                        print(
-                            f"✓ Part 2: {result} (expected: {test_case.expected_part2})"
-                        )
-                    else:
-                        print(
-                            f"✗ Part 2: {result} (expected: {test_case.expected_part2})"
-                        )
-                        part2_passed = False
-                except Exception as e:
-                    print(f"✗ Part 2 failed with error: {str(e)}")
+        # Test Part 1
+        if test_case.expected_part1 is not None:
+            try:
+                result = self.run_part(1, test_case.input_data)
+                if result == test_case.expected_part1:
+                    print(f"✓ Part 1: {result} (expected: {test_case.expected_part1})")
+                else:
+                    print(f"✗ Part 1: {result} (expected: {test_case.expected_part1})")
+                    part1_passed = False
+            except Exception as e:
+                print(f"✗ Part 1 failed with error: {str(e)}")
+                part1_passed = False
+
+        # Test Part 2
+        if test_case.expected_part2 is not None:
+            try:
+                result = self.run_part(2, test_case.input_data)
+                if result == test_case.expected_part2:
+                    print(f"✓ Part 2: {result} (expected: {test_case.expected_part2})")
+                else:
+                    print(f"✗ Part 2: {result} (expected: {test_case.expected_part2})")
                     part2_passed = False
+            except Exception as e:
+                print(f"✗ Part 2 failed with error: {str(e)}")
+                part2_passed = False
 
         return part1_passed, part2_passed
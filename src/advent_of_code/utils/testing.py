@@ -0,0 +1,327 @@
+import contextlib
+import json
+import signal
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .memory import MemoryUsage, check_budget, format_size, track_memory
+from .registry import load_solution
+from .template import get_test_file
+
+
+class CaseTimeout(Exception):
+    """Raised in a worker when a test case runs longer than its timeout."""
+
+
+@dataclass(frozen=True, order=True)
+class TestJob:
+    """A single test case of a puzzle, by its index in the test file."""
+
+    year: int
+    day: int
+    case: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.year} day {self.day:02d} case {self.case + 1}"
+
+
+@dataclass
+class PartResult:
+    """Outcome of a part on a test case."""
+
+    part: int
+    expected: Any
+    answer: Any = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    memory: Optional[MemoryUsage] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and self.answer == self.expected
+
+
+@dataclass
+class CaseResult:
+    """Outcome of a test case: the result of each part it checks."""
+
+    job: TestJob
+    description: Optional[str] = None
+    parts: List[PartResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    # Error raised outside of the parts, e.g. while loading the solution
+    error: Optional[str] = None
+    parse_memory: Optional[MemoryUsage] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and all(part.passed for part in self.parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.job.year,
+            "day": self.job.day,
+            "case": self.job.case + 1,
+            "description": self.description,
+            "passed": self.passed,
+            "elapsed": self.elapsed,
+            "error": self.error,
+            "parse_memory": self.parse_memory and self.parse_memory.to_dict(),
+            "parts": [
+                {
+                    "part": part.part,
+                    "passed": part.passed,
+                    "answer": part.answer,
+                    "expected": part.expected,
+                    "elapsed": part.elapsed,
+                    "error": part.error,
+                    "memory": part.memory and part.memory.to_dict(),
+                }
+                for part in self.parts
+            ],
+        }
+
+
+def collect_test_jobs(year: int, days: Iterable[int]) -> List[TestJob]:
+    """List the test cases of the given days, without importing their solution."""
+    jobs = []
+    for day in days:
+        test_file = get_test_file(year, day)
+        if test_file.exists():
+            case_count = len(json.loads(test_file.read_text()))
+            jobs += [TestJob(year, day, case) for case in range(case_count)]
+    return jobs
+
+
+@contextlib.contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Raise CaseTimeout if the block runs for more than the given number of seconds.
+
+    Relies on SIGALRM, so the limit is only enforced in the main thread of the
+    process on platforms supporting it. Long calls into C code are interrupted
+    once they return to Python.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum: int, frame: Any) -> None:
+        raise CaseTimeout(f"timed out after {seconds:g}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def execute_test_case(
+    job: TestJob,
+    timeout: Optional[float] = None,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> CaseResult:
+    """
+    Import the solution of a test case and check both parts against it.
+
+    When measuring memory (always the case with a memory budget), the parsing
+    is measured on its own, and steps exceeding the budget fail.
+    """
+    measure_memory = measure_memory or memory_budget is not None
+    result = CaseResult(job)
+    start_time = time.perf_counter()
+    try:
+        solution = load_solution(job.year, job.day)
+        test_case = solution._load_test_cases()[job.case]
+        result.description = test_case.description
+        # Only time the test case, not the import of its solution
+        start_time = time.perf_counter()
+
+        expected = {1: test_case.expected_part1, 2: test_case.expected_part2}
+        result.parts = [
+            PartResult(part, expected[part])
+            for part in (1, 2)
+            if expected[part] is not None
+        ]
+        with time_limit(timeout):
+            if measure_memory:
+                with track_memory() as result.parse_memory:
+                    solution.get_parsed(test_case.input_data)
+                check_budget("parse", result.parse_memory, memory_budget)
+            for part_result in result.parts:
+                part_start = time.perf_counter()
+                try:
+                    with track_memory() if measure_memory else nullcontext() as usage:
+                        part_result.answer = solution.run_part(
+                            part_result.part, test_case.input_data
+                        )
+                    if usage is not None:
+                        part_result.memory = usage
+                        check_budget(f"part{part_result.part}", usage, memory_budget)
+                except CaseTimeout:
+                    raise
+                except Exception as e:
+                    part_result.error = f"{type(e).__name__}: {e}"
+                part_result.elapsed = time.perf_counter() - part_start
+    except CaseTimeout as e:
+        # The part being run and the ones after it are reported as timed out
+        for part_result in result.parts:
+            if part_result.error is None and part_result.elapsed == 0.0:
+                part_result.error = f"{type(e).__name__}: {e}"
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.elapsed = time.perf_counter() - start_time
+    return result
+
+
+def run_test_jobs(
+    jobs: Iterable[TestJob],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    measure_memory: bool = False,
+    memory_budget: Optional[int] = None,
+) -> Iterator[CaseResult]:
+    """
+    Run test cases across a process pool.
+
+    Every test case is run in its own task, so the whole suite takes about as long
+    as its slowest case given enough workers.
+
+    Args:
+        jobs (Iterable[TestJob]): Test cases to run
+        workers (Optional[int]): Number of worker processes, defaults to cpu count
+        timeout (Optional[float]): Maximum number of seconds spent on a test case
+        measure_memory (bool): Measure the peak memory of each step
+        memory_budget (Optional[int]): Fail the steps allocating more bytes
+
+    Yields:
+        CaseResult: The result of each test case, in (year, day, case) order
+    """
+    ordered_jobs = sorted(set(jobs))
+
+    if workers == 1 or len(ordered_jobs) <= 1:
+        for job in ordered_jobs:
+            yield execute_test_case(job, timeout, measure_memory, memory_budget)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: Dict[TestJob, "Future[CaseResult]"] = {
+            job: executor.submit(
+                execute_test_case, job, timeout, measure_memory, memory_budget
+            )
+            for job in ordered_jobs
+        }
+        for job in ordered_jobs:
+            yield futures[job].result()
+
+
+def format_case_result(result: CaseResult) -> str:
+    """Format the result of a test case, one line per part."""
+    description = result.description or "No description"
+    lines = [f"{result.job.name}: {description} ({result.elapsed * 1e3:.1f} ms)"]
+    if result.error is not None:
+        lines.append(f"✗ failed with error: {result.error}")
+    if result.parse_memory is not None:
+        lines.append(f"  Parse: {format_size(result.parse_memory.traced_peak)}")
+    # The parts of a case which failed as a whole have no answer to show
+    parts = result.parts if result.error is None else []
+    for part in parts:
+        mark = "✓" if part.passed else "✗"
+        if part.error is None:
+            line = f"{mark} Part {part.part}: {part.answer} (expected: {part.expected})"
+        else:
+            line = f"{mark} Part {part.part} failed with error: {part.error}"
+        if part.memory is not None:
+            line += f" [{format_size(part.memory.traced_peak)}]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def write_json_report(results: List[CaseResult], path: Path) -> None:
+    """Write the results of a test run as JSON."""
+    report = {
+        "tests": len(results),
+        "failures": sum(not result.passed for result in results),
+        "results": [result.to_dict() for result in results],
+    }
+    Path(path).write_text(json.dumps(report, indent=2))
+
+
+def to_junit_xml(results: List[CaseResult]) -> ET.ElementTree:
+    """
+    Build a JUnit XML report, with a test suite per day and a test per part.
+
+    Errors raised by a solution are reported as errors and wrong answers as
+    failures, as understood by CI systems.
+    """
+    suites: Dict[str, List[ET.Element]] = {}
+    counts: Dict[str, Dict[str, float]] = {}
+    for result in results:
+        job = result.job
+        suite_name = f"advent_of_code.year{job.year}.day{job.day:02d}"
+        suite_counts = counts.setdefault(
+            suite_name, {"tests": 0, "failures": 0, "errors": 0, "time": 0.0}
+        )
+        suite_counts["time"] += result.elapsed
+
+        # Each part is a test, or the whole case if it failed before its parts
+        checks: List[Tuple[int, float, Optional[str], Optional[PartResult]]] = [
+            (part.part, part.elapsed, part.error, part) for part in result.parts
+        ]
+        if result.error is not None:
+            checks = [(0, result.elapsed, result.error, None)]
+        for part_number, elapsed, error, part in checks:
+            name = f"case{job.case + 1}"
+            if part_number:
+                name += f".part{part_number}"
+            testcase = ET.Element(
+                "testcase",
+                classname=suite_name,
+                name=name,
+                time=f"{elapsed:.6f}",
+            )
+            suite_counts["tests"] += 1
+            if error is not None:
+                ET.SubElement(testcase, "error", message=error)
+                suite_counts["errors"] += 1
+            elif part is not None and not part.passed:
+                ET.SubElement(
+                    testcase,
+                    "failure",
+                    message=f"got {part.answer!r}, expected {part.expected!r}",
+                )
+                suite_counts["failures"] += 1
+            suites.setdefault(suite_name, []).append(testcase)
+
+    root = ET.Element("testsuites")
+    for suite_name, testcases in suites.items():
+        suite = ET.SubElement(
+            root,
+            "testsuite",
+            name=suite_name,
+            tests=str(int(counts[suite_name]["tests"])),
+            failures=str(int(counts[suite_name]["failures"])),
+            errors=str(int(counts[suite_name]["errors"])),
+            time=f"{counts[suite_name]['time']:.6f}",
+        )
+        suite.extend(testcases)
+    return ET.ElementTree(root)
+
+
+def write_junit_report(results: List[CaseResult], path: Path) -> None:
+    """Write the results of a test run as JUnit XML."""
+    to_junit_xml(results).write(str(path), encoding="utf-8", xml_declaration=True)
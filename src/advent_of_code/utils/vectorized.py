@@ -0,0 +1,126 @@
+"""
+NumPy based parsing of large inputs.
+
+NumPy is an optional dependency (pip install -e ".[fast]"): HAS_NUMPY tells
+whether it is available, solutions keep their pure Python path otherwise.
+NumPy takes longer to import than the rest of a run on small inputs, so it is
+only imported the first time np is used.
+"""
+
+import importlib
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Sequence
+
+
+class _LazyModule:
+    """Stand-in for a module, imported on the first access to its attributes."""
+
+    def __init__(self, name: str) -> None:
+        self.__name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(importlib.import_module(self.__name), attr)
+        # Later accesses find the attribute without going through __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name!r}>"
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# The numpy module, which raises an ImportError when used if it isn't installed
+np: Any = _LazyModule("numpy")
+
+
+def require_numpy() -> None:
+    """Raise an ImportError with installation instructions if NumPy is missing."""
+    if not HAS_NUMPY:
+        raise ImportError(
+            "NumPy is required for vectorized solutions, "
+            'install it with: pip install -e ".[fast]"'
+        )
+
+
+@dataclass
+class RaggedIntArray:
+    """
+    Rows of integers of different lengths, stored in CSR layout.
+
+    The integers of row i are values[offsets[i]:offsets[i + 1]].
+    """
+
+    values: Any
+    offsets: Any
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "RaggedIntArray":
+        require_numpy()
+        lengths = np.fromiter((len(row) for row in rows), np.int64, len(rows))
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.fromiter(
+            (num for row in rows for num in row), np.int64, int(offsets[-1])
+        )
+        return cls(values, offsets)
+
+    @property
+    def lengths(self) -> Any:
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int) -> Any:
+        if row < 0:
+            row += len(self)
+        return self.values[self.offsets[row] : self.offsets[row + 1]]
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def to_list(self) -> List[List[int]]:
+        return [row.tolist() for row in self]
+
+
+def convert_to_int_array(data: str, ragged: bool = False) -> Any:
+    """
+    Convert a string of numbers into a NumPy integer matrix.
+
+    This is the vectorized counterpart of common.convert_to_int_matrix: rows are
+    split on new lines and numbers on whitespace, without building any Python
+    int. Rows having different lengths are returned as a RaggedIntArray.
+
+    Args:
+        data (str): Lines of whitespace separated integers
+        ragged (bool): Always return a RaggedIntArray, even for rectangular inputs
+
+    Returns:
+        Union[np.ndarray, RaggedIntArray]: A 2D int64 array if all rows have the
+        same length, a RaggedIntArray otherwise
+
+    Raises:
+        ValueError: If the data contains something else than integers
+    """
+    require_numpy()
+    values = np.fromstring(data, dtype=np.int64, sep=" ")
+
+    # Count the numbers on each line from the position of the tokens
+    buffer = np.frombuffer(data.encode(), dtype=np.uint8)
+    is_space = buffer <= ord(" ")
+    token_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    newlines = np.flatnonzero(buffer == ord("\n"))
+    if len(token_starts) != len(values):
+        raise ValueError("Data must only contain whitespace separated integers")
+
+    row_count = len(newlines) + 1
+    lengths = np.bincount(np.searchsorted(newlines, token_starts), minlength=row_count)
+    if not ragged and np.all(lengths == lengths[0]):
+        return values.reshape(row_count, lengths[0])
+
+    offsets = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return RaggedIntArray(values, offsets)
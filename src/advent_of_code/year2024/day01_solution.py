@@ -1,7 +1,25 @@
-from typing import Dict, List
+import bisect
+import copy
+import itertools
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from advent_of_code.utils.common import convert_to_int_matrix
+from advent_of_code.utils.external_sort import external_sorted
+from advent_of_code.utils.mapreduce import map_reduce, use_parallel
 from advent_of_code.utils.template import AOCSolution
+from advent_of_code.utils.vectorized import (
+    HAS_NUMPY,
+    RaggedIntArray,
+    convert_to_int_array,
+    np,
+)
+
+# Inputs having at least this number of lines are solved with NumPy if available
+VECTORIZE_MIN_LINES = 10_000
 
 
 def get_distance(list1: List[int], list2: List[int]) -> int:
@@ -26,25 +44,438 @@ def get_similarity(list1: List[int], list2: List[int]) -> int:
     return similarity
 
 
+def get_distance_vectorized(list1: Any, list2: Any) -> int:
+    """Vectorized get_distance, taking two NumPy integer arrays."""
+    if len(list1) != len(list2):
+        raise ValueError("Lists must be of equal length")
+    return int(np.abs(np.sort(list1) - np.sort(list2)).sum())
+
+
+def get_similarity_vectorized(list1: Any, list2: Any) -> int:
+    """Vectorized get_similarity, taking two NumPy integer arrays."""
+    values, counts = np.unique(list2, return_counts=True)
+    if len(values) == 0:
+        return 0
+    # Find the occurrence count in list2 of each number of list1
+    idx = np.minimum(np.searchsorted(values, list1), len(values) - 1)
+    occurrences = np.where(values[idx] == list1, counts[idx], 0)
+    return int((list1 * occurrences).sum())
+
+
+def parse_location_columns(input_data: str) -> Tuple[Any, Any]:
+    """
+    Parse the two location lists into NumPy arrays.
+
+    Raises:
+        ValueError: If a line doesn't hold exactly two location ids
+    """
+    data = convert_to_int_array(input_data)
+    if isinstance(data, RaggedIntArray) or data.shape[1] != 2:
+        raise ValueError("Each line must hold exactly two location ids")
+    return data[:, 0], data[:, 1]
+
+
+LocationCounts = Tuple["Counter[int]", "Counter[int]"]
+
+
+def count_locations(input_data: str) -> LocationCounts:
+    """Count the occurrences of each number of both lists, the map of map_reduce."""
+    if not input_data:
+        return Counter(), Counter()
+    if HAS_NUMPY:
+        counters = []
+        for column in parse_location_columns(input_data):
+            values, counts = np.unique(column, return_counts=True)
+            counters.append(Counter(dict(zip(values.tolist(), counts.tolist()))))
+        return counters[0], counters[1]
+    data = convert_to_int_matrix(input_data)
+    return Counter(row[0] for row in data), Counter(row[1] for row in data)
+
+
+def merge_location_counts(
+    counts1: LocationCounts, counts2: LocationCounts
+) -> LocationCounts:
+    """Add the location counts of two chunks, the reduce of map_reduce."""
+    merged = counts1[0].copy(), counts1[1].copy()
+    merged[0].update(counts2[0])
+    merged[1].update(counts2[1])
+    return merged
+
+
+def get_distance_from_counts(counts: LocationCounts) -> int:
+    """
+    get_distance from the number of occurrences of each location.
+
+    Walking both lists of distinct numbers in order pairs the i-th smallest
+    numbers of both lists, without sorting the whole lists.
+    """
+    counts1, counts2 = counts
+    if sum(counts1.values()) != sum(counts2.values()):
+        raise ValueError("Lists must be of equal length")
+    runs2 = iter(sorted(counts2.items()))
+    num2, left2 = 0, 0
+    distance = 0
+    for num1, left1 in sorted(counts1.items()):
+        while left1:
+            if not left2:
+                num2, left2 = next(runs2)
+            paired = min(left1, left2)
+            distance += abs(num1 - num2) * paired
+            left1 -= paired
+            left2 -= paired
+    return distance
+
+
+def get_similarity_from_counts(counts: LocationCounts) -> int:
+    """get_similarity from the number of occurrences of each location."""
+    counts1, counts2 = counts
+    return sum(num * count * counts2[num] for num, count in counts1.items())
+
+
+def iter_location_column(path: Path, column: int) -> Iterator[int]:
+    """Lazily read one of the location lists from an input file."""
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield int(line.split()[column])
+
+
+def _iter_sorted_runs(
+    path: Path, column: int, chunk_size: int
+) -> Iterator[Tuple[int, int]]:
+    """Yield each distinct number of a location list with its count, in order."""
+    sorted_column = external_sorted(iter_location_column(path, column), chunk_size)
+    for num, group in itertools.groupby(sorted_column):
+        yield num, sum(1 for _ in group)
+
+
+def get_distance_from_file(path: Path, chunk_size: int = 1_000_000) -> int:
+    """
+    Out-of-core get_distance, for input files too large to fit in memory.
+
+    Both lists are sorted on disk with an external merge sort, then their
+    distance is summed while streaming the sorted values.
+    """
+    distance = 0
+    for num1, num2 in itertools.zip_longest(
+        external_sorted(iter_location_column(path, 0), chunk_size),
+        external_sorted(iter_location_column(path, 1), chunk_size),
+    ):
+        if num1 is None or num2 is None:
+            raise ValueError("Lists must be of equal length")
+        distance += abs(num1 - num2)
+    return distance
+
+
+def get_similarity_from_file(path: Path, chunk_size: int = 1_000_000) -> int:
+    """
+    Out-of-core get_similarity, for input files too large to fit in memory.
+
+    Both lists are sorted on disk, then the runs of equal numbers are joined
+    while streaming: each number contributes num * count1 * count2.
+    """
+    runs1 = _iter_sorted_runs(path, 0, chunk_size)
+    runs2 = _iter_sorted_runs(path, 1, chunk_size)
+
+    similarity = 0
+    run2 = next(runs2, None)
+    for num, count1 in runs1:
+        while run2 is not None and run2[0] < num:
+            run2 = next(runs2, None)
+        if run2 is None:
+            break
+        if run2[0] == num:
+            similarity += num * count1 * run2[1]
+    return similarity
+
+
+class LocationListPair:
+    """
+    Location lists updated as pairs are appended, answering in O(1).
+
+    The similarity is kept up to date from the counts of each location. The
+    distance is the integral of |F1(t) - F2(t)| over t, F1 and F2 counting the
+    locations of each list lower or equal to t. Between two consecutive
+    distinct locations this balance is constant, so the distinct locations are
+    kept sorted in blocks, with the balance and the width of the segment
+    starting at each of them. Appending (left, right) adds 1 to the balance of
+    the segments between left and right (or removes 1 if right < left), which
+    changes the distance of a whole block in O(1) from the total width of its
+    segments of each balance. With m distinct locations in blocks of about b
+    locations, an append costs O(b + m / b) instead of sorting both lists.
+
+    Args:
+        pairs (Iterable[Tuple[int, int]]): Initial (left, right) pairs
+    """
+
+    # Maximum number of distinct locations in a block, before it is split
+    block_size = 64
+
+    def __init__(self, pairs: Iterable[Tuple[int, int]] = ()) -> None:
+        self.__counts1: "Counter[int]" = Counter()
+        self.__counts2: "Counter[int]" = Counter()
+        self.__length = 0
+        self.__similarity = 0
+        self.__distance = 0
+        # Sorted distinct locations, by block, and the first location of each block
+        self.__values: List[List[int]] = []
+        self.__mins: List[int] = []
+        # Balance of the segment starting at each location, without the offset
+        # added to all the segments of its block
+        self.__balances: List[List[int]] = []
+        self.__offsets: List[int] = []
+        # Width of the segment starting at each location, 0 for the last one
+        self.__widths: List[List[int]] = []
+        # Total width of the segments of a block by balance (without offset),
+        # and total width of the segments whose balance is negative
+        self.__widths_by_balance: List["Counter[int]"] = []
+        self.__negative_widths: List[int] = []
+        self.__total_widths: List[int] = []
+        self.extend(pairs)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    @property
+    def distance(self) -> int:
+        return self.__distance
+
+    @property
+    def similarity(self) -> int:
+        return self.__similarity
+
+    def extend(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        for left, right in pairs:
+            self.append(left, right)
+
+    def append(self, left: int, right: int) -> None:
+        """
+        Append a location to each list, updating the distance and the similarity.
+
+        Args:
+            left (int): The location appended to the left list
+            right (int): The location appended to the right list
+        """
+        self.__length += 1
+        self.__counts1[left] += 1
+        self.__similarity += left * self.__counts2[left]
+        self.__counts2[right] += 1
+        self.__similarity += right * self.__counts1[right]
+
+        self.__insert(left)
+        self.__insert(right)
+        if left != right:
+            first, last = sorted((left, right))
+            self.__add_balance(
+                self.__locate(first), self.__locate(last), 1 if left < right else -1
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Save the state of the lists, to restore it later."""
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Restore the state of the lists, the snapshot staying usable."""
+        self.__dict__.update(copy.deepcopy(snapshot))
+
+    def __locate(self, value: int) -> Tuple[int, int]:
+        block = bisect.bisect_right(self.__mins, value) - 1
+        return block, bisect.bisect_left(self.__values[block], value)
+
+    def __set_width(self, block: int, idx: int, width: int) -> None:
+        balance = self.__balances[block][idx]
+        old_width = self.__widths[block][idx]
+        self.__widths[block][idx] = width
+        self.__widths_by_balance[block][balance] += width - old_width
+        self.__total_widths[block] += width - old_width
+        if balance + self.__offsets[block] < 0:
+            self.__negative_widths[block] += width - old_width
+
+    def __insert(self, value: int) -> None:
+        """Add a distinct location, splitting the segment it falls in."""
+        if not self.__values:
+            self.__values.append([value])
+            self.__mins.append(value)
+            self.__balances.append([0])
+            self.__offsets.append(0)
+            self.__widths.append([0])
+            self.__widths_by_balance.append(Counter())
+            self.__negative_widths.append(0)
+            self.__total_widths.append(0)
+            return
+
+        if value < self.__mins[0]:
+            # Below every location, where the balance is 0
+            block, idx, balance = 0, 0, -self.__offsets[0]
+            width = self.__mins[0] - value
+            self.__mins[0] = value
+        else:
+            block, idx = self.__locate(value)
+            values = self.__values[block]
+            if idx < len(values) and values[idx] == value:
+                return
+            # The new segment starts with the balance of the one it splits
+            balance = self.__balances[block][idx - 1]
+            if idx < len(values):
+                next_value: Optional[int] = values[idx]
+            elif block + 1 < len(self.__values):
+                next_value = self.__mins[block + 1]
+            else:
+                next_value = None
+            width = 0 if next_value is None else next_value - value
+            self.__set_width(block, idx - 1, value - values[idx - 1])
+
+        self.__values[block].insert(idx, value)
+        self.__balances[block].insert(idx, balance)
+        self.__widths[block].insert(idx, 0)
+        self.__set_width(block, idx, width)
+        if len(self.__values[block]) > 2 * self.block_size:
+            self.__split(block)
+
+    def __split(self, block: int) -> None:
+        half = len(self.__values[block]) // 2
+        for blocks in (self.__values, self.__balances, self.__widths):
+            blocks.insert(block + 1, blocks[block][half:])
+            del blocks[block][half:]
+        self.__mins.insert(block + 1, self.__values[block + 1][0])
+        self.__offsets.insert(block + 1, self.__offsets[block])
+        self.__widths_by_balance.insert(block + 1, Counter())
+        self.__negative_widths.insert(block + 1, 0)
+        self.__total_widths.insert(block + 1, 0)
+        self.__rebuild(block)
+        self.__rebuild(block + 1)
+
+    def __rebuild(self, block: int) -> None:
+        widths_by_balance: "Counter[int]" = Counter()
+        for balance, width in zip(self.__balances[block], self.__widths[block]):
+            widths_by_balance[balance] += width
+        offset = self.__offsets[block]
+        self.__widths_by_balance[block] = widths_by_balance
+        self.__total_widths[block] = sum(widths_by_balance.values())
+        self.__negative_widths[block] = sum(
+            width
+            for balance, width in widths_by_balance.items()
+            if balance + offset < 0
+        )
+
+    def __add_balance(
+        self, start: Tuple[int, int], end: Tuple[int, int], delta: int
+    ) -> None:
+        """Add delta (1 or -1) to the balance of the segments from start to end."""
+        start_block, start_idx = start
+        end_block, end_idx = end
+        if start_block == end_block:
+            self.__add_segments(start_block, start_idx, end_idx, delta)
+            return
+        self.__add_segments(
+            start_block, start_idx, len(self.__values[start_block]), delta
+        )
+        for block in range(start_block + 1, end_block):
+            self.__add_block(block, delta)
+        self.__add_segments(end_block, 0, end_idx, delta)
+
+    def __add_segments(self, block: int, start: int, end: int, delta: int) -> None:
+        if start == 0 and end == len(self.__values[block]):
+            self.__add_block(block, delta)
+            return
+        balances = self.__balances[block]
+        widths = self.__widths[block]
+        widths_by_balance = self.__widths_by_balance[block]
+        offset = self.__offsets[block]
+        for idx in range(start, end):
+            balance, width = balances[idx], widths[idx]
+            self.__distance += width * (
+                abs(balance + offset + delta) - abs(balance + offset)
+            )
+            widths_by_balance[balance] -= width
+            widths_by_balance[balance + delta] += width
+            balances[idx] = balance + delta
+            if balance + offset < 0:
+                self.__negative_widths[block] -= width
+            if balance + offset + delta < 0:
+                self.__negative_widths[block] += width
+
+    def __add_block(self, block: int, delta: int) -> None:
+        offset = self.__offsets[block]
+        total = self.__total_widths[block]
+        negative = self.__negative_widths[block]
+        widths_by_balance = self.__widths_by_balance[block]
+        if delta == 1:
+            # Negative segments get closer to 0, the others get further
+            self.__distance += total - 2 * negative
+            # Segments at -1 become 0
+            self.__negative_widths[block] -= widths_by_balance[-1 - offset]
+        else:
+            zero = widths_by_balance[-offset]
+            self.__distance += 2 * (negative + zero) - total
+            # Segments at 0 become -1
+            self.__negative_widths[block] += zero
+        self.__offsets[block] = offset + delta
+
+
+def generate_input(size: int, seed: int = 0) -> str:
+    """
+    Generate a valid puzzle input of size lines of location ids.
+
+    About half of the right list reuses ids of the left list, so the
+    similarity score isn't always zero.
+    """
+    rng = random.Random(seed)
+    left = [rng.randint(10_000, 99_999) for _ in range(size)]
+    right = [
+        rng.choice(left) if rng.random() < 0.5 else rng.randint(10_000, 99_999)
+        for _ in range(size)
+    ]
+    return "\n".join(f"{a}   {b}" for a, b in zip(left, right))
+
+
 class Solution(AOCSolution):
+    complexity = "O(n log n)"
+
     def __init__(self) -> None:
         super().__init__(year=2024, day=1)
 
-    def part1(self, input_data: str) -> int:
-        """Solve part 1 of the puzzle."""
+    def parse(self, input_data: str) -> Tuple[Any, Any]:
+        """
+        Split the input into the two location lists.
+
+        Large inputs are parsed into NumPy arrays when NumPy is available. Very
+        large ones are reduced to the counts of each location across processes.
+        """
+        if use_parallel(input_data):
+            return map_reduce(input_data, count_locations, merge_location_counts)
+        if HAS_NUMPY and input_data.count("\n") + 1 >= VECTORIZE_MIN_LINES:
+            return parse_location_columns(input_data)
+
         data = convert_to_int_matrix(input_data)
         list1 = [row[0] for row in data]
         list2 = [row[1] for row in data]
-        return get_distance(list1, list2)
+        return list1, list2
 
-    def part2(self, input_data: str) -> int:
+    def part1(self, lists: Tuple[Any, Any]) -> int:
+        """Solve part 1 of the puzzle."""
+        if isinstance(lists[0], Counter):
+            return get_distance_from_counts(lists)
+        if isinstance(lists[0], list):
+            return get_distance(*lists)
+        return get_distance_vectorized(*lists)
+
+    def part2(self, lists: Tuple[Any, Any]) -> int:
         """Solve part 2 of the puzzle."""
-        data = convert_to_int_matrix(input_data)
-        list1 = [row[0] for row in data]
-        list2 = [row[1] for row in data]
-        return get_similarity(list1, list2)
+        if isinstance(lists[0], Counter):
+            return get_similarity_from_counts(lists)
+        if isinstance(lists[0], list):
+            return get_similarity(*lists)
+        return get_similarity_vectorized(*lists)
 
 
 if __name__ == "__main__":
-    solution = Solution()
-    print(solution.solve())
+    if len(sys.argv) > 1:
+        # Solve an input file that may not fit in memory
+        input_path = Path(sys.argv[1])
+        print(
+            (get_distance_from_file(input_path), get_similarity_from_file(input_path))
+        )
+    else:
+        solution = Solution()
+        print(solution.solve())
@@ -1,14 +1,31 @@
-from typing import List
+import random
+from typing import Any, NamedTuple, Sequence, Union
 
 from advent_of_code.utils.common import convert_to_int_matrix
+from advent_of_code.utils.mapreduce import add_tuples, map_reduce, use_parallel
 from advent_of_code.utils.template import AOCSolution
+from advent_of_code.utils.vectorized import (
+    HAS_NUMPY,
+    RaggedIntArray,
+    convert_to_int_array,
+    np,
+)
+
+Reports = Union[Sequence[Sequence[int]], RaggedIntArray]
+
+
+class SafeReportCounts(NamedTuple):
+    """Number of safe reports, without and with dampener."""
+
+    safe: int
+    dampener_safe: int
 
 
 def is_rate_safe(rate: int) -> bool:
     return rate > 0 and rate < 4
 
 
-def is_report_safe(report: List[int]) -> bool:
+def is_report_safe(report: Sequence[int]) -> bool:
     """
     Check if a report is safe by verifying that each number stricly increase/decrease
     and by increments smaller or equal to 3.
@@ -36,14 +53,46 @@ def is_report_safe(report: List[int]) -> bool:
     return True
 
 
-def is_report_dampener_safe(report: List[int]) -> bool:
+def _is_dampener_safe_in_direction(report: Sequence[int], sign: int) -> bool:
+    """Check if removing at most one level makes a report safe in one direction."""
+    level_count = len(report)
+    rate_safe = [
+        is_rate_safe((report[i + 1] - report[i]) * sign) for i in range(level_count - 1)
+    ]
+    # prefix_safe[i]: all rates before index i are safe
+    prefix_safe = [True] * (level_count + 1)
+    for i in range(level_count - 1):
+        prefix_safe[i + 1] = prefix_safe[i] and rate_safe[i]
+    # suffix_safe[i]: all rates from index i are safe
+    suffix_safe = [True] * (level_count + 1)
+    for i in range(level_count - 2, -1, -1):
+        suffix_safe[i] = suffix_safe[i + 1] and rate_safe[i]
+
+    for removed in range(level_count):
+        # Rates on the left and on the right of the removed level must be safe
+        if removed > 0 and not prefix_safe[removed - 1]:
+            continue
+        if not suffix_safe[removed + 1]:
+            continue
+        # Just like the new rate bridging over the removed level
+        if 0 < removed < level_count - 1 and not is_rate_safe(
+            (report[removed + 1] - report[removed - 1]) * sign
+        ):
+            continue
+        return True
+    return False
+
+
+def is_report_dampener_safe(report: Sequence[int]) -> bool:
     """
     Check if a report is safe by verifying that each number stricly increase/decrease
     and by increments smaller or equal to 3. With dampener it's now possible to ignore
     a single level.
 
+    The report is left untouched, and is checked in O(n).
+
     Args:
-        report (List[int]): List of integers representing the report values
+        report (Sequence[int]): List of integers representing the report values
 
     Returns:
         bool: True if the report is safe, False otherwise
@@ -51,63 +100,174 @@ def is_report_dampener_safe(report: List[int]) -> bool:
     # Exclude the singleton and empty cases
     if len(report) <= 2:
         return True
+    return _is_dampener_safe_in_direction(report, 1) or _is_dampener_safe_in_direction(
+        report, -1
+    )
 
-    ignored_level = []
 
-    # Get the direction of change between first two numbers (-1 for decrease, 1 for increase)
-    rates = [report[i] - report[i - 1] for i in range(1, len(report))]
-    global_tendancy = sum(rates)
-    sign = 1 if global_tendancy >= 0 else -1
-
-    i = 1
-    while i < len(report):
-        crnt_rate = (report[i] - report[i - 1]) * sign
-        if not is_rate_safe(crnt_rate):
-            # Check if left number could be erased
-            left_erasable = True
-            if i > 1:
-                prev_rate = (report[i - 1] - report[i - 2]) * sign
-                left_erasable = is_rate_safe(prev_rate + crnt_rate)
-
-            # Check if right number could be erased
-            right_erasable = True
-            if i < len(report) - 1:
-                next_rate = (report[i + 1] - report[i]) * sign
-                right_erasable = is_rate_safe(crnt_rate + next_rate)
-
-            # Erase first right then left
-            if right_erasable:
-                ignored_level.append(report.pop(i))
-            elif left_erasable:
-                ignored_level.append(report.pop(i - 1))
-            else:
-                return False
-        else:
-            i += 1
-
-    return len(ignored_level) <= 1
-
-
-def get_safe_report_num(reports: List[List[int]]) -> int:
+def _to_ragged(reports: Reports) -> RaggedIntArray:
+    if isinstance(reports, RaggedIntArray):
+        return reports
+    return RaggedIntArray.from_rows(reports)
+
+
+def _unsafe_rate_cumsum(reports: RaggedIntArray, sign: int) -> Any:
+    """
+    Count the unsafe rates of all the reports at once.
+
+    The rate at position i is the one between the levels i and i + 1 of the flat
+    values, the rates crossing two reports being ignored. Element i of the returned
+    array is the number of unsafe rates before position i.
+    """
+    values = reports.values
+    level_count = len(values)
+    unsafe = np.zeros(level_count, dtype=np.int64)
+    if level_count > 1:
+        rates = np.diff(values) * sign
+        unsafe[:-1] = (rates < 1) | (rates > 3)
+        # The last level of a report has no rate
+        report_ends = reports.offsets[1:] - 1
+        unsafe[report_ends[report_ends >= 0]] = 0
+    return np.concatenate(([0], np.cumsum(unsafe)))
+
+
+def get_safe_reports(reports: RaggedIntArray) -> Any:
+    """
+    Check the safety of all the reports in a single vectorized pass.
+
+    Args:
+        reports (RaggedIntArray): The reports, one per row
+
+    Returns:
+        np.ndarray: Boolean array telling if each report is safe
+    """
+    starts = reports.offsets[:-1]
+    last_rates = np.maximum(reports.offsets[1:] - 1, starts)
+    safe = np.zeros(len(reports), dtype=bool)
+    for sign in (1, -1):
+        unsafe_cumsum = _unsafe_rate_cumsum(reports, sign)
+        safe |= unsafe_cumsum[last_rates] == unsafe_cumsum[starts]
+    return safe
+
+
+def get_dampener_safe_reports(reports: RaggedIntArray) -> Any:
+    """
+    Check the safety of all the reports with dampener in a single vectorized pass.
+
+    For each level, the report is safe without it if the rates on its left and on
+    its right are safe, and so is the rate bridging over it. Prefix sums of the
+    unsafe rates give the first two conditions in O(1) per level, so the whole
+    batch is decided in O(total levels) without copying any report.
+
+    Args:
+        reports (RaggedIntArray): The reports, one per row
+
+    Returns:
+        np.ndarray: Boolean array telling if each report is safe with dampener
+    """
+    values = reports.values
+    level_count = len(values)
+    lengths = reports.lengths
+    report_idx = np.repeat(np.arange(len(reports)), lengths)
+    levels = np.arange(level_count)
+    starts = reports.offsets[:-1][report_idx]
+    last_levels = reports.offsets[1:][report_idx] - 1
+
+    is_inner = (levels > starts) & (levels < last_levels)
+    next_levels = np.minimum(levels + 1, max(level_count - 1, 0))
+    prev_levels = np.maximum(levels - 1, 0)
+
+    safe = get_safe_reports(reports) | (lengths <= 2)
+    for sign in (1, -1):
+        unsafe_cumsum = _unsafe_rate_cumsum(reports, sign)
+        left_safe = (
+            unsafe_cumsum[np.maximum(levels - 1, starts)] == unsafe_cumsum[starts]
+        )
+        right_first = np.minimum(levels + 1, last_levels)
+        right_safe = unsafe_cumsum[last_levels] == unsafe_cumsum[right_first]
+        bridge_rates = (values[next_levels] - values[prev_levels]) * sign
+        bridge_safe = ~is_inner | ((bridge_rates >= 1) & (bridge_rates <= 3))
+        removable = left_safe & right_safe & bridge_safe
+        safe |= np.bincount(report_idx, removable, minlength=len(reports)) > 0
+    return safe
+
+
+def get_safe_report_num(reports: Reports) -> int:
+    if HAS_NUMPY:
+        return int(get_safe_reports(_to_ragged(reports)).sum())
     return sum([int(is_report_safe(report)) for report in reports])
 
 
-def get_dampener_safe_report_num(reports: List[List[int]]) -> int:
+def get_dampener_safe_report_num(reports: Reports) -> int:
+    if HAS_NUMPY:
+        return int(get_dampener_safe_reports(_to_ragged(reports)).sum())
     return sum([int(is_report_dampener_safe(report)) for report in reports])
 
 
+def parse_reports(input_data: str) -> Reports:
+    """Parse the reports, one per line."""
+    if HAS_NUMPY:
+        reports: RaggedIntArray = convert_to_int_array(input_data, ragged=True)
+        return reports
+    return convert_to_int_matrix(input_data)
+
+
+def count_safe_reports(input_data: str) -> SafeReportCounts:
+    """Count the safe reports of some lines, the map function of map_reduce."""
+    if not input_data:
+        return SafeReportCounts(0, 0)
+    reports = parse_reports(input_data)
+    return SafeReportCounts(
+        get_safe_report_num(reports), get_dampener_safe_report_num(reports)
+    )
+
+
+def generate_input(size: int, seed: int = 0) -> str:
+    """
+    Generate a valid puzzle input of size reports.
+
+    Reports are monotonic runs of 5 to 8 levels, some of them having a bad level
+    so that every kind of report (safe, safe with the dampener, unsafe) shows up.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        sign = rng.choice((-1, 1))
+        report = [rng.randint(20, 70)]
+        for _ in range(rng.randint(4, 7)):
+            report.append(report[-1] + sign * rng.randint(1, 3))
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            report[rng.randrange(len(report))] += rng.randint(-4, 4)
+        lines.append(" ".join(map(str, report)))
+    return "\n".join(lines)
+
+
 class Solution(AOCSolution):
+    complexity = "O(n)"
+
     def __init__(self) -> None:
         super().__init__(year=2024, day=2)
 
-    def part1(self, input_data: str) -> int:
+    def parse(self, input_data: str) -> Union[Reports, SafeReportCounts]:
+        """
+        Parse the reports, one per line.
+
+        Large inputs are counted right away for both parts, across processes.
+        """
+        if use_parallel(input_data):
+            return map_reduce(input_data, count_safe_reports, add_tuples)
+        return parse_reports(input_data)
+
+    def part1(self, reports: Union[Reports, SafeReportCounts]) -> int:
         """Solve part 1 of the puzzle."""
-        reports = convert_to_int_matrix(input_data)
+        if isinstance(reports, SafeReportCounts):
+            return reports.safe
         return get_safe_report_num(reports)
 
-    def part2(self, input_data: str) -> int:
+    def part2(self, reports: Union[Reports, SafeReportCounts]) -> int:
         """Solve part 2 of the puzzle."""
-        reports = convert_to_int_matrix(input_data)
+        if isinstance(reports, SafeReportCounts):
+            return reports.dampener_safe
         return get_dampener_safe_report_num(reports)
 
 
@@ -1,25 +1,161 @@
+import mmap
+import random
 import re
-from typing import List
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Match, Optional, Union
 
+from advent_of_code.utils.mapreduce import get_worker_count
 from advent_of_code.utils.template import AOCSolution
 
+# Longest token to scan: "mul(123,456)"
+MAX_TOKEN_LENGTH = 12
+MEMORY_PATTERN = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)|(do)\(\)|(don't)\(\)")
+MEMORY_BYTES_PATTERN = re.compile(MEMORY_PATTERN.pattern.encode())
 
-def extract_mult(corrupt_mem: str, with_do: bool = True) -> List[str]:
-    if with_do:
-        return re.findall(r"mul\(\d{1,3},\d{1,3}\)|do(?:n't)?\(\)", corrupt_mem)
+
+@dataclass
+class ScanResult:
+    """
+    Sum of the products found in a slice of memory.
+
+    As the do()/don't() state carries over from the previous slices, products found
+    before the first do()/don't() of the slice are kept apart, so results of
+    consecutive slices can be combined once the state is known.
+    """
+
+    # Products found before the first do()/don't()
+    prefix_sum: int = 0
+    # Products enabled after the first do()/don't()
+    suffix_sum: int = 0
+    # Whether multiplications are enabled at the end, None if there's no do()/don't()
+    final_state: Optional[bool] = None
+
+    def combine(self, other: "ScanResult") -> "ScanResult":
+        """Merge with the result of the slice following this one."""
+        if self.final_state is None:
+            return ScanResult(
+                self.prefix_sum + other.prefix_sum,
+                self.suffix_sum + other.suffix_sum,
+                other.final_state,
+            )
+        return ScanResult(
+            self.prefix_sum,
+            self.suffix_sum
+            + (other.prefix_sum if self.final_state else 0)
+            + other.suffix_sum,
+            self.final_state if other.final_state is None else other.final_state,
+        )
+
+    @property
+    def total(self) -> int:
+        """Sum of the products, multiplications being enabled at first."""
+        return self.prefix_sum + self.suffix_sum
+
+
+def scan_memory(
+    corrupt_mem: Union[str, bytes, memoryview, mmap.mmap],
+    with_do: bool = True,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> ScanResult:
+    """
+    Scan the tokens starting in corrupt_mem[start:end] in a single regex pass.
+
+    Tokens starting in the slice may end after it, so slices can be scanned
+    independently without missing the tokens straddling two of them.
+    """
+    end = len(corrupt_mem) if end is None else end
+    search_end = min(end + MAX_TOKEN_LENGTH - 1, len(corrupt_mem))
+    matches: Iterator[Match[Any]]
+    if isinstance(corrupt_mem, str):
+        matches = MEMORY_PATTERN.finditer(corrupt_mem, start, search_end)
+    else:
+        matches = MEMORY_BYTES_PATTERN.finditer(corrupt_mem, start, search_end)
+
+    result = ScanResult()
+    enable: Optional[bool] = None
+    for match in matches:
+        if match.start() >= end:
+            break
+        if match.lastindex == 2:
+            product = int(match.group(1)) * int(match.group(2))
+            if enable is None:
+                result.prefix_sum += product
+            elif enable:
+                result.suffix_sum += product
+        elif with_do:
+            enable = match.lastindex == 3
+    result.final_state = enable
+    return result
+
+
+def _scan_file_slice(path: Path, start: int, end: int, with_do: bool) -> ScanResult:
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mem:
+        return scan_memory(mem, with_do, start, end)
+
+
+def scan_file(
+    path: Path,
+    with_do: bool = True,
+    chunk_size: int = 1 << 24,
+    workers: int = 1,
+) -> int:
+    """
+    Compute get_mult_sum on a file without loading it in memory.
+
+    The memory-mapped file is scanned chunk by chunk, and the chunks can be split
+    across several processes.
+
+    Args:
+        path (Path): File containing the corrupted memory
+        with_do (bool): Whether do() and don't() instructions are enabled
+        chunk_size (int): Number of bytes scanned at once
+        workers (int): Number of processes scanning the chunks
+
+    Returns:
+        int: The sum of all multiplication products found in the file
+    """
+    size = Path(path).stat().st_size
+    if size == 0:
+        return 0
+    slices = [
+        (start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)
+    ]
+
+    result = ScanResult()
+    if workers > 1 and len(slices) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_scan_file_slice, path, start, end, with_do)
+                for start, end in slices
+            ]
+            for future in futures:
+                result = result.combine(future.result())
     else:
-        return re.findall(r"mul\(\d{1,3},\d{1,3}\)", corrupt_mem)
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mem:
+            for start, end in slices:
+                result = result.combine(scan_memory(mem, with_do, start, end))
+    return result.total
 
 
-def get_mult_sum(corrupt_mem: str, with_do: bool = True) -> int:
+def get_mult_sum(corrupt_mem: Union[str, memoryview], with_do: bool = True) -> int:
     """
-    Calculate the sum of all multiplication operations found in a corrupted memory string.
+    Calculate the sum of all multiplication operations found in corrupted memory.
 
-    The function looks for patterns of 'mul(x,y)' where x and y are 1-3 digit numbers,
-    extracts these patterns using extract_mult(), and returns the sum of all x*y products.
+    The function looks for patterns of 'mul(x,y)' where x and y are 1-3 digit
+    numbers, extracts their numbers in a single pass using scan_memory(), and
+    returns the sum of all x*y products.
 
     Args:
-        corrupt_mem (str): A string containing corrupted memory data with multiplication operations
+        corrupt_mem (Union[str, memoryview]): Corrupted memory data with
+            multiplication operations
 
     Returns:
         int: The sum of all multiplication products found in the string
@@ -28,34 +164,73 @@ def get_mult_sum(corrupt_mem: str, with_do: bool = True) -> int:
         >>> get_mult_sum("mul(2,4)mul(3,7)")
         29  # (2*4 + 3*7 = 8 + 21 = 29)
     """
-    mul_list = extract_mult(corrupt_mem, with_do)
-    # By default, multiplication are enable at first
-    enable = True
-    mult_sum = 0
-    for formul in mul_list:
-        if formul == "don't()":
-            enable = False
-        elif formul == "do()":
-            enable = True
-        elif enable:
-            numbers = re.search(r"(\d{1,3}),(\d{1,3})", formul)
-            mult_sum += int(numbers.group(1)) * int(numbers.group(2))
-    return mult_sum
+    return scan_memory(corrupt_mem, with_do).total
+
+
+_NOISE = "!@#$%^&*()[]{}<>,;:'~+- ?/whatfromselectwhyhow"
+
+
+def generate_input(size: int, seed: int = 0) -> str:
+    """
+    Generate a valid puzzle input of about size characters of corrupted memory.
+
+    Valid mul instructions are mixed with do(), don't(), malformed instructions
+    and random noise.
+    """
+    rng = random.Random(seed)
+    pieces = []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.3:
+            piece = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+        elif kind < 0.35:
+            piece = rng.choice(("do()", "don't()"))
+        elif kind < 0.45:
+            piece = rng.choice(
+                (
+                    f"mul({rng.randint(1, 999)},{rng.randint(1, 999)}]",
+                    f"mul ( {rng.randint(1, 99)},{rng.randint(1, 99)})",
+                    f"mul({rng.randint(1000, 9999)},{rng.randint(1, 9)})",
+                    "mul(",
+                )
+            )
+        else:
+            piece = "".join(rng.choices(_NOISE, k=rng.randint(1, 8)))
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces)
 
 
 class Solution(AOCSolution):
+    complexity = "O(n)"
+
     def __init__(self) -> None:
         super().__init__(year=2024, day=3)  # Replace with the correct year and day
 
-    def part1(self, input_data: str) -> int:
+    def read_input(self) -> memoryview:
+        """Scan the memory-mapped input instead of loading it in a string."""
+        return self.input_bytes()
+
+    def part1(self, input_data: Union[str, memoryview]) -> int:
         """Solve part 1 of the puzzle."""
         return get_mult_sum(input_data, False)
 
-    def part2(self, input_data: str) -> int:
+    def part2(self, input_data: Union[str, memoryview]) -> int:
         """Solve part 2 of the puzzle."""
         return get_mult_sum(input_data, True)
 
 
 if __name__ == "__main__":
-    solution = Solution()
-    print(solution.solve())
+    if len(sys.argv) > 1:
+        # Scan an input file without loading it in memory
+        input_path = Path(sys.argv[1])
+        print(
+            (
+                scan_file(input_path, False, workers=get_worker_count()),
+                scan_file(input_path, True, workers=get_worker_count()),
+            )
+        )
+    else:
+        solution = Solution()
+        print(solution.solve())
@@ -1,34 +1,236 @@
-from typing import List
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from advent_of_code.utils.aho_corasick import get_automaton
 from advent_of_code.utils.template import AOCSolution
+from advent_of_code.utils.vectorized import HAS_NUMPY, np, require_numpy
 
 
 def convert_to_xmas_matrix(string_grid: str) -> List[List[str]]:
     return [[letter for letter in line.split()[0]] for line in string_grid.split("\n")]
 
 
-class XmasGrid:
-    def __init__(self, string_grid: str) -> None:
-        self.__grid = [
-            [letter for letter in line.split()[0]] for line in string_grid.split("\n")
+def count_word_vectorized(grid: Any, word: str) -> int:
+    """
+    Count the occurrences of a word in all 8 directions of a letter grid.
+
+    For each direction, the letters of the word are compared with the grid shifted
+    by their offset, the occurrences being where all the comparisons match.
+
+    Args:
+        grid (np.ndarray): 2D uint8 array of letter codes
+        word (str): The word to search
+
+    Returns:
+        int: The number of occurrences of the word
+    """
+    raw_count, col_count = grid.shape
+    codes = word.encode("ascii")
+    last = len(codes) - 1
+    word_count = 0
+    for vect_y in [-1, 0, 1]:
+        for vect_x in [-1, 0, 1]:
+            if vect_x == 0 and vect_y == 0:
+                continue
+            # Range of the positions from which the word fits in the grid
+            y_start, y_end = max(0, -last * vect_y), raw_count - max(0, last * vect_y)
+            x_start, x_end = max(0, -last * vect_x), col_count - max(0, last * vect_x)
+            if y_start >= y_end or x_start >= x_end:
+                continue
+            found = grid[y_start:y_end, x_start:x_end] == codes[0]
+            for idx in range(1, len(codes)):
+                found &= (
+                    grid[
+                        y_start + idx * vect_y : y_end + idx * vect_y,
+                        x_start + idx * vect_x : x_end + idx * vect_x,
+                    ]
+                    == codes[idx]
+                )
+            word_count += int(np.count_nonzero(found))
+    return word_count
+
+
+def count_x_mas_vectorized(grid: Any) -> int:
+    """Vectorized XmasGrid.get_wordshape_count, on a 2D uint8 array of letters."""
+    raw_count, col_count = grid.shape
+    if raw_count < 3 or col_count < 3:
+        return 0
+
+    def shifted(x_offset: int, y_offset: int) -> Any:
+        # Letters at the given offset from every position not on the border
+        return grid[
+            1 + y_offset : raw_count - 1 + y_offset,
+            1 + x_offset : col_count - 1 + x_offset,
         ]
+
+    is_middle = shifted(0, 0) == ord("A")
+    wordshape_count = 0
+    for vect_x in [-1, 1]:
+        for vect_y in [-1, 1]:
+            sgn = vect_x * vect_y
+            found = (
+                is_middle
+                & (shifted(vect_x, vect_y) == ord("M"))
+                & (shifted(-sgn * vect_x, sgn * vect_y) == ord("M"))
+                & (shifted(sgn * vect_x, -sgn * vect_y) == ord("S"))
+                & (shifted(-vect_x, -vect_y) == ord("S"))
+            )
+            wordshape_count += int(np.count_nonzero(found))
+    return wordshape_count
+
+
+# Directions of the lines of the grid, the 4 others being these ones reversed
+LINE_DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+
+
+@dataclass(frozen=True, order=True)
+class WordMatch:
+    """An occurrence of a word, from its first letter and in a direction."""
+
+    y_pos: int
+    x_pos: int
+    vect_x: int
+    vect_y: int
+    word: str
+
+
+class XmasGrid:
+    def __init__(self, string_grid: str, words: Iterable[str] = ("XMAS",)) -> None:
+        self.__grid = [line.split()[0] for line in string_grid.split("\n")]
         self.__raw_count = len(self.__grid)
         self.__col_count = len(self.__grid[0])
-        self.__search_word = "XMAS"
+        self.__search_words = tuple(dict.fromkeys(words))
+        self.__is_rectangular = all(len(row) == self.__col_count for row in self.__grid)
+        self.__array: Optional[Any] = None
+        # Letters of each line, with the position of its first letter and its direction
+        self.__lines: Optional[List[Tuple[str, int, int, int, int]]] = None
+
+    def get_array(self) -> Any:
+        """Get the grid as a 2D NumPy array of letter codes."""
+        if self.__array is None:
+            require_numpy()
+            if not self.__is_rectangular:
+                raise ValueError("All the rows of the grid must have the same length")
+            self.__array = np.frombuffer(
+                "".join(self.__grid).encode("ascii"), dtype=np.uint8
+            ).reshape(self.__raw_count, self.__col_count)
+        return self.__array
+
+    def __use_vectorized(self, vectorized: Optional[bool]) -> bool:
+        if vectorized is None:
+            return HAS_NUMPY and self.__is_rectangular
+        return vectorized
+
+    def __contains(self, x_pos: int, y_pos: int) -> bool:
+        return 0 <= y_pos < self.__raw_count and 0 <= x_pos < len(self.__grid[y_pos])
+
+    def get_lines(self) -> List[Tuple[str, int, int, int, int]]:
+        """
+        Get every row, column and diagonal of the grid, each extracted once.
+
+        Returns:
+            List[Tuple[str, int, int, int, int]]: The letters of each line, the x
+            and y position of its first letter and its direction
+        """
+        if self.__lines is None:
+            self.__lines = []
+            for vect_x, vect_y in LINE_DIRECTIONS:
+                for y_pos, row in enumerate(self.__grid):
+                    for x_pos in range(len(row)):
+                        # Lines start where the previous letter is out of the grid
+                        if self.__contains(x_pos - vect_x, y_pos - vect_y):
+                            continue
+                        letters = []
+                        x_new, y_new = x_pos, y_pos
+                        while self.__contains(x_new, y_new):
+                            letters.append(self.__grid[y_new][x_new])
+                            x_new += vect_x
+                            y_new += vect_y
+                        self.__lines.append(
+                            ("".join(letters), x_pos, y_pos, vect_x, vect_y)
+                        )
+        return self.__lines
+
+    def count_words(self, words: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Count the occurrences of words in all 8 directions, in a single pass.
+
+        Each line of the grid is scanned once, forward, by an automaton matching
+        the words and the words reversed, the reversed ones being the occurrences
+        in the opposite direction.
+
+        Args:
+            words (Optional[Iterable[str]]): The words to search, defaults to the
+                words of the grid
+
+        Returns:
+            Dict[str, int]: The number of occurrences of each word
+        """
+        words = self.__search_words if words is None else tuple(dict.fromkeys(words))
+        automaton = get_automaton(frozenset(words + tuple(w[::-1] for w in words)))
+        counts = dict(
+            zip(
+                automaton.patterns,
+                automaton.count(line for line, *_ in self.get_lines()),
+            )
+        )
+        # Palindromes are counted once per direction, as any other word
+        return {word: counts[word] + counts[word[::-1]] for word in words}
+
+    def locate_words(self, words: Optional[Iterable[str]] = None) -> List[WordMatch]:
+        """
+        Locate the occurrences of words in all 8 directions, in a single pass.
+
+        Args:
+            words (Optional[Iterable[str]]): The words to search, defaults to the
+                words of the grid
+
+        Returns:
+            List[WordMatch]: The sorted occurrences of the words
+        """
+        words = self.__search_words if words is None else tuple(dict.fromkeys(words))
+        word_set = set(words)
+        automaton = get_automaton(frozenset(words + tuple(w[::-1] for w in words)))
+        matches = []
+        for line, x_start, y_start, vect_x, vect_y in self.get_lines():
+            for start, idx in automaton.find(line):
+                pattern = automaton.patterns[idx]
+                if pattern in word_set:
+                    matches.append(
+                        WordMatch(
+                            y_start + start * vect_y,
+                            x_start + start * vect_x,
+                            vect_x,
+                            vect_y,
+                            pattern,
+                        )
+                    )
+                if pattern[::-1] in word_set:
+                    end = start + len(pattern) - 1
+                    matches.append(
+                        WordMatch(
+                            y_start + end * vect_y,
+                            x_start + end * vect_x,
+                            -vect_x,
+                            -vect_y,
+                            pattern[::-1],
+                        )
+                    )
+        return sorted(matches)
 
     def get_letter(
         self, x_pos: int, y_pos: int, x_offset: int = 0, y_offset: int = 0
     ) -> str:
         x_new = x_pos + x_offset
         y_new = y_pos + y_offset
-        if (x_new < 0 or x_new > self.__col_count - 1) or (
-            y_new < 0 or y_new > self.__raw_count - 1
-        ):
+        if not self.__contains(x_new, y_new):
             return ""
         return self.__grid[y_new][x_new]
 
     def check_word_from_direction(
-        self, x_pos: int, y_pos: int, vect_x: int, vect_y: int
+        self, x_pos: int, y_pos: int, vect_x: int, vect_y: int, word: str = "XMAS"
     ) -> bool:
         # exclude case where no movement
         if vect_x == 0 and vect_y == 0:
@@ -39,10 +241,10 @@ class XmasGrid:
             vect_y = int(vect_y / abs(vect_y))
 
         search_idx = 0
-        while search_idx != len(self.__search_word):
+        while search_idx != len(word):
             if (
                 self.get_letter(x_pos, y_pos, search_idx * vect_x, search_idx * vect_y)
-                != self.__search_word[search_idx]
+                != word[search_idx]
             ):
                 return False
             search_idx += 1
@@ -66,39 +268,53 @@ class XmasGrid:
             and self.get_letter(x_pos, y_pos, -vect_x, -vect_y) == from_vector_letter
         )
 
-    def get_wordshape_count(self) -> int:
+    def get_wordshape_count(self, vectorized: Optional[bool] = None) -> int:
+        if self.__use_vectorized(vectorized):
+            return count_x_mas_vectorized(self.get_array())
+
         wordshape_count = 0
-        for y_pos in range(self.__col_count):
-            for x_pos in range(self.__raw_count):
+        for y_pos in range(self.__raw_count):
+            for x_pos in range(self.__col_count):
                 for vect_x in [-1, 1]:
                     for vect_y in [-1, 1]:
                         if self.check_for_x_mas(x_pos, y_pos, vect_x, vect_y):
                             wordshape_count += 1
         return wordshape_count
 
-    def get_word_count(self) -> int:
-        word_count = 0
-        for y_pos in range(self.__col_count):
-            for x_pos in range(self.__raw_count):
-                for vect_y in [-1, 0, 1]:
-                    for vect_x in [-1, 0, 1]:
-                        if self.check_word_from_direction(x_pos, y_pos, vect_x, vect_y):
-                            word_count += 1
-        return word_count
+    def get_word_count(self, vectorized: Optional[bool] = None) -> int:
+        """Count the occurrences of all the words of the grid, in all 8 directions."""
+        # Vectorized search does a pass per word, only worth it for a few words
+        if len(self.__search_words) <= 4 and self.__use_vectorized(vectorized):
+            return sum(
+                count_word_vectorized(self.get_array(), word)
+                for word in self.__search_words
+            )
+        return sum(self.count_words().values())
+
+
+def generate_input(size: int, seed: int = 0) -> str:
+    """Generate a valid puzzle input, a square grid of about size letters."""
+    rng = random.Random(seed)
+    side = max(round(math.sqrt(size)), 4)
+    return "\n".join("".join(rng.choices("XMAS", k=side)) for _ in range(side))
 
 
 class Solution(AOCSolution):
+    complexity = "O(n)"
+
     def __init__(self) -> None:
         super().__init__(year=2024, day=4)  # Replace with the correct year and day
 
-    def part1(self, input_data: str) -> int:
+    def parse(self, input_data: str) -> XmasGrid:
+        """Build the letter grid."""
+        return XmasGrid(input_data)
+
+    def part1(self, xmas_grid: XmasGrid) -> int:
         """Solve part 1 of the puzzle."""
-        xmas_grid = XmasGrid(input_data)
         return xmas_grid.get_word_count()
 
-    def part2(self, input_data: str) -> int:
+    def part2(self, xmas_grid: XmasGrid) -> int:
         """Solve part 2 of the puzzle."""
-        xmas_grid = XmasGrid(input_data)
         return xmas_grid.get_wordshape_count()
 
 
@@ -1,92 +1,356 @@
-from typing import Dict, List, Tuple
+import functools
+import math
+import random
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
-from advent_of_code.utils.common import timed_execution
+from advent_of_code.utils.common import memoize
+from advent_of_code.utils.instrumentation import instrumented
+from advent_of_code.utils.mapreduce import add_tuples, map_reduce, use_parallel
 from advent_of_code.utils.template import AOCSolution
 
 
-def parse_input(input_data: str) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
-    blocks = input_data.strip().split("\n\n")
-    # Parse first block into list of tuples
+def parse_rules(block: str) -> List[Tuple[int, int]]:
     rules = []
-    for line in blocks[0].split("\n"):
+    for line in block.split("\n"):
         a, b = map(int, line.split("|"))
         rules.append((a, b))
-    # Parse second block into updates
-    updates = []
-    for line in blocks[1].split("\n"):
-        updates.append(list(map(int, line.split(","))))
-    return rules, updates
+    return rules
+
+
+def parse_updates(block: str) -> List[List[int]]:
+    return [list(map(int, line.split(","))) for line in block.split("\n") if line]
+
+
+def parse_input(input_data: str) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+    blocks = input_data.strip().split("\n\n")
+    # Parse first block into list of tuples, and second block into updates
+    return parse_rules(blocks[0]), parse_updates(blocks[1])
+
+
+# Number of distinct updates whose corrected order is kept in cache
+UPDATE_CACHE_SIZE = 100_000
 
 
 class OrderingRule:
     def __init__(self, orders: List[Tuple[int, int]]):
         self.orders = orders
+        # Index the rules once as a set of (before, after) pairs
+        self.__pairs: Set[Tuple[int, int]] = set(orders)
         if not self.check_all_orders():
             raise ValueError(
                 "Orders must contain all combinations of the number list without repetition"
             )
+        self.__init_sort()
+
+    def __init_sort(self) -> None:
+        self.__sort_key = functools.cmp_to_key(self.__compare)
+        self.__sorted_cached = memoize(maxsize=UPDATE_CACHE_SIZE)(self.__sort_update)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The sort key and the memoized sort are closures, which can't be
+        # pickled, so they are rebuilt when unpickling, with an empty cache
+        state = self.__dict__.copy()
+        del state["_OrderingRule__sort_key"]
+        del state["_OrderingRule__sorted_cached"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__init_sort()
 
     def check_all_orders(self) -> bool:
         # get all numbers from orders
-        number_list = []
-        for order in self.orders:
-            if order[0] not in number_list:
-                number_list.append(order[0])
-            if order[1] not in number_list:
-                number_list.append(order[1])
+        number_set = {num for order in self.orders for num in order}
         # Check if orders contains all combinations of the number list without repetition
-        return len(self.orders) == len(number_list) * (len(number_list) - 1) // 2
+        return len(self.orders) == len(number_set) * (len(number_set) - 1) // 2
 
-    def get_update_dict(self, update: List[int]) -> Dict[int, int]:
-        """Get the number of times a number should be after other numbers in the update"""
-        update_dict = {num: 0 for num in update}
-        for order in self.orders:
-            a, b = order
-            if a in update_dict and b in update_dict:
-                update_dict[b] += 1
-        return update_dict
+    def __compare(self, a: int, b: int) -> int:
+        if (a, b) in self.__pairs:
+            return -1
+        if (b, a) in self.__pairs:
+            return 1
+        return 0
+
+    def __sort_update(self, update: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(sorted(update, key=self.__sort_key))
 
     def check_update(self, update: List[int]) -> bool:
-        # find the number of times a number should be after other numbers in the update
-        update_dict = self.get_update_dict(update)
+        # every number must be allowed before the next one, which takes O(k)
         for i in range(len(update) - 1):
-            if update_dict[update[i]] > update_dict[update[i + 1]]:
+            if (update[i + 1], update[i]) in self.__pairs:
                 return False
         return True
 
+    @instrumented()
     def get_correct_update(self, update: List[int]) -> List[int]:
-        # find the number of times a number should be after other numbers in the update
-        update_dict = self.get_update_dict(update)
-        # sort the update by the number of times a number should be after other numbers
-        return sorted(update, key=lambda x: update_dict[x])
+        # sort the update comparing the pairs of numbers with the rule index, in
+        # O(k log k) whatever the number of rules, results being cached
+        return list(self.__sorted_cached(tuple(update)))
+
+
+class CycleError(ValueError):
+    """Raised when ordering rules contain a cycle, so no order can satisfy them."""
+
+    def __init__(self, cycle: List[int]) -> None:
+        self.cycle = cycle
+        super().__init__(
+            "Ordering rules contain a cycle: "
+            + " -> ".join(map(str, cycle + cycle[:1]))
+        )
+
+
+class PartialOrderingRule:
+    """
+    Ordering rules forming any directed acyclic graph of pages.
+
+    Unlike OrderingRule, rules don't have to order every pair of pages. The
+    transitive closure of the rules is computed once, each page storing the pages
+    it must precede as an integer bitset.
+    """
+
+    def __init__(self, orders: List[Tuple[int, int]]):
+        self.orders = orders
+        self.__index: Dict[int, int] = {}
+        for order in orders:
+            for page in order:
+                self.__index.setdefault(page, len(self.__index))
+        self.__pages = list(self.__index)
+
+        successors: List[Set[int]] = [set() for _ in self.__pages]
+        for before, after in orders:
+            successors[self.__index[before]].add(self.__index[after])
+
+        topological_order = self.__get_topological_order(successors)
+        self.__rank = {
+            self.__pages[node]: rank for rank, node in enumerate(topological_order)
+        }
+
+        # Bitset of the pages that must come after each page, built from the end
+        self.__reachable = [0] * len(self.__pages)
+        for node in reversed(topological_order):
+            reachable = 0
+            for successor in successors[node]:
+                reachable |= self.__reachable[successor] | (1 << successor)
+            self.__reachable[node] = reachable
+
+    def __get_topological_order(self, successors: List[Set[int]]) -> List[int]:
+        """Sort the pages with Kahn's algorithm, raising CycleError on a cycle."""
+        in_degrees = [0] * len(successors)
+        for node_successors in successors:
+            for successor in node_successors:
+                in_degrees[successor] += 1
+
+        queue = deque(node for node, degree in enumerate(in_degrees) if degree == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for successor in successors[node]:
+                in_degrees[successor] -= 1
+                if in_degrees[successor] == 0:
+                    queue.append(successor)
+
+        if len(order) < len(successors):
+            raise CycleError(self.__find_cycle(successors, in_degrees))
+        return order
+
+    def __find_cycle(
+        self, successors: List[Set[int]], in_degrees: List[int]
+    ) -> List[int]:
+        # Pages left by Kahn's algorithm all have a predecessor left as well, so
+        # walking back through them always ends up looping
+        remaining = {node for node, degree in enumerate(in_degrees) if degree > 0}
+        predecessors: Dict[int, int] = {}
+        for node in remaining:
+            for successor in successors[node]:
+                if successor in remaining:
+                    predecessors[successor] = node
+
+        path: Dict[int, int] = {}
+        node = next(iter(remaining))
+        while node not in path:
+            path[node] = len(path)
+            node = predecessors[node]
+        cycle = list(path)[path[node] :]
+        return [self.__pages[node] for node in reversed(cycle)]
+
+    def must_precede(self, before: int, after: int) -> bool:
+        """Check if the rules imply that a page must come before another one."""
+        if before not in self.__index or after not in self.__index:
+            return False
+        return bool(self.__reachable[self.__index[before]] >> self.__index[after] & 1)
+
+    def check_update(self, update: List[int]) -> bool:
+        # no page may have to precede a page seen before it
+        seen = 0
+        for page in update:
+            node = self.__index.get(page)
+            if node is None:
+                continue
+            if self.__reachable[node] & seen:
+                return False
+            seen |= 1 << node
+        return True
+
+    def get_correct_update(self, update: List[int]) -> List[int]:
+        # a topological order of all the pages, restricted to the update, is a
+        # topological order of the update; pages without rules are kept first
+        return sorted(update, key=lambda page: self.__rank.get(page, -1))
+
+
+Rules = Union[OrderingRule, PartialOrderingRule]
+
+
+class MiddlePageTotals(NamedTuple):
+    """Sums of the middle pages of the correct updates and of the fixed ones."""
+
+    correct: int
+    corrected: int
+
+
+def sum_middle_pages(ordering_rule: Rules, updates_block: str) -> MiddlePageTotals:
+    """
+    Sum the middle pages of some updates, the map function of map_reduce.
+
+    Args:
+        ordering_rule (Rules): The ordering rules
+        updates_block (str): Updates, one per line
+
+    Returns:
+        MiddlePageTotals: The sum of the middle pages of the correctly ordered
+        updates, and of the other updates once ordered
+    """
+    updates = parse_updates(updates_block)
+    return MiddlePageTotals(
+        get_correct_middle_sum(ordering_rule, updates),
+        get_corrected_middle_sum(ordering_rule, updates),
+    )
+
+
+# Ordering rule of the map_reduce workers, set once per worker
+_worker_rule: Optional[Rules] = None
+
+
+def _set_worker_rule(ordering_rule: Rules) -> None:
+    """Store the ordering rule in a worker, the initializer of map_reduce."""
+    global _worker_rule
+    _worker_rule = ordering_rule
+
+
+def sum_worker_middle_pages(updates_block: str) -> MiddlePageTotals:
+    """sum_middle_pages with the ordering rule set by _set_worker_rule."""
+    if _worker_rule is None:
+        raise RuntimeError("The ordering rule of the worker isn't set")
+    return sum_middle_pages(_worker_rule, updates_block)
+
+
+def get_correct_middle_sum(ordering_rule: Rules, updates: List[List[int]]) -> int:
+    total = 0
+    for update in updates:
+        if ordering_rule.check_update(update):
+            total += update[len(update) // 2]
+    return total
+
+
+def get_corrected_middle_sum(ordering_rule: Rules, updates: List[List[int]]) -> int:
+    total = 0
+    for update in updates:
+        if not ordering_rule.check_update(update):
+            correct_update = ordering_rule.get_correct_update(update)
+            total += correct_update[len(update) // 2]
+    return total
+
+
+# Range of the number of pages of generated inputs: the longest update has 23
+# pages, and pages are two-digit numbers
+MIN_GENERATED_PAGES = 23
+MAX_GENERATED_PAGES = 90
+
+
+def generate_input(size: int, seed: int = 0, page_count: Optional[int] = None) -> str:
+    """
+    Generate a valid puzzle input with size updates.
+
+    Like the puzzle inputs, every pair of pages has a rule, updates have an odd
+    number of distinct pages, and about half of them are correctly ordered.
+    Unless page_count is given, the number of pages grows with size as in the
+    puzzle inputs (49 pages for 200 updates), so that both the rules and the
+    updates scale, up to 90 pages.
+    """
+    if page_count is None:
+        page_count = min(
+            max(math.isqrt(12 * size), MIN_GENERATED_PAGES), MAX_GENERATED_PAGES
+        )
+    if not MIN_GENERATED_PAGES <= page_count <= MAX_GENERATED_PAGES:
+        raise ValueError(
+            f"page_count must be between {MIN_GENERATED_PAGES} "
+            f"and {MAX_GENERATED_PAGES}"
+        )
+    rng = random.Random(seed)
+    pages = rng.sample(range(10, 100), page_count)
+    rank = {page: i for i, page in enumerate(pages)}
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=rank.__getitem__)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + "\n".join(updates)
 
 
 class Solution(AOCSolution):
+    complexity = "O(r + u k log k)"
+
     def __init__(self) -> None:
         super().__init__(year=2024, day=5)
 
-    @timed_execution
-    def part1(self, input_data: str) -> int:
+    def parse(
+        self, input_data: str
+    ) -> Tuple[Rules, Union[List[List[int]], MiddlePageTotals]]:
+        """
+        Parse the input and build the ordering rule once for both parts.
+
+        Rules which don't order every pair of pages are handled as a partial order.
+        Large inputs are summed right away for both parts, across processes.
+        """
+        rules_block, updates_block = input_data.strip().split("\n\n")
+        rules = parse_rules(rules_block)
+        try:
+            ordering_rule: Rules = OrderingRule(rules)
+        except ValueError:
+            ordering_rule = PartialOrderingRule(rules)
+        if use_parallel(updates_block):
+            # The rule index is sent once per worker, not with every chunk
+            totals = map_reduce(
+                updates_block,
+                sum_worker_middle_pages,
+                add_tuples,
+                initializer=_set_worker_rule,
+                initargs=(ordering_rule,),
+            )
+            return ordering_rule, totals
+        return ordering_rule, parse_updates(updates_block)
+
+    def part1(
+        self, data: Tuple[Rules, Union[List[List[int]], MiddlePageTotals]]
+    ) -> int:
         """Solve part 1 of the puzzle."""
-        rules, updates = parse_input(input_data)
-        ordering_rule = OrderingRule(rules)
-        total = 0
-        for update in updates:
-            if ordering_rule.check_update(update):
-                total += update[len(update) // 2]
-        return total
-
-    @timed_execution
-    def part2(self, input_data: str) -> int:
+        ordering_rule, updates = data
+        if isinstance(updates, MiddlePageTotals):
+            return updates.correct
+        return get_correct_middle_sum(ordering_rule, updates)
+
+    def part2(
+        self, data: Tuple[Rules, Union[List[List[int]], MiddlePageTotals]]
+    ) -> int:
         """Solve part 2 of the puzzle."""
-        rules, updates = parse_input(input_data)
-        ordering_rule = OrderingRule(rules)
-        total = 0
-        for update in updates:
-            correct_update = ordering_rule.get_correct_update(update)
-            if update != correct_update:
-                total += correct_update[len(update) // 2]
-        return total
+        ordering_rule, updates = data
+        if isinstance(updates, MiddlePageTotals):
+            return updates.corrected
+        return get_corrected_middle_sum(ordering_rule, updates)
 
 
 if __name__ == "__main__":
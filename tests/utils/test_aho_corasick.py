@@ -0,0 +1,32 @@
+import pytest
+
+from advent_of_code.utils.aho_corasick import AhoCorasick, get_automaton
+
+
+def test_find_overlapping_patterns() -> None:
+    automaton = AhoCorasick(["he", "she", "his", "hers", "he"])
+    assert automaton.patterns == ("he", "she", "his", "hers")
+    matches = sorted(
+        (start, automaton.patterns[idx]) for start, idx in automaton.find("ushers")
+    )
+    assert matches == [(1, "she"), (2, "he"), (2, "hers")]
+
+
+def test_count_matches_find() -> None:
+    patterns = ["a", "aa", "aba", "b", "bab"]
+    texts = ["abababaa", "", "bbaab"]
+    automaton = AhoCorasick(patterns)
+    expected = [
+        sum(text[start:].startswith(pattern) for text in texts for start in range(9))
+        for pattern in patterns
+    ]
+    assert automaton.count(texts) == expected
+    assert sum(1 for text in texts for _ in automaton.find(text)) == sum(expected)
+
+
+def test_get_automaton_is_cached() -> None:
+    assert get_automaton(frozenset(["ab", "b"])) is get_automaton(
+        frozenset(["b", "ab"])
+    )
+    with pytest.raises(ValueError):
+        AhoCorasick(["ok", ""])
@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+
+from advent_of_code.utils.answer_cache import (
+    AnswerCache,
+    solve_cached,
+    source_fingerprint,
+)
+
+
+def test_solve_cached(tmp_path: Path) -> None:
+    cache = AnswerCache(tmp_path)
+    assert solve_cached(2024, 2, (1, 2), cache) == {1: (564, False), 2: (604, False)}
+    assert solve_cached(2024, 2, (1, 2), cache) == {1: (564, True), 2: (604, True)}
+    assert solve_cached(2024, 2, (2,), None) == {2: (604, False)}
+
+
+def test_keys(tmp_path: Path) -> None:
+    cache = AnswerCache(tmp_path)
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("1 2 3")
+    module = "advent_of_code.year2024.day02_solution"
+    key = cache.get_key(module, input_file, 1)
+    assert key == cache.get_key(module, input_file, 1)
+    assert key != cache.get_key(module, input_file, 2)
+    assert key != cache.get_key("advent_of_code.year2024.day01_solution", input_file, 1)
+    input_file.write_text("1 2 4")
+    assert key != cache.get_key(module, input_file, 1)
+
+    # Solutions depend on the utils modules they import
+    assert source_fingerprint(module) != source_fingerprint(
+        "advent_of_code.utils.template"
+    )
+
+
+def test_eviction(tmp_path: Path) -> None:
+    cache = AnswerCache(tmp_path, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Make "a" the most recently used entry
+    os.utime(tmp_path / "b.json", ns=(0, 0))
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    # Answers that can't be stored as JSON are not cached
+    cache.put("d", object())
+    assert cache.get("d") is None
@@ -0,0 +1,33 @@
+from typing import List
+
+import pytest
+
+from advent_of_code.cli import bench
+from advent_of_code.utils.bench import TimingStats, benchmark
+from advent_of_code.year2024.day01_solution import Solution
+
+
+def test_timing_stats() -> None:
+    stats = TimingStats(list(range(1, 21)))
+    assert stats.min == 1
+    assert stats.median == 10.5
+    assert stats.p95 == 19
+    assert TimingStats([5]).stddev == 0.0
+
+
+def test_benchmark() -> None:
+    result = benchmark(Solution(), repeat=3, warmup=1, input_data="1 2\n2 3\n3 4")
+    assert len(result.parse.samples) == 3
+    assert sorted(result.parts) == [1, 2]
+    assert result.answers == {1: 3, 2: 5}
+    assert result.to_dict()["parts"]["1"]["answer"] == 3
+
+
+@pytest.mark.parametrize(
+    "option",
+    [["--repeat", "0"], ["--repeat", "-2"], ["--warmup", "-1"], ["--warmup", "x"]],
+)
+def test_invalid_bench_rounds(option: List[str]) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        bench(["--year", "2024", "--day", "1", *option])
+    assert excinfo.value.code == 2
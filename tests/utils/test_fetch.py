@@ -0,0 +1,133 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from advent_of_code.utils.fetch import InputFetcher
+
+ETAG = '"v1"'
+
+
+class FakeAOCHandler(BaseHTTPRequestHandler):
+    # Number of requests to fail with 503 before answering
+    failures = 0
+    requests: List[str] = []
+
+    def do_GET(self) -> None:
+        type(self).requests.append(self.path)
+        if type(self).failures > 0:
+            type(self).failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"input of {self.path}\n".encode()
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    FakeAOCHandler.failures = 0
+    FakeAOCHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAOCHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(url: str, tmp_path: Path) -> InputFetcher:
+    return InputFetcher(
+        session_cookie="test",
+        base_url=url,
+        inputs_dir=tmp_path,
+        min_interval=0,
+        backoff=0,
+    )
+
+
+def test_fetch_then_revalidate(server_url: str, tmp_path: Path) -> None:
+    fetcher = make_fetcher(server_url, tmp_path)
+    results = fetcher.fetch_all(2024, [2, 1])
+    assert [(result.day, result.status) for result in results] == [
+        (2, "downloaded"),
+        (1, "downloaded"),
+    ]
+    input_file = tmp_path / "year2024" / "day01_input.txt"
+    assert input_file.read_text() == "input of /2024/day/1/input"
+
+    # Known inputs are only revalidated, and left untouched
+    assert fetcher.fetch(2024, 1).status == "not-modified"
+    assert input_file.read_text() == "input of /2024/day/1/input"
+    assert fetcher.fetch(2024, 1, force=True).status == "downloaded"
+    # No temporary file is left behind
+    assert sorted(path.name for path in input_file.parent.iterdir()) == [
+        ".day01_input.txt.json",
+        ".day02_input.txt.json",
+        "day01_input.txt",
+        "day02_input.txt",
+    ]
+
+
+def test_fetch_retries(server_url: str, tmp_path: Path) -> None:
+    FakeAOCHandler.failures = 2
+    fetcher = make_fetcher(server_url, tmp_path)
+    assert fetcher.fetch(2024, 3).status == "downloaded"
+    assert len(FakeAOCHandler.requests) == 3
+
+
+def test_fetch_errors_are_reported(server_url: str, tmp_path: Path) -> None:
+    FakeAOCHandler.failures = 10
+    fetcher = make_fetcher(server_url, tmp_path)
+    (result,) = fetcher.fetch_all(2024, [4])
+    assert result.status == "error"
+    assert not result.path.exists()
+
+
+def test_existing_inputs_are_not_downloaded(server_url: str, tmp_path: Path) -> None:
+    input_file = tmp_path / "year2024" / "day05_input.txt"
+    input_file.parent.mkdir()
+    input_file.write_text("manual")
+    fetcher = make_fetcher(server_url, tmp_path)
+    assert fetcher.fetch(2024, 5).status == "cached"
+    assert FakeAOCHandler.requests == []
+
+
+def test_corrupt_metadata_keeps_the_input(server_url: str, tmp_path: Path) -> None:
+    input_file = tmp_path / "year2024" / "day05_input.txt"
+    input_file.parent.mkdir()
+    input_file.write_text("manual")
+    (input_file.parent / ".day05_input.txt.json").write_text("{not json")
+    fetcher = make_fetcher(server_url, tmp_path)
+    assert fetcher.fetch(2024, 5).status == "cached"
+    assert input_file.read_text() == "manual"
+
+
+def test_fetch_command_without_session(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    from advent_of_code.cli import fetch
+
+    monkeypatch.delenv("AOC_SESSION", raising=False)
+    monkeypatch.setenv("AOC_INPUTS_DIR", str(tmp_path))
+    # No .env file to load the session from
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as excinfo:
+        fetch(["--year", "2024", "--days", "1"])
+    assert excinfo.value.code == 1
+    output = capsys.readouterr().out
+    assert output.startswith("Year 2024, Day 1: error:")
+    assert "session cookie" in output
@@ -0,0 +1,30 @@
+from advent_of_code.utils import instrumentation
+from advent_of_code.utils.common import timed_execution
+
+
+@timed_execution
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def test_disabled_spans_are_not_recorded() -> None:
+    assert instrumentation.get_collector() is None
+    with instrumentation.span("ignored"):
+        assert add(1, 2) == 3
+
+
+def test_nested_spans() -> None:
+    collector = instrumentation.enable()
+    try:
+        with instrumentation.span("part1"):
+            add(1, 2)
+            add(3, 4)
+    finally:
+        instrumentation.disable()
+
+    assert list(collector.spans) == ["part1", "part1/add"]
+    assert collector.spans["part1/add"].count == 2
+    assert collector.to_dict()["part1"]["count"] == 1
+    metrics = collector.to_openmetrics()
+    assert 'aoc_span_seconds_count{span="part1/add"} 2' in metrics
+    assert metrics.endswith("# EOF\n")
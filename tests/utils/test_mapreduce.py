@@ -0,0 +1,99 @@
+import functools
+import operator
+import pickle
+from types import ModuleType
+
+import pytest
+
+from advent_of_code.utils.mapreduce import add_tuples, map_reduce, split_line_chunks
+from advent_of_code.utils.registry import get_registry
+from advent_of_code.year2024.day05_solution import OrderingRule, parse_input
+
+
+def count_lines(text: str) -> tuple:
+    lines = text.split("\n")
+    return len(lines), sum(map(int, lines))
+
+
+def test_split_line_chunks() -> None:
+    data = b"1\n22\n333\n4444"
+    chunks = split_line_chunks(data, 3)
+    assert b"".join(data[start:end] for start, end in chunks) == data
+    assert all(data[end - 1 : end] == b"\n" for _, end in chunks[:-1])
+    # Less chunks than asked when there are not enough lines
+    assert split_line_chunks(b"1\n2", 10) == [(0, 2), (2, 3)]
+    assert split_line_chunks(b"", 4) == []
+    with pytest.raises(ValueError):
+        split_line_chunks(data, 0)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_map_reduce(workers: int) -> None:
+    data = "\n".join(map(str, range(10_000)))
+    assert map_reduce(data, count_lines, add_tuples, workers, chunk_count=7) == (
+        10_000,
+        sum(range(10_000)),
+    )
+
+
+# Number of times a SharedTable was pickled in this process
+pickle_count = 0
+# Table set by the map_reduce initializer
+worker_table: dict = {}
+
+
+class SharedTable(dict):
+    def __reduce__(self) -> tuple:
+        global pickle_count
+        pickle_count += 1
+        return SharedTable, (dict(self),)
+
+
+def set_worker_table(table: SharedTable) -> None:
+    worker_table.clear()
+    worker_table.update(table)
+
+
+def sum_table_values(text: str) -> int:
+    return sum(worker_table[line] for line in text.split("\n"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_reduce_initializer(workers: int) -> None:
+    global pickle_count
+    pickle_count = 0
+    table = SharedTable((str(num), num * num) for num in range(100))
+    data = "\n".join(str(num % 100) for num in range(10_000))
+    total = map_reduce(
+        data,
+        sum_table_values,
+        operator.add,
+        workers,
+        chunk_count=20,
+        initializer=set_worker_table,
+        initargs=(table,),
+    )
+    assert total == 100 * sum(num * num for num in range(100))
+    # Sent at most once per worker, instead of with each of the 20 chunks
+    assert pickle_count <= workers
+
+
+def test_ordering_rule_is_picklable() -> None:
+    solution = get_registry().load(2024, 5)
+    rules, updates = parse_input(solution.read_input())
+    ordering_rule = pickle.loads(pickle.dumps(OrderingRule(rules)))
+    assert ordering_rule.get_correct_update(updates[0]) == OrderingRule(
+        rules
+    ).get_correct_update(updates[0])
+
+
+@pytest.mark.parametrize("day", [1, 2, 5])
+def test_parallel_solutions(day: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    module: ModuleType = get_registry().load_module(2024, day)
+    input_data = module.generate_input(2000, seed=day)
+    expected = [module.Solution().run_part(part, input_data) for part in (1, 2)]
+
+    monkeypatch.setattr(module, "use_parallel", lambda data: True)
+    monkeypatch.setattr(module, "map_reduce", functools.partial(map_reduce, workers=2))
+    solution = module.Solution()
+    assert [solution.run_part(part, input_data) for part in (1, 2)] == expected
@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from advent_of_code.utils.common import memoize
+
+
+def test_memoize_bare() -> None:
+    calls: List[int] = []
+
+    @memoize
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert calls == [3]
+    assert square.cache_info().hits == 1
+
+
+def test_memoize_kwargs_and_lru_eviction() -> None:
+    @memoize(maxsize=2)
+    def add(a: int, b: int = 0) -> int:
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert add(1, b=3) == 4
+    add(1, b=2)  # Refresh (1, b=2), (1, b=3) is now the least recently used
+    add(2)
+    info = add.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 3, 1, 2)
+    add(1, b=2)
+    assert add.cache_info().hits == 2
+
+    add.cache_clear()
+    assert add.cache_info().currsize == 0
+
+
+def test_memoize_custom_key() -> None:
+    @memoize(key=lambda items: tuple(sorted(items)))
+    def total(items: List[int]) -> int:
+        return sum(items)
+
+    assert total([1, 2]) == 3
+    assert total([2, 1]) == 3
+    assert total.cache_info().hits == 1
+
+
+def test_memoize_persist(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.pickle"
+
+    def double(x: int) -> int:
+        return 2 * x
+
+    first = memoize(persist=cache_file)(double)
+    first(21)
+    first.cache_save()
+
+    second = memoize(persist=cache_file)(double)
+    assert second.cache_info().currsize == 1
+    assert second(21) == 42
+    assert second.cache_info().hits == 1
+
+
+FINGERPRINTED_MODULE = """
+def squares(items):
+    return [x * x for x in items if x in {"a", "b", "c"}] + list(map(lambda x: x, items))
+"""
+
+
+def test_code_fingerprint_is_stable_across_processes(tmp_path: Path) -> None:
+    (tmp_path / "fingerprinted.py").write_text(FINGERPRINTED_MODULE)
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import fingerprinted; "
+        "from advent_of_code.utils.common import _code_fingerprint; "
+        "print(_code_fingerprint(fingerprinted.squares))"
+    )
+    fingerprints = set()
+    for seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(tmp_path)],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        fingerprints.add(result.stdout.strip())
+    assert len(fingerprints) == 1
+
+
+def test_memoize_persist_trims_and_ignores_broken_caches(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.pickle"
+
+    def double(x: int) -> int:
+        return 2 * x
+
+    first = memoize(persist=cache_file)(double)
+    for x in range(5):
+        first(x)
+    first.cache_save()
+    assert memoize(maxsize=2, persist=cache_file)(double).cache_info().currsize == 2
+
+    cache_file.write_bytes(b"\x80\x04\x95garbage")
+    assert memoize(persist=cache_file)(double).cache_info().currsize == 0
+
+
+def test_memoize_persist_keeps_keyword_arguments(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.pickle"
+
+    def scale(x: int, factor: int = 1) -> int:
+        return x * factor
+
+    first = memoize(persist=cache_file)(scale)
+    assert first(3, factor=2) == 6
+    first.cache_save()
+    assert not list(tmp_path.glob(".cache.pickle.*"))
+
+    second = memoize(persist=cache_file)(scale)
+    assert second(3, factor=2) == 6
+    info = second.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 0, 1)
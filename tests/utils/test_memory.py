@@ -0,0 +1,55 @@
+import pytest
+
+from advent_of_code.utils.bench import benchmark
+from advent_of_code.utils.memory import (
+    MemoryBudgetExceeded,
+    format_size,
+    parse_size,
+    solve_tracking_memory,
+    track_memory,
+)
+from advent_of_code.utils.registry import load_solution
+
+
+def test_parse_size() -> None:
+    assert parse_size("1048576") == 1 << 20
+    assert parse_size("512K") == 512 << 10
+    assert parse_size("1.5GiB") == 3 << 29
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_format_size() -> None:
+    assert format_size(512) == "512 B"
+    assert format_size(3 << 19) == "1.5 MiB"
+    assert format_size(None) == "n/a"
+
+
+def test_track_memory() -> None:
+    with track_memory() as usage:
+        data = [0] * 100_000
+    assert usage.traced_peak >= 8 * len(data)
+
+    with track_memory() as usage:
+        pass
+    assert usage.traced_peak < 1024
+
+
+def test_solve_tracking_memory() -> None:
+    solution = load_solution(2024, 1)
+    input_data = solution.read_input()
+    answers, usages = solve_tracking_memory(solution, input_data)
+    assert answers == {1: 3569916, 2: 26407426}
+    assert list(usages) == ["parse", "part1", "part2"]
+    assert usages["parse"].traced_peak > 0
+
+    with pytest.raises(MemoryBudgetExceeded) as excinfo:
+        solve_tracking_memory(load_solution(2024, 1), input_data, budget=1024)
+    assert excinfo.value.step == "parse"
+
+
+def test_bench_memory() -> None:
+    result = benchmark(load_solution(2024, 3), repeat=1, warmup=0, measure_memory=True)
+    assert result.memory is not None
+    assert set(result.memory) == {"parse", "part1", "part2"}
+    assert "memory" in result.to_dict()
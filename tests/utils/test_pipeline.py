@@ -0,0 +1,124 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from advent_of_code.cli import main
+from advent_of_code.utils import pipeline
+from advent_of_code.utils.fetch import FetchResult, InputFetcher
+from advent_of_code.utils.pipeline import DayResult, run_pipeline
+from advent_of_code.utils.registry import get_registry, load_solution
+from advent_of_code.utils.runner import Job, JobResult
+
+YEAR = 2024
+# Seconds taken to download the input of day 1
+SLOW_DOWNLOAD = 1.0
+
+
+class SlowAOCHandler(BaseHTTPRequestHandler):
+    """Serve generated inputs, day 1 being slow to download."""
+
+    def do_GET(self) -> None:
+        day = int(self.path.split("/")[3])
+        if day == 3:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if day == 1:
+            time.sleep(SLOW_DOWNLOAD)
+        body = generated_input(day).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def generated_input(day: int) -> str:
+    return get_registry().load_module(YEAR, day).generate_input(200, seed=1)
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowAOCHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_run_pipeline(server_url: str, tmp_path: Path) -> None:
+    fetcher = InputFetcher(
+        session_cookie="test",
+        base_url=server_url,
+        inputs_dir=tmp_path,
+        min_interval=0,
+        retries=0,
+    )
+    # An input already saved is used without being downloaded again
+    saved_input = tmp_path / f"year{YEAR}" / "day04_input.txt"
+    saved_input.parent.mkdir(parents=True)
+    saved_input.write_text(generated_input(4))
+
+    streamed = []
+    results = run_pipeline(
+        YEAR, [4, 2, 1, 3], fetcher, workers=2, on_result=streamed.append
+    )
+    fetcher.close()
+    assert streamed == results
+    assert [result.day for result in results] == [1, 2, 3, 4]
+    assert [result.fetch.status for result in results] == [
+        "downloaded",
+        "downloaded",
+        "error",
+        "cached",
+    ]
+
+    # The saved input is solved while the slow download is still in progress
+    assert results[3].solved_at < results[0].fetched_at
+
+    for result in results:
+        if result.day == 3:
+            assert not result.ok and result.parts == []
+            continue
+        assert result.ok
+        solution = load_solution(YEAR, result.day)
+        input_data = generated_input(result.day)
+        assert [part.answer for part in result.parts] == [
+            solution.run_part(1, input_data),
+            solution.run_part(2, input_data),
+        ]
+
+
+def test_run_pipeline_without_session(
+    server_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("AOC_SESSION", raising=False)
+    monkeypatch.chdir(tmp_path)
+    fetcher = InputFetcher(base_url=server_url, inputs_dir=tmp_path, min_interval=0)
+    (result,) = run_pipeline(YEAR, [2], fetcher, workers=1)
+    fetcher.close()
+    assert result.fetch.status == "error"
+    assert result.fetch.error is not None and "session cookie" in result.fetch.error
+
+
+def test_failing_parts_of_the_pipeline_exit_non_zero(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def run_pipeline_failing(year: int, days: List[int], **kwargs: Any) -> list:
+        fetched = FetchResult(year, 1, tmp_path / "day01_input.txt", "downloaded")
+        parts = [JobResult(Job(year, 1, 1), 1), JobResult(Job(year, 1, 2), error="E")]
+        return [DayResult(year, 1, fetched, parts)]
+
+    # Missing inputs are run by the pipeline
+    monkeypatch.setenv("AOC_INPUTS_DIR", str(tmp_path))
+    monkeypatch.setattr(pipeline, "run_pipeline", run_pipeline_failing)
+    with pytest.raises(SystemExit) as error:
+        main(["--year", str(YEAR), "--days", "1", "--no-cache"])
+    assert error.value.code == 1
@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from advent_of_code.cli import profile
+from advent_of_code.utils.profiling import profile_cpu, profile_memory
+
+
+def busy_inner(duration: float) -> int:
+    end = time.perf_counter() + duration
+    count = 0
+    while time.perf_counter() < end:
+        count += 1
+    return count
+
+
+def busy_outer(duration: float) -> int:
+    return busy_inner(duration) + 1
+
+
+def allocate(size: int) -> List[int]:
+    return list(range(size))
+
+
+def test_profile_cpu() -> None:
+    profile = profile_cpu(busy_outer, 0.1)
+    assert profile.answer > 1
+    assert "busy_inner" in profile.format_stats(top=5)
+
+    # Stacks are sampled from the profiled function down
+    samples = {}
+    for line in profile.stacks.to_collapsed().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        samples[stack] = int(count)
+    assert samples["test_profiling:busy_outer;test_profiling:busy_inner"] > 0
+
+
+def test_profile_memory() -> None:
+    profile = profile_memory(allocate, 100_000, top=3)
+    assert len(profile.answer) == 100_000
+    assert profile.peak > 100_000 * 8
+    assert "test_profiling.py" in profile.sites[0].location
+    assert "Peak traced memory" in profile.format_report()
+
+
+def test_profile_command_without_input(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.delenv("AOC_SESSION", raising=False)
+    monkeypatch.setenv("AOC_INPUTS_DIR", str(tmp_path))
+    # No .env file to load the session from
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit) as excinfo:
+        profile(["--year", "2024", "--day", "1"])
+    assert excinfo.value.code == 1
+    assert capsys.readouterr().out.startswith("Error reading the input:")
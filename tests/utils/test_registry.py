@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from advent_of_code.utils.registry import (
+    SolutionNotFoundError,
+    SolutionRegistry,
+    get_registry,
+)
+
+SOLUTION = """
+class Solution(AOCSolution):
+    complexity = "O(n)"
+
+    def parse(self, input_data):
+        return input_data
+
+    def part1(self, input_data):
+        return 0
+"""
+
+
+def make_package(root: Path) -> None:
+    year_dir = root / "year2015"
+    year_dir.mkdir(parents=True)
+    (year_dir / "day02_solution.py").write_text(SOLUTION)
+    (year_dir / "day01_solution.py").write_text(SOLUTION.replace("parse", "other"))
+    (year_dir / "dummy_solution.py").write_text(SOLUTION)
+    (root / "utils").mkdir()
+
+
+def test_registry_scan(tmp_path: Path) -> None:
+    make_package(tmp_path / "pkg")
+    registry = SolutionRegistry(tmp_path / "pkg", tmp_path / "registry.json")
+    assert registry.years() == [2015]
+    assert registry.days(2015) == [1, 2]
+    assert registry.days(2016) == []
+
+    info = registry.get(2015, 2)
+    assert info.module == "advent_of_code.year2015.day02_solution"
+    assert info.parts == (1,)
+    assert info.has_parser
+    assert info.complexity == "O(n)"
+    assert not registry.get(2015, 1).has_parser
+    with pytest.raises(SolutionNotFoundError):
+        registry.get(2015, 3)
+
+
+def test_registry_manifest_is_refreshed(tmp_path: Path) -> None:
+    root = tmp_path / "pkg"
+    make_package(root)
+    manifest = tmp_path / "registry.json"
+    SolutionRegistry(root, manifest)
+    assert manifest.exists()
+
+    # Reloaded from the manifest while nothing changes
+    assert SolutionRegistry(root, manifest).days(2015) == [1, 2]
+
+    (root / "year2015" / "day03_solution.py").write_text(SOLUTION)
+    assert SolutionRegistry(root, manifest).days(2015) == [1, 2, 3]
+    (root / "year2015" / "day01_solution.py").unlink()
+    assert SolutionRegistry(root, manifest).days(2015) == [2, 3]
+
+
+def test_registry_rescans_edited_solutions(tmp_path: Path) -> None:
+    root = tmp_path / "pkg"
+    make_package(root)
+    manifest = tmp_path / "registry.json"
+    SolutionRegistry(root, manifest)
+
+    # Editing a file in place doesn't change the mtime of its directory
+    year_dir = root / "year2015"
+    dir_mtime = year_dir.stat().st_mtime_ns
+    path = year_dir / "day02_solution.py"
+    path.write_text(SOLUTION.replace("O(n)", "O(n log n)"))
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+    os.utime(year_dir, ns=(dir_mtime, dir_mtime))
+
+    assert SolutionRegistry(root, manifest).get(2015, 2).complexity == "O(n log n)"
+    # The rescanned metadata is saved to the manifest
+    assert "O(n log n)" in manifest.read_text()
+
+
+def test_package_registry() -> None:
+    registry = get_registry()
+    assert registry.days(2024)[:5] == [1, 2, 3, 4, 5]
+    solution = registry.load(2024, 1)
+    assert (solution.year, solution.day) == (2024, 1)
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from advent_of_code.cli import main, parse_day_spec, parse_positive_int
+from advent_of_code.utils import runner
+from advent_of_code.utils.common import get_cache_dir
+from advent_of_code.utils.runner import (
+    Job,
+    JobResult,
+    TimingHistory,
+    run_jobs,
+    schedule,
+)
+
+
+def test_parse_day_spec() -> None:
+    assert parse_day_spec("1-3") == [1, 2, 3]
+    assert parse_day_spec("5,1-2,2") == [1, 2, 5]
+    with pytest.raises(Exception):
+        parse_day_spec("0-26")
+
+
+def test_parse_positive_int() -> None:
+    assert parse_positive_int("3") == 3
+    for spec in ("0", "-1", "two"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_positive_int(spec)
+
+
+@pytest.mark.parametrize("argv", [["--days", "1-3"], ["--year", "2024", "-j", "0"]])
+def test_invalid_run_arguments(argv: list) -> None:
+    with pytest.raises(SystemExit) as error:
+        main(argv)
+    assert error.value.code == 2
+
+
+def test_cache_dir_is_outside_the_package(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("AOC_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert get_cache_dir() == tmp_path / "xdg" / "advent_of_code"
+    monkeypatch.setenv("AOC_CACHE_DIR", str(tmp_path / "aoc"))
+    assert get_cache_dir() == tmp_path / "aoc"
+    assert get_cache_dir().is_dir()
+
+
+def test_schedule_longest_first(tmp_path: Path) -> None:
+    history_file = tmp_path / "timings.json"
+    history_file.write_text(json.dumps({"2024-01-1": 0.1, "2024-02-1": 2.0}))
+    history = TimingHistory(history_file)
+    jobs = [Job(2024, 1, 1), Job(2024, 2, 1), Job(2024, 3, 1)]
+    # Unknown jobs are scheduled first
+    assert schedule(jobs, history) == [
+        Job(2024, 3, 1),
+        Job(2024, 2, 1),
+        Job(2024, 1, 1),
+    ]
+
+
+def test_run_jobs_deterministic_order(tmp_path: Path) -> None:
+    history = TimingHistory(tmp_path / "timings.json")
+    jobs = [Job(2024, 3, 2), Job(2024, 1, 1), Job(2024, 3, 1)]
+    results = list(run_jobs(jobs, workers=2, history=history))
+    assert [result.job for result in results] == sorted(jobs)
+    assert all(result.error is None for result in results)
+    assert (tmp_path / "timings.json").exists()
+
+
+def crash_worker(job: Job, *args: Any) -> JobResult:
+    if job.part == 2:
+        os._exit(1)
+    time.sleep(0.5)
+    return JobResult(job, 0)
+
+
+def test_run_jobs_reports_a_broken_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(runner, "execute_job", crash_worker)
+    jobs = [Job(2024, 1, 1), Job(2024, 1, 2), Job(2024, 2, 2)]
+    results = list(run_jobs(jobs, 2, TimingHistory(tmp_path / "timings.json")))
+    assert [result.job for result in results] == sorted(jobs)
+    assert any(
+        result.error and result.error.startswith("BrokenProcessPool")
+        for result in results
+    )
+    assert (tmp_path / "timings.json").exists()
+
+
+def test_failing_parts_exit_non_zero(monkeypatch: pytest.MonkeyPatch) -> None:
+    def run_jobs_failing(jobs: List[Job], *args: Any) -> Iterator[JobResult]:
+        for job in jobs:
+            yield JobResult(job, error="ValueError: oops" if job.part == 2 else None)
+
+    monkeypatch.setattr(runner, "run_jobs", run_jobs_failing)
+    with pytest.raises(SystemExit) as error:
+        main(["--year", "2024", "--days", "1", "--no-cache"])
+    assert error.value.code == 1
@@ -0,0 +1,46 @@
+import pytest
+
+from advent_of_code.utils.registry import get_registry
+from advent_of_code.utils.scaling import (
+    fit_exponent,
+    format_scaling_report,
+    measure_scaling,
+    parse_sizes,
+)
+
+
+def test_parse_sizes() -> None:
+    assert parse_sizes("1e4,1e3,1000") == [1000, 10_000]
+    with pytest.raises(ValueError):
+        parse_sizes("1.5")
+
+
+def test_fit_exponent() -> None:
+    sizes = [10, 100, 1000]
+    assert fit_exponent(sizes, [size * 1e-6 for size in sizes]) == pytest.approx(1)
+    assert fit_exponent(sizes, [size**2 * 1e-9 for size in sizes]) == pytest.approx(2)
+    with pytest.raises(ValueError):
+        fit_exponent([10, 10], [1, 2])
+
+
+@pytest.mark.parametrize("day", [1, 2, 3, 4, 5])
+def test_generators(day: int) -> None:
+    registry = get_registry()
+    assert registry.get(2024, day).has_generator
+    module = registry.load_module(2024, day)
+    input_data = module.generate_input(300, seed=3)
+    assert input_data == module.generate_input(300, seed=3)
+    assert input_data != module.generate_input(300, seed=4)
+
+    solution = module.Solution()
+    assert solution.run_part(1, input_data) > 0
+    assert solution.run_part(2, input_data) > 0
+
+
+def test_measure_scaling() -> None:
+    module = get_registry().load_module(2024, 2)
+    report = measure_scaling(module.Solution, module.generate_input, [100, 1000])
+    assert list(report.timings) == ["parse", "part1", "part2"]
+    assert all(len(times) == 2 for times in report.timings.values())
+    assert set(report.exponents) == set(report.timings)
+    assert "part2" in format_scaling_report(report)
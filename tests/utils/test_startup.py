@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+from advent_of_code.utils.registry import get_registry
+from advent_of_code.utils.startup import parse_importtime
+
+
+def test_parse_importtime() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     json.scanner\n"
+        "import time:       300 |        420 |   json\n"
+        "import time:        50 |        470 | advent_of_code\n"
+    )
+    timings = parse_importtime(output)
+    assert [(timing.module, timing.depth) for timing in timings] == [
+        ("json.scanner", 2),
+        ("json", 1),
+        ("advent_of_code", 0),
+    ]
+    assert timings[1].self_us == 300
+    assert timings[1].cumulative_us == 420
+
+
+# Modules too slow to import for runs that don't need them
+HEAVY_MODULES = ("requests", "dotenv", "numpy")
+
+
+def get_imported(code: str) -> List[str]:
+    """Get the heavy modules imported by a fresh interpreter running code."""
+    code += (
+        "; import sys; "
+        f"print(*(m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr)"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return process.stderr.split()
+
+
+@pytest.mark.parametrize("day", get_registry().days(2024))
+def test_solutions_do_not_import_heavy_modules(day: int) -> None:
+    module = get_registry().get(2024, day).module
+    assert get_imported(f"import advent_of_code.cli, {module}") == []
+
+
+def test_cli_startup_does_not_import_heavy_modules() -> None:
+    code = (
+        "import sys; sys.argv = ['aoc', '--year', '2024']; "
+        "from advent_of_code.cli import main; main()"
+    )
+    assert get_imported(code) == []
@@ -0,0 +1,34 @@
+import pytest
+
+from advent_of_code.year2024.day01_solution import Solution as Day01Solution
+from advent_of_code.year2024.day03_solution import Solution as Day03Solution
+
+
+def test_input_access() -> None:
+    solution = Day01Solution()
+    raw_input = solution.input_path().read_bytes()
+    assert bytes(solution.input_bytes()) == raw_input
+    assert list(solution.iter_lines()) == raw_input.decode().splitlines()
+    assert solution.input_text() == raw_input.decode().strip()
+
+
+def test_solve_from_memory_mapped_input() -> None:
+    solution = Day03Solution()
+    assert isinstance(solution.read_input(), memoryview)
+    input_text = solution.input_text()
+    assert solution.solve() == (
+        solution.run_part(1, input_text),
+        solution.run_part(2, input_text),
+    )
+
+
+def test_memory_mapped_input_is_parsed_once_and_closed() -> None:
+    with Day03Solution() as solution:
+        view = solution.input_bytes()
+        parsed = solution.get_parsed(view)
+        # A new view of the same mapped file reuses the parsed input
+        assert solution.get_parsed(solution.input_bytes()) is parsed
+    # Closing releases the views and unmaps the file
+    with pytest.raises(ValueError):
+        bytes(view)
+    solution.close()
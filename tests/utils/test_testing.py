@@ -0,0 +1,87 @@
+import json
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from advent_of_code.utils import testing
+
+
+def test_run_test_jobs_in_order() -> None:
+    jobs = testing.collect_test_jobs(2024, [3, 1])
+    assert [job.day for job in jobs] == [3, 3, 1]
+    results = list(testing.run_test_jobs(jobs, workers=2))
+    assert [result.job for result in results] == sorted(jobs)
+    assert all(result.passed for result in results)
+
+
+def test_time_limit() -> None:
+    with pytest.raises(testing.CaseTimeout):
+        with testing.time_limit(0.05):
+            time.sleep(1)
+    # The alarm is cancelled when leaving the block
+    with testing.time_limit(0.05):
+        pass
+    time.sleep(0.1)
+
+
+def test_unknown_solution_is_an_error() -> None:
+    result = testing.execute_test_case(testing.TestJob(1999, 1, 0))
+    assert not result.passed
+    assert result.error.startswith("SolutionNotFoundError")
+
+
+def test_reports(tmp_path: Path) -> None:
+    job = testing.TestJob(2024, 1, 0)
+    results = [
+        testing.CaseResult(
+            job,
+            parts=[
+                testing.PartResult(1, expected=11, answer=11),
+                testing.PartResult(2, expected=31, answer=30),
+            ],
+        ),
+        testing.CaseResult(
+            testing.TestJob(2024, 2, 0),
+            parts=[testing.PartResult(1, expected=2, error="CaseTimeout: timed out")],
+        ),
+    ]
+
+    testing.write_junit_report(results, tmp_path / "junit.xml")
+    suites = ET.parse(tmp_path / "junit.xml").getroot()
+    assert [suite.get("name") for suite in suites] == [
+        "advent_of_code.year2024.day01",
+        "advent_of_code.year2024.day02",
+    ]
+    assert suites[0].get("failures") == "1"
+    assert suites[0][1].find("failure") is not None
+    assert suites[1].get("errors") == "1"
+
+    testing.write_json_report(results, tmp_path / "report.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert report["tests"] == 2
+    assert report["failures"] == 2
+    assert report["results"][0]["parts"][0]["passed"]
+
+
+def test_failed_case_hides_its_parts() -> None:
+    result = testing.CaseResult(
+        testing.TestJob(2024, 1, 0),
+        parts=[testing.PartResult(1, expected=11), testing.PartResult(2, expected=31)],
+        error="MemoryBudgetExceeded: parse allocated 2.0 MiB",
+    )
+    lines = testing.format_case_result(result).splitlines()
+    assert (
+        lines[1] == "✗ failed with error: MemoryBudgetExceeded: parse allocated 2.0 MiB"
+    )
+    assert not any("Part" in line for line in lines)
+
+
+@pytest.mark.parametrize("timeout", ["0", "-1", "nan", "soon"])
+def test_invalid_timeout(timeout: str) -> None:
+    from advent_of_code.cli import test
+
+    with pytest.raises(SystemExit) as excinfo:
+        test(["--all", "--timeout", timeout])
+    assert excinfo.value.code == 2
@@ -0,0 +1,38 @@
+import pytest
+
+from advent_of_code.utils.common import convert_to_int_matrix
+
+np = pytest.importorskip("numpy")
+
+from advent_of_code.utils.vectorized import (  # noqa: E402
+    RaggedIntArray,
+    convert_to_int_array,
+)
+
+
+def test_rectangular_input() -> None:
+    data = "3   4\n4   3\n-2   5"
+    array = convert_to_int_array(data)
+    assert isinstance(array, np.ndarray)
+    assert array.shape == (3, 2)
+    assert array.tolist() == convert_to_int_matrix(data)
+
+
+def test_ragged_input() -> None:
+    data = "7 6 4 2 1\n1 2\n\n9"
+    ragged = convert_to_int_array(data)
+    assert isinstance(ragged, RaggedIntArray)
+    assert ragged.lengths.tolist() == [5, 2, 0, 1]
+    assert ragged.to_list() == convert_to_int_matrix(data)
+    assert ragged[1].tolist() == [1, 2]
+
+
+def test_forced_ragged_and_from_rows() -> None:
+    ragged = convert_to_int_array("1 2\n3 4", ragged=True)
+    assert ragged.offsets.tolist() == [0, 2, 4]
+    assert RaggedIntArray.from_rows([[1, 2], [3, 4]]).to_list() == ragged.to_list()
+
+
+def test_invalid_input() -> None:
+    with pytest.raises(ValueError):
+        convert_to_int_array("1 a\n2 3")
@@ -1,9 +1,16 @@
+import random
+from pathlib import Path
+
 import pytest
 
 from advent_of_code.year2024.day01_solution import (
+    LocationListPair,
     Solution,
     get_distance,
+    get_distance_from_file,
     get_similarity,
+    get_similarity_from_file,
+    parse_location_columns,
 )
 
 
@@ -23,5 +30,85 @@ def test_solution() -> None:
     solution = Solution()
     # Test with sample input
     input_data = """1 2\n2 3\n3 4"""
-    assert solution.part1(input_data) == 3
-    assert solution.part2(input_data) == 5
+    assert solution.run_part(1, input_data) == 3
+    assert solution.run_part(2, input_data) == 5
+
+
+def test_parse_shared_between_parts() -> None:
+    solution = Solution()
+    input_data = """1 2\n2 3\n3 4"""
+    parsed = solution.get_parsed(input_data)
+    assert parsed == ([1, 2, 3], [2, 3, 4])
+    assert solution.get_parsed("".join(input_data)) is parsed
+
+
+def test_vectorized_matches_reference() -> None:
+    np = pytest.importorskip("numpy")
+    from advent_of_code.year2024.day01_solution import (
+        get_distance_vectorized,
+        get_similarity_vectorized,
+    )
+
+    rng = np.random.default_rng(1)
+    list1, list2 = rng.integers(0, 50, size=(2, 1000))
+    assert get_distance_vectorized(list1, list2) == get_distance(
+        list1.tolist(), list2.tolist()
+    )
+    assert get_similarity_vectorized(list1, list2) == get_similarity(
+        list1.tolist(), list2.tolist()
+    )
+
+
+@pytest.mark.parametrize("input_data", ["1 2\n3", "1 2 3\n4 5 6", "1\n2"])
+def test_parse_location_columns_rejects_malformed_input(input_data: str) -> None:
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="two location ids"):
+        parse_location_columns(input_data)
+
+
+def test_out_of_core_matches_reference(tmp_path: Path) -> None:
+    rng = random.Random(1)
+    pairs = [(rng.randint(0, 50), rng.randint(0, 50)) for _ in range(1000)]
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("\n".join(f"{a}   {b}" for a, b in pairs))
+    list1, list2 = [a for a, _ in pairs], [b for _, b in pairs]
+
+    assert get_distance_from_file(input_file, chunk_size=64) == get_distance(
+        list1, list2
+    )
+    assert get_similarity_from_file(input_file, chunk_size=64) == get_similarity(
+        list1, list2
+    )
+
+
+@pytest.mark.parametrize("block_size", [1, 4, 64])
+def test_location_list_pair_matches_recomputing(
+    block_size: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(LocationListPair, "block_size", block_size)
+    rng = random.Random(block_size)
+    pairs = LocationListPair()
+    list1: list = []
+    list2: list = []
+    for max_location in (10, 1000, 20):
+        for _ in range(150):
+            left, right = rng.randint(0, max_location), rng.randint(0, max_location)
+            pairs.append(left, right)
+            list1.append(left)
+            list2.append(right)
+            assert pairs.distance == get_distance(list1, list2)
+            assert pairs.similarity == get_similarity(list1, list2)
+    assert len(pairs) == len(list1)
+
+
+def test_location_list_pair_snapshot() -> None:
+    pairs = LocationListPair([(3, 4), (4, 3), (2, 5), (1, 3), (3, 9), (3, 3)])
+    assert (pairs.distance, pairs.similarity) == (11, 31)
+    snapshot = pairs.snapshot()
+    for _ in range(2):
+        pairs.extend([(100, 1), (7, 3)])
+        assert pairs.distance == get_distance(
+            [3, 4, 2, 1, 3, 3, 100, 7], [4, 3, 5, 3, 9, 3, 1, 3]
+        )
+        pairs.restore(snapshot)
+        assert (len(pairs), pairs.distance, pairs.similarity) == (6, 11, 31)
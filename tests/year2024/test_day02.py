@@ -0,0 +1,60 @@
+import random
+from typing import List
+
+import pytest
+
+from advent_of_code.year2024.day02_solution import (
+    Solution,
+    get_dampener_safe_report_num,
+    get_safe_report_num,
+    is_report_dampener_safe,
+    is_report_safe,
+)
+
+
+def is_brute_force_dampener_safe(report: List[int]) -> bool:
+    return any(
+        is_report_safe(report[:i] + report[i + 1 :]) for i in range(len(report))
+    ) or is_report_safe(report)
+
+
+def test_is_report_dampener_safe() -> None:
+    assert is_report_dampener_safe([1, 3, 2, 4, 5])
+    assert is_report_dampener_safe([8, 1, 2])
+    assert not is_report_dampener_safe([1, 2, 7, 8, 9])
+
+
+def test_reports_are_not_mutated() -> None:
+    reports = [[1, 3, 2, 4, 5], [8, 6, 4, 4, 1]]
+    assert get_dampener_safe_report_num(reports) == 2
+    assert reports == [[1, 3, 2, 4, 5], [8, 6, 4, 4, 1]]
+    assert get_safe_report_num(reports) == 0
+
+
+def test_batched_matches_brute_force() -> None:
+    pytest.importorskip("numpy")
+    from advent_of_code.utils.vectorized import RaggedIntArray
+    from advent_of_code.year2024.day02_solution import (
+        get_dampener_safe_reports,
+        get_safe_reports,
+    )
+
+    rng = random.Random(2)
+    reports = [
+        [rng.randint(0, 8) for _ in range(rng.randint(0, 7))] for _ in range(2000)
+    ]
+    ragged = RaggedIntArray.from_rows(reports)
+    assert get_safe_reports(ragged).tolist() == [is_report_safe(r) for r in reports]
+    assert get_dampener_safe_reports(ragged).tolist() == [
+        is_brute_force_dampener_safe(r) for r in reports
+    ]
+    assert [is_report_dampener_safe(r) for r in reports] == [
+        is_brute_force_dampener_safe(r) for r in reports
+    ]
+
+
+def test_solution_parts_share_parsed_reports() -> None:
+    solution = Solution()
+    reports = solution.parse("7 6 4 2 1\n1 2 7 8 9\n1 3 2 4 5")
+    assert solution.part2(reports) == 2
+    assert solution.part1(reports) == 1
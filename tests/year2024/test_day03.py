@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from advent_of_code.year2024.day03_solution import (
+    ScanResult,
+    get_mult_sum,
+    scan_file,
+    scan_memory,
+)
+
+EXAMPLE = "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+
+
+def test_get_mult_sum() -> None:
+    assert get_mult_sum(EXAMPLE, False) == 161
+    assert get_mult_sum(EXAMPLE, True) == 48
+
+
+def test_chunks_combine_across_boundaries() -> None:
+    data = EXAMPLE.encode() * 3
+    for chunk_size in range(1, 30):
+        for with_do in (False, True):
+            result = ScanResult()
+            for start in range(0, len(data), chunk_size):
+                end = min(start + chunk_size, len(data))
+                result = result.combine(scan_memory(data, with_do, start, end))
+            assert result.total == get_mult_sum(EXAMPLE * 3, with_do)
+
+
+def test_scan_file(tmp_path: Path) -> None:
+    input_file = tmp_path / "memory.txt"
+    input_file.write_text(EXAMPLE * 50)
+    for with_do in (False, True):
+        expected = get_mult_sum(EXAMPLE * 50, with_do)
+        assert scan_file(input_file, with_do, chunk_size=37) == expected
+        assert scan_file(input_file, with_do, chunk_size=101, workers=2) == expected
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from advent_of_code.year2024.day04_solution import Solution, WordMatch, XmasGrid
+
+EXAMPLE = "\n".join(
+    [
+        "MMMSXXMASM",
+        "MSAMXMSMSA",
+        "AMXSXMAAMM",
+        "MSAMASMSMX",
+        "XMASAMXAMM",
+        "XXAMMXXAMA",
+        "SMSMSASXSS",
+        "SAXAMASAAA",
+        "MAMMMXMMMM",
+        "MXMXAXMASX",
+    ]
+)
+
+
+def test_solution() -> None:
+    solution = Solution()
+    assert solution.run_part(1, EXAMPLE) == 18
+    assert solution.run_part(2, EXAMPLE) == 9
+
+
+@pytest.mark.parametrize("shape", [(3, 17), (17, 3), (12, 29), (1, 40)])
+def test_vectorized_matches_loops_on_non_square_grids(shape: tuple) -> None:
+    pytest.importorskip("numpy")
+    rng = random.Random(sum(shape))
+    raw_count, col_count = shape
+    grid = XmasGrid(
+        "\n".join(
+            "".join(rng.choice("XMAS") for _ in range(col_count))
+            for _ in range(raw_count)
+        )
+    )
+    # Reference count: the letter by letter search from every cell
+    expected = sum(
+        grid.check_word_from_direction(x_pos, y_pos, vect_x, vect_y)
+        for y_pos in range(raw_count)
+        for x_pos in range(col_count)
+        for vect_x in [-1, 0, 1]
+        for vect_y in [-1, 0, 1]
+    )
+    assert grid.get_word_count(vectorized=True) == expected
+    assert grid.get_word_count(vectorized=False) == expected
+    assert grid.get_wordshape_count(vectorized=True) == grid.get_wordshape_count(
+        vectorized=False
+    )
+
+
+def test_count_and_locate_words_match_loops() -> None:
+    rng = random.Random(4)
+    lines = ["".join(rng.choice("XMAS") for _ in range(13)) for _ in range(9)]
+    # Rows of different lengths are supported too
+    lines[3] = lines[3][:7]
+    grid = XmasGrid("\n".join(lines))
+    words = ["XMAS", "SAM", "MAM", "AS", "X", "XMASX"]
+
+    matches = grid.locate_words(words)
+    expected_matches = sorted(
+        WordMatch(y_pos, x_pos, vect_x, vect_y, word)
+        for word in words
+        for y_pos, row in enumerate(lines)
+        for x_pos in range(len(row))
+        for vect_x in [-1, 0, 1]
+        for vect_y in [-1, 0, 1]
+        if grid.check_word_from_direction(x_pos, y_pos, vect_x, vect_y, word)
+    )
+    assert matches == expected_matches
+    assert grid.count_words(words) == {
+        word: sum(match.word == word for match in matches) for word in words
+    }
+
+
+def test_word_count_with_several_words() -> None:
+    grid = XmasGrid(EXAMPLE, words=["XMAS", "MAS"])
+    assert grid.count_words() == {"XMAS": 18, "MAS": grid.count_words(["MAS"])["MAS"]}
+    assert grid.get_word_count(vectorized=False) == sum(grid.count_words().values())
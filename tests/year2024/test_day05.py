@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from advent_of_code.year2024.day05_solution import (
+    CycleError,
+    OrderingRule,
+    PartialOrderingRule,
+    Solution,
+    generate_input,
+    parse_input,
+)
+
+EXAMPLE = """47|53
+97|13
+97|61
+97|47
+75|29
+61|13
+75|53
+29|13
+97|29
+53|29
+61|53
+97|53
+61|29
+47|13
+75|47
+97|75
+47|61
+75|61
+47|29
+75|13
+53|13
+
+75,47,61,53,29
+97,61,53,29,13
+75,29,13
+75,97,47,61,53
+61,13,29
+97,13,75,29,47"""
+
+
+def test_solution() -> None:
+    solution = Solution()
+    assert solution.run_part(1, EXAMPLE) == 143
+    assert solution.run_part(2, EXAMPLE) == 123
+
+
+def test_ordering_rule() -> None:
+    rules, _ = parse_input(EXAMPLE)
+    ordering_rule = OrderingRule(rules)
+    assert ordering_rule.check_update([75, 47, 61, 53, 29])
+    assert not ordering_rule.check_update([61, 13, 29])
+    assert ordering_rule.get_correct_update([97, 13, 75, 29, 47]) == [
+        97,
+        75,
+        47,
+        29,
+        13,
+    ]
+
+
+def test_incomplete_orders_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        OrderingRule([(1, 2), (2, 3)])
+
+
+def test_partial_ordering_rule() -> None:
+    # 1 < 2 < 3 and 1 < 4, 5 is unconstrained
+    ordering_rule = PartialOrderingRule([(1, 2), (2, 3), (1, 4)])
+    assert ordering_rule.must_precede(1, 3)
+    assert not ordering_rule.must_precede(4, 3)
+    assert ordering_rule.check_update([1, 4, 2, 5, 3])
+    assert ordering_rule.check_update([4, 3])
+    assert not ordering_rule.check_update([3, 5, 1])
+
+    correct_update = ordering_rule.get_correct_update([3, 5, 4, 1])
+    assert ordering_rule.check_update(correct_update)
+    assert sorted(correct_update) == [1, 3, 4, 5]
+
+
+def test_partial_ordering_rule_on_random_dag() -> None:
+    rng = random.Random(5)
+    pages = list(range(60))
+    rng.shuffle(pages)
+    rules = list(
+        {
+            (pages[i], pages[j])
+            for i, j in (sorted(rng.sample(range(60), 2)) for _ in range(150))
+        }
+    )
+    ordering_rule = PartialOrderingRule(rules)
+    for _ in range(200):
+        update = rng.sample(pages, 7)
+        in_order = all(
+            not ordering_rule.must_precede(b, a)
+            for idx, a in enumerate(update)
+            for b in update[idx + 1 :]
+        )
+        assert ordering_rule.check_update(update) == in_order
+        assert ordering_rule.check_update(ordering_rule.get_correct_update(update))
+
+
+def test_cycles_are_reported() -> None:
+    with pytest.raises(CycleError) as error:
+        PartialOrderingRule([(1, 2), (2, 3), (3, 1), (3, 4)])
+    assert sorted(error.value.cycle) == [1, 2, 3]
+
+
+def test_solution_with_sparse_rules() -> None:
+    solution = Solution()
+    input_data = "1|2\n2|3\n\n1,2,3\n3,1,9\n2,1,3"
+    assert solution.run_part(1, input_data) == 2
+    # 9 has no rule and is put first: 3,1,9 -> 9,1,3 and 2,1,3 -> 1,2,3
+    assert solution.run_part(2, input_data) == 3
+
+
+@pytest.mark.parametrize("size, page_count", [(10, 23), (200, 48), (10_000, 90)])
+def test_generated_pages_grow_with_size(size: int, page_count: int) -> None:
+    rules, updates = parse_input(generate_input(size))
+    assert len(updates) == size
+    assert len(rules) == page_count * (page_count - 1) // 2